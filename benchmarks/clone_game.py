@@ -0,0 +1,43 @@
+from copy import deepcopy
+from timeit import timeit
+import logic.game as game
+
+
+def prepare_state(how_many_players, how_many_cards):
+    """
+    Helper function used to prepare state of cpu game of given size, right after dealing cards.
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :return: GameState object
+    """
+    how_many_decks = round(0.5 + ((how_many_players * how_many_cards) * 2) / 52)
+    gs = game.GameState(0)
+    names = [f'CPU{index}' for index in range(how_many_players)]
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+    return gs
+
+
+def measure(how_many_players, how_many_cards, repeat=200):
+    """
+    Function used to measure time of forking game state with clone method and with deepcopy.
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :param repeat: integer of how many times every measurement is repeated
+    :return: float seconds of clone, float seconds of deepcopy
+    """
+    gs = prepare_state(how_many_players, how_many_cards)
+    clone_time = timeit(gs.clone, number=repeat) / repeat
+    deepcopy_time = timeit(lambda: deepcopy(gs), number=repeat) / repeat
+    return clone_time, deepcopy_time
+
+
+def main():
+    print(f'{"players":>8} {"cards":>6} {"clone [us]":>11} {"deepcopy [us]":>14} {"clones/s":>9}')
+    for how_many_players, how_many_cards in [(2, 5), (4, 7), (10, 20), (40, 30)]:
+        clone_time, deepcopy_time = measure(how_many_players, how_many_cards)
+        print(f'{how_many_players:>8} {how_many_cards:>6} {clone_time * 1e6:>11.1f} '
+              f'{deepcopy_time * 1e6:>14.1f} {1 / clone_time:>9.0f}')
+
+
+if __name__ == '__main__':
+    main()
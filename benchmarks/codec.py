@@ -0,0 +1,54 @@
+import pickle
+from timeit import timeit
+import logic.codec as codec
+import logic.game as game
+import logic.headless as headless
+
+
+def prepare_state(how_many_players, how_many_cards, rounds=3):
+    """
+    Helper function used to prepare state of cpu game of given size, after a few rounds.
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :param rounds: integer of how many rounds are played before measurement
+    :return: GameState object
+    """
+    gs = game.GameState(0)
+    names = [f'CPU{index}' for index in range(how_many_players)]
+    how_many_decks = game.count_decks(how_many_players, how_many_cards)
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+    for _ in range(rounds):
+        gs = headless.play_round(gs)
+    return gs
+
+
+def measure(how_many_players, how_many_cards, repeat=500):
+    """
+    Function used to measure time of encoding and decoding snapshots and their sizes, compared with pickle.
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :param repeat: integer of how many times every measurement is repeated
+    :return: float seconds of encode, float seconds of decode, integer bytes of snapshot,
+     integer bytes of snapshot with generators, integer bytes of pickled game state
+    """
+    gs = prepare_state(how_many_players, how_many_cards)
+    data = codec.encode(gs)
+    encode_time = timeit(lambda: codec.encode(gs), number=repeat) / repeat
+    decode_time = timeit(lambda: codec.decode(data), number=repeat) / repeat
+    for player in gs.players.values():
+        player.input_foo = player.gui_foo = player.move_foo = player.decide_foo = player.print_foo = None
+    pickled = len(pickle.dumps(gs))
+    return encode_time, decode_time, len(data), len(codec.encode(gs, with_rng=True)), pickled
+
+
+def main():
+    print(f'{"players":>8} {"cards":>6} {"encode [us]":>12} {"decode [us]":>12} {"bytes":>6} '
+          f'{"with rng":>9} {"pickle":>7}')
+    for how_many_players, how_many_cards in [(2, 5), (4, 7), (10, 20), (40, 30)]:
+        encode_time, decode_time, size, size_with_rng, pickled = measure(how_many_players, how_many_cards)
+        print(f'{how_many_players:>8} {how_many_cards:>6} {encode_time * 1e6:>12.1f} {decode_time * 1e6:>12.1f} '
+              f'{size:>6} {size_with_rng:>9} {pickled:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+from time import perf_counter
+import tracemalloc
+import logic.events as events
+import logic.game as game
+import logic.headless as headless
+import logic.persistent as persistent
+import logic.replay as replay
+
+
+def prepare_log(seed, how_many_players, how_many_cards):
+    """
+    Helper function used to play and record headless game of cpu players.
+    :param seed: integer seed of game
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :return: GameLog object
+    """
+    names = [f'CPU{index}' for index in range(how_many_players)]
+    how_many_decks = game.count_decks(how_many_players, how_many_cards)
+    gs = game.GameState(seed)
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+    log = replay.record_game(gs, how_many_decks, how_many_cards)
+    headless.play_game(gs)
+    return log
+
+
+def keep_clones(log):
+    """
+    Function used to replay game with headless engine and keep clone of game state after every turn.
+    :param log: GameLog object
+    :return: list with GameState objects
+    """
+    gs = game.GameState(log.seed)
+    gs.deck, gs.table, gs.players = game.prepare_game(log.names, log.how_many_decks, log.how_many_cards, rng=gs.rng)
+    moves = iter(log.moves)
+    for player in gs.players.values():
+        player.decide_foo = lambda *_: next(moves)
+    history = [gs.clone()]
+    gs.sinks.append(lambda game_state, event: history.append(game_state.clone())
+                    if isinstance(event, events.TurnEnded) else None)
+    headless.play_game(gs)
+    return history
+
+
+def keep_states(log):
+    """
+    Function used to replay game with persistent states and keep state after every turn.
+    :param log: GameLog object
+    :return: list with PersistentState objects
+    """
+    gs = game.GameState(log.seed)
+    gs.deck, gs.table, gs.players = game.prepare_game(log.names, log.how_many_decks, log.how_many_cards, rng=gs.rng)
+    moves = iter(log.moves)
+    history = [persistent.freeze(gs)]
+    while history[-1].standings is None:
+        history.append(persistent.step(history[-1], decide_foo=lambda *_: next(moves)))
+    return history
+
+
+def measure(keep, log):
+    """
+    Function used to measure time and memory of keeping whole history of game.
+    :param keep: function which replays game and returns its history
+    :param log: GameLog object
+    :return: float seconds, integer bytes of memory held by history, integer number of kept states
+    """
+    tracemalloc.start()
+    start = perf_counter()
+    history = keep(log)
+    seconds = perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, size, len(history)
+
+
+def main():
+    print(f'{"players":>8} {"cards":>6} {"states":>7} {"clones [ms]":>12} {"clones [KB]":>12} '
+          f'{"persistent [ms]":>16} {"persistent [KB]":>16}')
+    for how_many_players, how_many_cards in [(2, 5), (4, 7), (10, 20)]:
+        log = prepare_log(0, how_many_players, how_many_cards)
+        clone_time, clone_size, states = measure(keep_clones, log)
+        state_time, state_size, _ = measure(keep_states, log)
+        print(f'{how_many_players:>8} {how_many_cards:>6} {states:>7} {clone_time * 1e3:>12.1f} '
+              f'{clone_size / 1024:>12.0f} {state_time * 1e3:>16.1f} {state_size / 1024:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+from timeit import timeit
+import logic.logic as rules
+import logic.game as game
+from player.player import Player
+from logic.rng import create_rng
+
+
+def deal_hands(how_many_players, how_many_cards, how_many_decks):
+    """
+    Helper function used to build players with dealt hands, as they are before deck is prepared again.
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards every player has on hand
+    :param how_many_decks: integer of how many decks are in game
+    :return: dictionary of Player objects
+    """
+    deck, _, _ = rules.prepare_deck(how_many=how_many_decks, rng=create_rng(0))
+    players = {}
+    for index in range(how_many_players):
+        players[str(index)] = Player(str(index))
+        players[str(index)].hand, deck, _ = rules.deal_cards(deck, how_many_cards)
+    return players
+
+
+def measure(how_many_players, how_many_cards, repeat=20):
+    """
+    Function used to measure time of preparing deck and whole game for given size of game.
+    Number of decks is evaluated the same way as server does it.
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :param repeat: integer of how many times every measurement is repeated
+    :return: integer with number of cards in game, float seconds of prepare_deck, float seconds of prepare_game
+    """
+    how_many_decks = round(0.5 + ((how_many_players * how_many_cards) * 2) / 52)
+    names = [f'CPU{index}' for index in range(how_many_players)]
+    players = deal_hands(how_many_players, how_many_cards, how_many_decks)
+    rng = create_rng(0)
+    deck_time = timeit(lambda: rules.prepare_deck(players=players, how_many=how_many_decks, rng=rng), number=repeat) / repeat
+    game_time = timeit(lambda: game.prepare_game(names, how_many_decks, how_many_cards, rng=rng), number=repeat) / repeat
+    return how_many_decks * rules.deck_size, deck_time, game_time
+
+
+def main():
+    print(f'{"players":>8} {"cards":>6} {"in game":>8} {"deck [us]":>10} {"game [us]":>10} {"game/card [ns]":>15}')
+    for how_many_players, how_many_cards in [(2, 5), (5, 10), (10, 20), (20, 30), (40, 30), (80, 30)]:
+        in_game, deck_time, game_time = measure(how_many_players, how_many_cards)
+        print(f'{how_many_players:>8} {how_many_cards:>6} {in_game:>8} {deck_time * 1e6:>10.1f} '
+              f'{game_time * 1e6:>10.1f} {game_time / in_game * 1e9:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+from time import perf_counter
+import logic.game as game
+import logic.headless as headless
+import logic.replay as replay
+
+
+def record_games(how_many_games, how_many_players, how_many_cards):
+    """
+    Helper function used to play and record headless games of cpu players, like corpus of captured games.
+    :param how_many_games: integer of how many games are recorded
+    :param how_many_players: integer of how many players are in every game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :return: list of GameLog objects, float seconds of playing them
+    """
+    names = [f'CPU{index}' for index in range(how_many_players)]
+    how_many_decks = game.count_decks(how_many_players, how_many_cards)
+    logs, start = [], perf_counter()
+    for seed in range(how_many_games):
+        gs = game.GameState(seed)
+        gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+        log = replay.record_game(gs, how_many_decks, how_many_cards)
+        headless.play_game(gs)
+        logs.append(replay.finish_log(log, gs))
+    return logs, perf_counter() - start
+
+
+def measure(how_many_games, how_many_players, how_many_cards):
+    """
+    Function used to measure speed of replaying recorded games, with check of final state of every game.
+    :param how_many_games: integer of how many games are replayed
+    :param how_many_players: integer of how many players are in every game
+    :param how_many_cards: integer of how many cards are dealt to every player
+    :return: float seconds of recording, float seconds of replaying, integer number of moves in all games
+    """
+    logs, record_time = record_games(how_many_games, how_many_players, how_many_cards)
+    start = perf_counter()
+    for log in logs:
+        replay.replay(log)
+    return record_time, perf_counter() - start, sum(len(log.moves) for log in logs)
+
+
+def main():
+    print(f'{"players":>8} {"cards":>6} {"games":>6} {"recorded [games/s]":>19} {"replayed [games/s]":>19} '
+          f'{"replayed [moves/s]":>19}')
+    for how_many_players, how_many_cards, how_many_games in [(2, 5, 1000), (4, 7, 500), (10, 20, 50)]:
+        record_time, replay_time, moves = measure(how_many_games, how_many_players, how_many_cards)
+        print(f'{how_many_players:>8} {how_many_cards:>6} {how_many_games:>6} {how_many_games / record_time:>19.0f} '
+              f'{how_many_games / replay_time:>19.0f} {moves / replay_time:>19.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+from time import perf_counter
+import numpy as np
+import logic.game as game
+import logic.headless as headless
+import logic.vectorized as vectorized
+
+
+def measure_headless(how_many_games, how_many_players):
+    """
+    Function used to measure speed of reference engine playing cpu games one by one.
+    :param how_many_games: integer of how many games are played
+    :param how_many_players: integer of how many players are in every game
+    :return: float number of games per second
+    """
+    names = [f'CPU{index}' for index in range(how_many_players)]
+    start = perf_counter()
+    for seed in range(how_many_games):
+        gs = game.GameState(seed)
+        gs.deck, gs.table, gs.players = game.prepare_game(names, rng=gs.rng)
+        headless.play_game(gs)
+    return how_many_games / (perf_counter() - start)
+
+
+def measure_vectorized(how_many_games, how_many_players):
+    """
+    Function used to measure speed of vectorized simulator playing all games in lockstep with random policy.
+    :param how_many_games: integer of how many games are played
+    :param how_many_players: integer of how many players are in every game
+    :return: float number of games per second
+    """
+    rng = np.random.default_rng(0)
+    start = perf_counter()
+    games = vectorized.prepare_games(how_many_games, how_many_players, rng=rng)
+    vectorized.play_games(games, [vectorized.random_policy] * how_many_players, rng)
+    return how_many_games / (perf_counter() - start)
+
+
+def main():
+    print(f'{"players":>8} {"games":>7} {"headless [games/s]":>19} {"vectorized [games/s]":>21}')
+    for how_many_players, how_many_games in [(2, 1000), (4, 1000), (4, 100000)]:
+        headless_speed = measure_headless(min(how_many_games, 1000), how_many_players)
+        vectorized_speed = measure_vectorized(how_many_games, how_many_players)
+        print(f'{how_many_players:>8} {how_many_games:>7} {headless_speed:>19.0f} {vectorized_speed:>21.0f}')
+
+
+if __name__ == '__main__':
+    main()
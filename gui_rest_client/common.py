@@ -3,6 +3,7 @@ import pyglet
 import asyncio
 import uvicorn
 from macau_server import app
+import logic.logic as rules
 from copy import copy
 
 
@@ -123,9 +124,7 @@ def load_all_card_images():
     Helper function used to load all necessary images from resources.
     :return: dictionary with images
     """
-    colors = 'hearts tiles clovers pikes'.split()
-    values = '2 3 4 5 6 7 8 9 10 J Q K A'.split()
-    names = [f'{color}_{value}.png' for value in values for color in colors]
+    names = [card.image for card in rules.cards]
     names += ['black_joker.png', 'red_joker.png', 'back.png']
     images = {}
     for name in names:
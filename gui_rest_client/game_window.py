@@ -2,6 +2,8 @@ import pyglet
 from secrets import choice
 import logic.logic as rules
 from logic.game import validate_move
+from logic.move import parse_move
+from logic.pile import Pile
 import gui_rest_client.common as common
 import gui_rest_client.game_handlers as handlers
 from random import randint
@@ -20,6 +22,8 @@ class GameWindow:
         self.colors = common.color_palette()
         self.state = {'hand': [], 'rivals': {}, 'cards_in_deck': 0, 'table': [], 'lied_card': None, 'cards_to_take': 0,
                       'turns_to_wait': 0, 'requested_value': None, 'requested_color': None, 'outputs': []}
+        self.turn_context = None
+        self.turn_hand, self.turn_hand_source = [], None
         self.draw_objects = []
         self.draw_hand = []
         self.to_play = []
@@ -50,7 +54,10 @@ class GameWindow:
 
     @property
     def table(self):
-        return self.state['table']
+        table = self.state['table']
+        if not isinstance(table, Pile):
+            table = self.state['table'] = Pile(table)
+        return table
 
     @property
     def lied_card(self):
@@ -254,7 +261,7 @@ class GameWindow:
         table_0_x, table_0_y = self.coord['table_0_x'], self.coord['table_0_y']
         offset = 40
         for card in self.table:
-            card_name = card[0] + '_' + card[1] + '.png'
+            card_name = rules.card_data(card).image
             card_image = common.resize_center_card_image(self.card_images[card_name], self.screen.height)
             pan_x = randint(0, offset) - offset / 2
             pan_y = randint(0, offset) - offset / 2
@@ -263,7 +270,7 @@ class GameWindow:
             self.draw_objects.append(card)
 
         if self.lied_card is not None:
-            card_name = self.lied_card[0] + '_' + self.lied_card[1] + '.png'
+            card_name = rules.card_data(self.lied_card).image
             card_image = common.resize_center_card_image(self.card_images[card_name], self.screen.height)
             card = pyglet.sprite.Sprite(img=card_image, x=table_0_x, y=table_0_y)
             self.draw_objects.append(card)
@@ -296,7 +303,7 @@ class GameWindow:
         hand_0_x, hand_0_y = self.coord['hand_0_x'], self.coord['hand_0_y']
         self.draw_hand = []
         for index, card in enumerate(self.hand):
-            card_name = f'{card[0]}_{card[1]}.png'
+            card_name = rules.card_data(card).image
             card_image = common.resize_center_card_image(self.card_images[card_name], self.screen.height)
             pan = index * (card_image.width / ratio)
             card = common.Card(img=card_image, x=hand_0_x + pan, y=hand_0_y)
@@ -308,10 +315,10 @@ class GameWindow:
         """
         Helper method used to draw small rectangle indicator as an assist for validity of player's move.
         """
-        hand = []
         played = ' '
-        for card in self.hand:
-            hand.append((card[0], card[1]))
+        if self.turn_hand_source is not self.hand:
+            self.turn_hand = [(card[0], card[1]) for card in self.hand]
+            self.turn_hand_source = self.hand
 
         for card in self.to_play:
             if len(str(card)) > 3 and card not in rules.colors:
@@ -321,7 +328,7 @@ class GameWindow:
         if len(played) == 0:
             return True
 
-        return validate_move(hand, self, played)[0]
+        return validate_move(self.turn_hand, self, parse_move(played))
 
     def move_cards_aside(self, to_be_seen):
         """
@@ -372,8 +379,7 @@ class GameWindow:
         for index, card in enumerate(self.draw_hand):
             if common.check_if_inside(x, y, card):
                 distance = round(100 * abs(x - card.x + hand_0_x) + abs(y - card.y))
-                name = self.hand[index]
-                name = f'{name[0]} {name[1]}'
+                name = rules.card_data(self.hand[index]).text
                 candidates[distance] = {'name': name, 'image': card}
         if len(candidates) > 0:
             chosen = candidates[min(candidates.keys())]
@@ -0,0 +1,181 @@
+from collections import namedtuple, Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+import logic.logic as rules
+import logic.game as game
+import logic.headless as headless
+from logic.move import Move
+
+# Configuration of every game in batch: strategy name of every seat and number of cards dealt at start.
+# Result of one game: its seed, tuple with seats of winners (empty if game hit limit of rounds) and number of rounds.
+BatchConfig = namedtuple('BatchConfig', 'strategies how_many_cards max_rounds', defaults=(5, 1000))
+GameResult = namedtuple('GameResult', 'seed winners rounds')
+
+
+def cpu_strategy(_player):
+    """
+    Function used to set strategy of cpu player, which is its own decision callback.
+    :param _player: CPUPlayer object
+    """
+
+
+def random_strategy(player):
+    """
+    Function used to set strategy which plays random possible card, with random request after jack or ace.
+    :param player: CPUPlayer object, its generator is used for choices
+    """
+    rng = player.rng
+
+    def decide(_game_state, _top_card, possible_plays):
+        card = rng.choice(possible_plays)
+        request = rules.card_effect(card).request
+        if request == 'value':
+            request = rng.choice(sorted(rules.requestable_values, key=rules.value_indexes.get))
+        elif request == 'color':
+            request = rng.choice(rules.colors)
+        return Move([card], request)
+    player.decide_foo = decide
+
+
+strategies = {'cpu': cpu_strategy, 'random': random_strategy}
+
+
+def play_batch_game(config, seed):
+    """
+    Function used to play one game of batch headless, with every seat using strategy from config.
+    :param config: BatchConfig object
+    :param seed: integer seed of game, the same seed and config give the same game
+    :return: GameResult object
+    """
+    gs = game.GameState(seed)
+    names = [f'CPU{seat}' for seat in range(len(config.strategies))]
+    how_many_decks = game.count_decks(len(names), config.how_many_cards)
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, config.how_many_cards, rng=gs.rng)
+    for player, strategy in zip(gs.players.values(), config.strategies):
+        strategies[strategy](player)
+
+    seats = {name: seat for seat, name in enumerate(names)}
+    for rounds in range(1, config.max_rounds + 1):
+        gs = headless.play_round(gs)
+        if gs.standings is not None:
+            return GameResult(seed, tuple(seats[name] for name in gs.standings[:1]), rounds)
+    return GameResult(seed, (), config.max_rounds)
+
+
+def play_chunk(config, seeds):
+    """
+    Function used to play games with given seeds in one worker process.
+    :param config: BatchConfig object
+    :param seeds: list of integer seeds
+    :return: list of GameResult objects
+    """
+    return [play_batch_game(config, seed) for seed in seeds]
+
+
+def run_batch(config, how_many_games, first_seed=0, workers=None, chunk_size=200):
+    """
+    Function used to play many games spread across worker processes in chunks.
+    Results are yielded as soon as chunk is finished, so order of games is not kept.
+    Game number n is played with seed first_seed + n, so results do not depend on number of workers.
+    :param config: BatchConfig object
+    :param how_many_games: integer of how many games will be played
+    :param first_seed: integer seed of first game
+    :param workers: integer number of worker processes, None for one per core, 1 to play in this process
+    :param chunk_size: integer of how many games are sent to worker at once
+    :return: generator of GameResult objects
+    """
+    for strategy in config.strategies:
+        if strategy not in strategies:
+            raise ValueError(f'Unknown strategy {strategy}, choose from: {", ".join(strategies)}')
+    seeds = range(first_seed, first_seed + how_many_games)
+    chunks = [seeds[start:start + chunk_size] for start in range(0, how_many_games, chunk_size)]
+    if workers == 1:
+        for chunk in chunks:
+            yield from play_chunk(config, chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(play_chunk, config, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+class BatchStats:
+    """
+    Class used to aggregate results of batch games: wins of every seat and strategy, lengths of games and speed.
+    """
+    def __init__(self, config):
+        self.config = config
+        self.games = 0
+        self.unfinished = 0
+        self.seat_wins = [0] * len(config.strategies)
+        self.lengths = Counter()
+        self.start = perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, result):
+        """
+        Method used to add result of one game.
+        :param result: GameResult object
+        """
+        self.games += 1
+        self.lengths[result.rounds] += 1
+        if not result.winners:
+            self.unfinished += 1
+        for seat in result.winners:
+            self.seat_wins[seat] += 1
+        self.elapsed = perf_counter() - self.start
+
+    def seat_win_rates(self):
+        """
+        Method used to evaluate part of games won by every seat.
+        :return: list of floats
+        """
+        return [wins / max(self.games, 1) for wins in self.seat_wins]
+
+    def strategy_win_rates(self):
+        """
+        Method used to evaluate part of games won by one seat of every strategy, averaged over its seats.
+        :return: dictionary with strategy names as keys and floats as values
+        """
+        wins, seats = Counter(), Counter(self.config.strategies)
+        for strategy, seat_wins in zip(self.config.strategies, self.seat_wins):
+            wins[strategy] += seat_wins
+        return {strategy: wins[strategy] / (seats[strategy] * max(self.games, 1)) for strategy in seats}
+
+    def length_percentiles(self, percents=(10, 50, 90, 99)):
+        """
+        Method used to find lengths of games in rounds, below which given percent of games ended.
+        :param percents: iterable with integer percents
+        :return: dictionary with percents as keys and rounds as values
+        """
+        percentiles, counted = {}, 0
+        pending = sorted(percents)
+        for rounds in sorted(self.lengths):
+            counted += self.lengths[rounds]
+            while pending and counted * 100 >= pending[0] * self.games:
+                percentiles[pending.pop(0)] = rounds
+        return percentiles
+
+    def games_per_second(self):
+        """
+        Method used to evaluate speed of batch from its start to last added result.
+        :return: float number of games per second
+        """
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self):
+        """
+        Method used to describe aggregated results as lines of text.
+        :return: list of strings
+        """
+        lines = [f'Games: {self.games}, unfinished: {self.unfinished}, {self.games_per_second():.0f} games/s']
+        for seat, (strategy, rate) in enumerate(zip(self.config.strategies, self.seat_win_rates())):
+            lines.append(f'Seat {seat} ({strategy}): {rate:.1%} won')
+        for strategy, rate in self.strategy_win_rates().items():
+            lines.append(f'Strategy {strategy}: {rate:.1%} won per seat')
+        if self.games:
+            mean = sum(rounds * count for rounds, count in self.lengths.items()) / self.games
+            percentiles = ', '.join(f'p{percent}={rounds}' for percent, rounds in self.length_percentiles().items())
+            lines.append(f'Rounds: mean={mean:.1f}, {percentiles}, max={max(self.lengths)}')
+        return lines
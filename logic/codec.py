@@ -0,0 +1,317 @@
+import struct
+from random import SystemRandom
+import logic.logic as rules
+import logic.game as game
+from logic.rng import create_rng, spawn_rng
+from player.player import Player
+from player.cpu_player import CPUPlayer
+
+# Snapshot starts with magic bytes and version, then fields of GameState in fixed order.
+# Cards take one byte each (their code inside one deck, no_card for None), counters are unsigned varints.
+# Generators are saved only on demand, because state of Mersenne Twister takes 2.5 KB.
+magic = b'MC'
+version = 1
+no_card = 255
+rankings = [game.stop_on_first, game.rank_by_cards, game.play_out]
+player_kinds = [Player, CPUPlayer]
+rng_words = struct.Struct('<625I')
+rng_gauss = struct.Struct('<d')
+
+
+def write_varint(buffer, number):
+    """
+    Function used to write unsigned integer with 7 bits in every byte, highest bit set when more bytes follow.
+    :param buffer: bytearray to which number is written
+    :param number: integer equal or greater than 0
+    """
+    if number < 0:
+        raise ValueError(f'Negative number {number} can not be encoded')
+    while number > 0x7f:
+        buffer.append(number & 0x7f | 0x80)
+        number >>= 7
+    buffer.append(number)
+
+
+def read_varint(data, position):
+    """
+    Function used to read unsigned integer written with write_varint.
+    :param data: bytes with snapshot
+    :param position: integer index of first byte of number
+    :return: integer number, integer index of first byte after it
+    """
+    number, shift = 0, 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+
+def write_text(buffer, text):
+    """
+    Function used to write string as its length and utf-8 bytes.
+    :param buffer: bytearray to which text is written
+    :param text: string
+    """
+    encoded = text.encode()
+    write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+def read_text(data, position):
+    """
+    Function used to read string written with write_text.
+    :param data: bytes with snapshot
+    :param position: integer index of first byte of text
+    :return: string, integer index of first byte after it
+    """
+    length, position = read_varint(data, position)
+    return data[position:position + length].decode(), position + length
+
+
+def write_cards(buffer, cards):
+    """
+    Function used to write list of cards as its length and one byte per card.
+    :param buffer: bytearray to which cards are written
+    :param cards: list of tuples with cards
+    """
+    write_varint(buffer, len(cards))
+    codes = rules.card_codes
+    buffer += bytes([codes[card] for card in cards])
+
+
+def read_cards(data, position):
+    """
+    Function used to read list of cards written with write_cards.
+    :param data: bytes with snapshot
+    :param position: integer index of first byte of list
+    :return: list of tuples with cards, integer index of first byte after it
+    """
+    length, position = read_varint(data, position)
+    deck_cards = rules.deck_cards
+    return [deck_cards[code] for code in data[position:position + length]], position + length
+
+
+def write_index(buffer, item, indexes):
+    """
+    Function used to write optional item with known index, like color or lied card, as one byte.
+    :param buffer: bytearray to which item is written
+    :param item: item or None
+    :param indexes: dictionary with indexes of items
+    """
+    buffer.append(no_card if item is None else indexes[item])
+
+
+def read_index(data, position, items):
+    """
+    Function used to read optional item written with write_index.
+    :param data: bytes with snapshot
+    :param position: integer index of byte
+    :param items: list of items in order of their indexes
+    :return: item or None, integer index of next byte
+    """
+    index = data[position]
+    return (None if index == no_card else items[index]), position + 1
+
+
+def write_seats(buffer, names, seats):
+    """
+    Function used to write list of players names as their seats.
+    :param buffer: bytearray to which seats are written
+    :param names: list with names of players
+    :param seats: dictionary with seats of players
+    """
+    write_varint(buffer, len(names))
+    for name in names:
+        write_varint(buffer, seats[name])
+
+
+def read_seats(data, position, names):
+    """
+    Function used to read list of players names written with write_seats.
+    :param data: bytes with snapshot
+    :param position: integer index of first byte of list
+    :param names: list with names of players in order of seats
+    :return: list with names of players, integer index of first byte after it
+    """
+    how_many, position = read_varint(data, position)
+    chosen = []
+    for _ in range(how_many):
+        seat, position = read_varint(data, position)
+        chosen.append(names[seat])
+    return chosen, position
+
+
+def write_seed(buffer, seed):
+    """
+    Function used to write seed of game: None, integer (zigzag encoded, so negative numbers are short) or string.
+    :param buffer: bytearray to which seed is written
+    :param seed: None, integer or string
+    """
+    if seed is None:
+        buffer.append(0)
+    elif isinstance(seed, int):
+        buffer.append(1)
+        write_varint(buffer, seed * 2 if seed >= 0 else -seed * 2 - 1)
+    else:
+        buffer.append(2)
+        write_text(buffer, str(seed))
+
+
+def read_seed(data, position):
+    """
+    Function used to read seed written with write_seed.
+    :param data: bytes with snapshot
+    :param position: integer index of first byte of seed
+    :return: seed, integer index of first byte after it
+    """
+    kind, position = data[position], position + 1
+    if kind == 0:
+        return None, position
+    if kind == 1:
+        number, position = read_varint(data, position)
+        return (number >> 1 if number % 2 == 0 else -(number + 1 >> 1)), position
+    return read_text(data, position)
+
+
+def write_rng(buffer, rng, with_rng):
+    """
+    Function used to write generator: 0 if it is not saved, 1 for secure generator, 2 followed by its state.
+    :param buffer: bytearray to which generator is written
+    :param rng: Random object
+    :param with_rng: bool value, True if state of generator is saved
+    """
+    if isinstance(rng, SystemRandom):
+        buffer.append(1)
+    elif not with_rng:
+        buffer.append(0)
+    else:
+        _, words, gauss = rng.getstate()
+        buffer.append(2)
+        buffer += rng_words.pack(*words)
+        buffer.append(gauss is not None)
+        if gauss is not None:
+            buffer += rng_gauss.pack(gauss)
+
+
+def read_rng(data, position, rng):
+    """
+    Function used to read generator written with write_rng.
+    :param data: bytes with snapshot
+    :param position: integer index of first byte of generator
+    :param rng: Random object returned when state was not saved
+    :return: Random object, integer index of first byte after it
+    """
+    kind, position = data[position], position + 1
+    if kind != 2:
+        return rng, position
+    words = rng_words.unpack_from(data, position)
+    position += rng_words.size
+    gauss, position = None, position + 1
+    if data[position - 1]:
+        gauss = rng_gauss.unpack_from(data, position)[0]
+        position += rng_gauss.size
+    restored = create_rng(0)
+    restored.setstate((3, words, gauss))
+    return restored, position
+
+
+def encode(game_state, with_rng=False):
+    """
+    Function used to write game state as compact bytes, which decode turns into equal game state.
+    Callbacks of players and sinks are not saved, decoded players get default ones.
+    :param game_state: GameState object
+    :param with_rng: bool value, True if states of generators are saved, so decoded game continues exactly the same
+    :return: bytes with snapshot
+    """
+    gs = game_state
+    buffer = bytearray(magic)
+    buffer.append(version)
+    write_seed(buffer, gs.seed)
+    write_rng(buffer, gs.rng, with_rng)
+    write_cards(buffer, gs.deck)
+    write_cards(buffer, gs.table)
+    write_index(buffer, gs.lied_card, rules.card_codes)
+    for counter in (gs.cards_to_take, gs.turns_to_wait, gs.requested_value_rounds):
+        write_varint(buffer, counter)
+    write_index(buffer, gs.requested_value, rules.value_indexes)
+    write_index(buffer, gs.requested_color, rules.color_indexes)
+
+    seats = {name: seat for seat, name in enumerate(gs.players)}
+    write_varint(buffer, len(seats))
+    for player in gs.players.values():
+        kind = player_kinds.index(type(player))
+        buffer.append(kind)
+        write_text(buffer, player.name)
+        write_varint(buffer, player.turns_to_skip)
+        write_cards(buffer, player.hand)
+        if kind == 1:
+            write_rng(buffer, player.rng, with_rng)
+
+    buffer.append(rankings.index(gs.ranking))
+    write_seats(buffer, gs.finished, seats)
+    buffer.append(gs.standings is not None)
+    if gs.standings is not None:
+        write_seats(buffer, gs.standings, seats)
+    return bytes(buffer)
+
+
+def decode(data):
+    """
+    Function used to read game state from bytes written with encode.
+    Generators which were not saved are created from seed, like in new game.
+    :param data: bytes with snapshot
+    :return: GameState object
+    """
+    if data[:len(magic)] != magic:
+        raise ValueError('Data is not a snapshot of game')
+    if data[len(magic)] != version:
+        raise ValueError(f'Unknown version {data[len(magic)]} of snapshot')
+    position = len(magic) + 1
+    seed, position = read_seed(data, position)
+    gs = game.GameState(seed, secure=data[position] == 1)
+    gs.rng, position = read_rng(data, position, gs.rng)
+    deck, position = read_cards(data, position)
+    table, position = read_cards(data, position)
+    gs.deck, gs.table = deck, table
+    gs.lied_card, position = read_index(data, position, rules.deck_cards)
+    gs.cards_to_take, position = read_varint(data, position)
+    gs.turns_to_wait, position = read_varint(data, position)
+    gs.requested_value_rounds, position = read_varint(data, position)
+    gs.requested_value, position = read_index(data, position, rules.values)
+    gs.requested_color, position = read_index(data, position, rules.colors)
+
+    players, position = decode_players(data, position, gs.rng)
+    gs.players = players
+    names = list(players)
+    gs.ranking = rankings[data[position]]
+    gs.finished, position = read_seats(data, position + 1, names)
+    if data[position]:
+        gs.standings, position = read_seats(data, position + 1, names)
+    return gs
+
+
+def decode_players(data, position, rng):
+    """
+    Helper function used to read players of game state.
+    :param data: bytes with snapshot
+    :param position: integer index of first byte of players
+    :param rng: Random object of game, used to spawn generators of cpu players which were not saved
+    :return: dictionary with players, integer index of first byte after them
+    """
+    players = {}
+    how_many, position = read_varint(data, position)
+    for _ in range(how_many):
+        kind, position = data[position], position + 1
+        name, position = read_text(data, position)
+        player = CPUPlayer(name, None) if kind == 1 else Player(name)
+        player.turns_to_skip, position = read_varint(data, position)
+        player.hand, position = read_cards(data, position)
+        if kind == 1:
+            player.rng, position = read_rng(data, position, None)
+            if player.rng is None:
+                player.rng = spawn_rng(rng)
+        players[name] = player
+    return players, position
@@ -0,0 +1,150 @@
+from collections import namedtuple
+import logic.logic as rules
+
+# Events are emitted by game to sinks of GameState, players are given by names, so events can be sent as they are.
+# Text of event is rendered only by sinks which need it, with lines method.
+
+
+class TurnStarted(namedtuple('TurnStarted', 'player')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} move now.']
+
+
+class TurnEnded(namedtuple('TurnEnded', 'player cards_on_hand')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} has {self.cards_on_hand} cards on hand.']
+
+
+class TurnSkipped(namedtuple('TurnSkipped', 'player turns_left')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} waits. {self.turns_left} turns to skip left.']
+
+
+class NoMove(namedtuple('NoMove', 'player')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} has no move.']
+
+
+class InvalidMove(namedtuple('InvalidMove', 'player cards')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{cards_text(self.cards)} is invalid. {self.player} makes invalid move.']
+
+
+class CardsPlayed(namedtuple('CardsPlayed', 'player cards')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} plays: {cards_text(self.cards)}.']
+
+
+class RequestMade(namedtuple('RequestMade', 'player request')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} plays: {self.request}.']
+
+
+class DeckRefilled(namedtuple('DeckRefilled', 'player')):
+    __slots__ = ()
+
+    def lines(self):
+        return ['Not enough cards in the deck. Grabbing from the table.']
+
+
+class CardsTaken(namedtuple('CardsTaken', 'player cards_to_take taken cards_on_hand')):
+    __slots__ = ()
+
+    def lines(self):
+        announce = f'{self.player} will have to take a card.'
+        if self.cards_to_take > 0:
+            announce = f'{self.player} will have to take {self.cards_to_take} cards.'
+        return [announce, f'{self.taken} cards dealt to {self.player}. | on hand: {self.cards_on_hand} cards.']
+
+
+class TurnsPunished(namedtuple('TurnsPunished', 'player turns_to_skip')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} will have to skip this and next {self.turns_to_skip} turns.']
+
+
+class Macau(namedtuple('Macau', 'player')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} has macau!']
+
+
+class MoveTimedOut(namedtuple('MoveTimedOut', 'player')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'{self.player} ran out of time.']
+
+
+class GameTimedOut(namedtuple('GameTimedOut', [])):
+    __slots__ = ()
+
+    def lines(self):
+        return ['Time for game is over.']
+
+
+class GameWon(namedtuple('GameWon', 'winners')):
+    __slots__ = ()
+
+    def lines(self):
+        return [f'Game won by {", ".join(self.winners)}']
+
+
+def cards_text(cards):
+    """
+    Function used to write cards the way players type them, not recognized cards are left out.
+    :param cards: list of tuples with cards
+    :return: string with cards separated by commas
+    """
+    return ', '.join(rules.card_text(card) for card in cards if card is not None)
+
+
+def print_sink(game_state, event):
+    """
+    Function used as sink, which renders event as text and prints it with print_foo of player it is about.
+    Game results are printed to every player.
+    :param game_state: GameState object which emitted event
+    :param event: event object
+    """
+    players = game_state.players.values()
+    if hasattr(event, 'player'):
+        players = [game_state.players[event.player]]
+    for player in players:
+        for line in event.lines():
+            player.print_foo(line)
+
+
+def compact(event):
+    """
+    Function used to convert event to dictionary, which can be sent as json without rendering text.
+    :param event: event object
+    :return: dictionary with name of event under 'event' key and its fields
+    """
+    return {'event': type(event).__name__, **event._asdict()}
+
+
+def list_sink(events):
+    """
+    Function used to create sink, which collects compact events in given list.
+    :param events: list to which events are appended
+    :return: functor of created sink
+    """
+    def sink(_game_state, event):
+        events.append(compact(event))
+    return sink
@@ -1,14 +1,38 @@
+import asyncio
 import logic.logic as rules
 from player.player import Player
 from player.cpu_player import CPUPlayer
-from copy import copy
+from logic.pile import Pile, as_pile
+from logic.rng import create_rng, spawn_rng, copy_rng
+from logic.turn import turn_context
+from logic.seats import SeatRing
+import logic.zobrist as zobrist
+import logic.events as events
 
 
 class GameState:
-
-    def __init__(self):
-        self.deck = []
-        self.table = []
+    """
+    Class used to keep whole state of game: players with hands, deck, table, requests and punishments.
+    It has fixed set of attributes and clone method, so search and server snapshots can fork it cheaply.
+    Order of turns is kept by seat ring, built again when players are changed.
+    Players are added to finished list when their hands become empty, ranking policy decides then if game is over
+    and sets standings, names of all ranked players in order of places, which stay None until the end of game.
+    Events of game are emitted to sinks, functions called with game state and event, without any sink
+    nothing is rendered, so headless games do not format any text.
+    Decisions of players in async engine can be limited with move timeout in seconds and game deadline,
+    time of event loop. When time of decision is over, timeout fallback plays turn of player instead,
+    when time of game is over, game ends with players ranked by cards on hand.
+    """
+    __slots__ = ('seed', 'rng', '_deck', '_table', '_players', '_seats', 'lied_card', 'cards_to_take', 'turns_to_wait',
+                 'requested_value_rounds', 'requested_value', 'requested_color', 'turn_context', 'sinks',
+                 'finished', 'standings', 'ranking', 'move_timeout', 'game_deadline', 'timeout_fallback')
+
+    def __init__(self, seed=None, secure=False):
+        self.seed = seed
+        self.rng = create_rng(seed, secure)
+        self.deck = Pile()
+        self.table = Pile()
+        self._seats = None
         self.players = {}
         self.lied_card = None
         self.cards_to_take = 0
@@ -16,17 +40,123 @@ class GameState:
         self.requested_value_rounds = 0
         self.requested_value = None
         self.requested_color = None
+        self.turn_context = None
+        self.sinks = []
+        self.finished = []
+        self.standings = None
+        self.ranking = stop_on_first
+        self.move_timeout = None
+        self.game_deadline = None
+        self.timeout_fallback = draw_on_timeout
+
+    def clone(self):
+        """
+        Method used to fork game state. Piles, hands, players and generators are copied,
+        cards are shared, because they are immutable tuples. Turn context is computed again in the fork,
+        which does not emit events to sinks of this game state.
+        :return: new GameState object independent from this one
+        """
+        state = GameState.__new__(GameState)
+        state.seed = self.seed
+        state.rng = copy_rng(self.rng)
+        state._deck = self._deck.copy()
+        state._table = self._table.copy()
+        state._seats = None
+        state.players = {name: player.clone() for name, player in self.players.items()}
+        state.lied_card = self.lied_card
+        state.cards_to_take = self.cards_to_take
+        state.turns_to_wait = self.turns_to_wait
+        state.requested_value_rounds = self.requested_value_rounds
+        state.requested_value = self.requested_value
+        state.requested_color = self.requested_color
+        state.turn_context = None
+        state.sinks = []
+        state.finished = list(self.finished)
+        state.standings = list(self.standings) if self.standings is not None else None
+        state.ranking = self.ranking
+        state.move_timeout = self.move_timeout
+        state.game_deadline = self.game_deadline
+        state.timeout_fallback = self.timeout_fallback
+        return state
+
+    def state_hash(self):
+        """
+        Method used to get 64-bit zobrist hash of cards and counters of game, for transposition tables and cache keys.
+        Hashes of piles and hands are updated by their own mutators whenever cards move, so here only they,
+        counters of punishments and requests and skipped turns of players are combined, without looking at cards.
+        Equal states have equal hashes, also in other processes. Generators, sinks and ranking are not hashed.
+        :return: integer from 0 to 2 ** 64 - 1
+        """
+        counters = (self.lied_card, self.cards_to_take, self.turns_to_wait, self.requested_value_rounds,
+                    self.requested_value, self.requested_color)
+        seats = ((player.hand.zobrist, player.turns_to_skip) for player in self._players.values())
+        return zobrist.state_hash(self._deck.zobrist, self._table.zobrist, counters, seats)
+
+    def emit(self, event):
+        """
+        Method used to pass event of game to every sink.
+        :param event: event object from events module
+        """
+        for sink in self.sinks:
+            sink(self, event)
+
+    @property
+    def deck(self):
+        return self._deck
+
+    @deck.setter
+    def deck(self, cards):
+        self._deck = as_pile(cards)
+
+    @property
+    def table(self):
+        return self._table
+
+    @table.setter
+    def table(self, cards):
+        self._table = as_pile(cards)
+
+    @property
+    def players(self):
+        return self._players
+
+    @players.setter
+    def players(self, players):
+        self._players = players
+        self._seats = None
+
+    @property
+    def seats(self):
+        """
+        Property with seat ring of players, built again only when players dictionary was replaced or resized.
+        :return: SeatRing object
+        """
+        if self._seats is None or not self._seats.matches(self._players):
+            self._seats = SeatRing(self._players)
+        return self._seats
+
+
+def count_decks(how_many_players, how_many_cards):
+    """
+    Function used to evaluate how many decks are needed, so there are about twice as many cards as dealt.
+    :param how_many_players: integer of how many players are in game
+    :param how_many_cards: integer of how many cards will be dealt to players at start
+    :return: integer of how many decks will be in game
+    """
+    return round(0.5 + ((how_many_players * how_many_cards) * 2) / 52)
 
 
-def prepare_game(players_names, how_many_decks=1, how_many_cards=5):
+def prepare_game(players_names, how_many_decks=1, how_many_cards=5, *, rng):
     """
     Function used to prepare game to be played.
+    Every cpu player gets own generator spawned from rng, so its choices do not change shuffles of deck.
     :param players_names: list with names of players
     :param how_many_decks: integer of how many decks will be in game
     :param how_many_cards: integer of how many cards will be dealt to players at start
+    :param rng: Random object used in game, usually GameState.rng
     :return: list with deck, list with table, dictionary with players
     """
-    deck, table, _ = rules.prepare_deck(how_many=how_many_decks)
+    deck, table, _ = rules.prepare_deck(how_many=how_many_decks, rng=rng)
     table, deck, _ = rules.deal_cards(deck, 1)
 
     if len(table) > 0:
@@ -35,11 +165,12 @@ def prepare_game(players_names, how_many_decks=1, how_many_cards=5):
             table += card
 
     players = {}
-    for name in players_names:
+    hands, deck = rules.deal_hands(deck, len(players_names), how_many_cards)
+    for name, hand in zip(players_names, hands):
         players[name] = Player(name)
         if 'CPU' in name:
-            players[name] = CPUPlayer(name)
-        players[name].hand, deck, _ = rules.deal_cards(deck, how_many_cards)
+            players[name] = CPUPlayer(name, spawn_rng(rng))
+        players[name].hand = hand
 
     return deck, table, players
 
@@ -47,6 +178,7 @@ def prepare_game(players_names, how_many_decks=1, how_many_cards=5):
 async def play_move(player, game_state):
     """
     Function used to process logic of player move.
+    Decision of player is awaited only until deadline of move, timeout fallback of game state plays turn after it.
     :param player: Player objects
     :param game_state: GameState object with all information about state of game
     :return: Updated player, updated game_state
@@ -54,122 +186,317 @@ async def play_move(player, game_state):
     gs = game_state
     if player.turns_to_skip > 0:
         player.turns_to_skip -= 1
-        player.print_foo(f'{player.name} waits. {player.turns_to_skip} turns to skip left.')
+        gs.emit(events.TurnSkipped(player.name, player.turns_to_skip))
         return player, gs
 
-    top_card = gs.lied_card
-    if not top_card:
-        top_card = gs.table[-1]
-
-    active = rules.check_card_played_active(top_card)
-    if active and gs.lied_card:
-        possible_plays, can_move = \
-            rules.active_card_possible_plays(player.hand, top_card, gs.requested_color, gs.requested_value)
-    else:
-        possible_plays, can_move = rules.nonactive_card_possible_plays(player.hand, top_card, gs.requested_value)
-
-    if not can_move:
-        player.print_foo(f'{player.name} has no move.')
+    context = turn_context(player.hand, gs)
+    if not context.can_move:
+        gs.emit(events.NoMove(player.name))
         gs = punish_player(player, gs)
         return player, gs
 
-    message = await player.gui_foo(gs, top_card, possible_plays)
-    played = await player.input_foo(message)
-    played = played.replace('*', '')
-    valid_play, played_cards = validate_move(player.hand, game_state, played)
-    if not valid_play:
-        player.print_foo(f'{played} is invalid. {player.name} makes invalid move.')
+    deadline = decision_deadline(gs)
+    try:
+        move = await await_decision(player.move_foo(gs, context.top_card, context.possible_plays), deadline)
+    except asyncio.TimeoutError:
+        return await time_out_move(player, gs)
+    return await play_chosen_move(player, move, gs, deadline)
+
+
+async def play_chosen_move(player, move, game_state, deadline=None):
+    """
+    Function used to play move chosen by player: invalid move is punished, valid one is evaluated.
+    :param player: Player objects
+    :param move: Move object with cards to play and request
+    :param game_state: GameState object with all information about state of game
+    :param deadline: float time of event loop until which player can make request, None if there is no limit
+    :return: Updated player, updated game_state
+    """
+    gs = game_state
+    if not validate_move(player.hand, gs, move):
+        gs.emit(events.InvalidMove(player.name, move.cards))
         gs = punish_player(player, gs)
         return player, gs
 
-    gs = await cards_play_evaluate(player, played_cards, gs)
+    gs.emit(events.CardsPlayed(player.name, move.cards))
+    gs = await cards_play_evaluate(player, move, gs, deadline)
+    if len(player.hand) == 1:
+        gs.emit(events.Macau(player.name))
     return player, gs
 
 
-def validate_move(hand, game_state, played):
+def decision_deadline(game_state):
     """
-    Helper function used to check if potential player's move is valid and possible.
-    :param hand: list of cards on player hand
+    Function used to find time of event loop until which player has to decide about move,
+    the earlier of move timeout counted from now and deadline of game.
     :param game_state: GameState object with all information about state of game
-    :param played: string with players potential move
-    :return: bool value of move validity, player's move as list of cards
+    :return: float time of event loop, None if there is no time limit
     """
     gs = game_state
-    top_card = gs.lied_card
-    valid = True
-    if not top_card:
-        top_card = gs.table[-1]
+    deadline = gs.game_deadline
+    if gs.move_timeout is not None:
+        move_deadline = asyncio.get_running_loop().time() + gs.move_timeout
+        deadline = move_deadline if deadline is None else min(deadline, move_deadline)
+    return deadline
 
-    active = rules.check_card_played_active(top_card)
-    if active and gs.lied_card:
-        possible_plays, can_move = \
-            rules.active_card_possible_plays(hand, top_card, gs.requested_color, gs.requested_value)
-    else:
-        possible_plays, can_move = rules.nonactive_card_possible_plays(hand, top_card, gs.requested_value)
 
-    if len(played.split(',')) > 1:
-        packs, played_cards, valid = convert_input_to_cards(hand, played, possible_plays)
-    else:
-        played_cards = [rules.convert_to_card(played)]
+async def await_decision(decision, deadline):
+    """
+    Function used to await decision of player until deadline, decision not made in time is cancelled.
+    :param decision: awaitable with decision of player
+    :param deadline: float time of event loop, None if there is no time limit
+    :return: result of decision
+    :raise asyncio.TimeoutError: when player did not decide before deadline
+    """
+    if deadline is None:
+        return await decision
+    return await asyncio.wait_for(decision, max(deadline - asyncio.get_running_loop().time(), 0))
 
-    if played_cards[0] not in possible_plays:
-        valid = False
 
-    hand_copy = copy(hand)
-    for card in played_cards:
-        if card in hand_copy:
-            hand_copy.remove(card)
-        else:
-            valid = False
+def game_time_over(game_state):
+    """
+    Function used to check if deadline of game has passed.
+    :param game_state: GameState object with all information about state of game
+    :return: bool value, True if game has to end now
+    """
+    deadline = game_state.game_deadline
+    return deadline is not None and asyncio.get_running_loop().time() >= deadline
+
+
+def end_game_on_time(game_state):
+    """
+    Function used to end game which time is over, players are ranked by number of cards left on hand.
+    :param game_state: GameState object with all information about state of game
+    :return: Updated GameState object with all information about state of game
+    """
+    game_state.emit(events.GameTimedOut())
+    game_state.standings = rank_remaining(game_state)
+    return game_state
+
+
+async def time_out_move(player, game_state):
+    """
+    Function used to finish turn of player who did not decide in time, with timeout fallback of game state,
+    or to end game, if its time is over.
+    :param player: Player object of player who ran out of time
+    :param game_state: GameState object with all information about state of game
+    :return: Updated player, updated game_state
+    """
+    if game_time_over(game_state):
+        return player, end_game_on_time(game_state)
+    game_state.emit(events.MoveTimedOut(player.name))
+    return await game_state.timeout_fallback(player, game_state)
+
+
+async def draw_on_timeout(player, game_state):
+    """
+    Function used as timeout fallback, which punishes player like one without move: with cards or skipped turns.
+    :param player: Player object of player who ran out of time
+    :param game_state: GameState object with all information about state of game
+    :return: Updated player, updated game_state
+    """
+    return player, punish_player(player, game_state)
+
+
+async def play_cpu_on_timeout(player, game_state):
+    """
+    Function used as timeout fallback, which plays move chosen for player by cpu strategy.
+    Cpu gets copy of game generator, so fallback does not change shuffles of deck.
+    Nobody is asked about request, only request chosen by cpu is made.
+    :param player: Player object of player who ran out of time
+    :param game_state: GameState object with all information about state of game
+    :return: Updated player, updated game_state
+    """
+    gs = game_state
+    cpu = CPUPlayer(player.name, copy_rng(gs.rng))
+    cpu.hand = player.hand
+    context = turn_context(player.hand, gs)
+    move = cpu.decide_foo(gs, context.top_card, context.possible_plays)
+    return await play_chosen_move(player, move, gs, asyncio.get_running_loop().time())
+
+
+async def forfeit_on_timeout(player, game_state):
+    """
+    Function used as timeout fallback, which ends game at once, player who ran out of time is ranked last.
+    :param player: Player object of player who ran out of time
+    :param game_state: GameState object with all information about state of game
+    :return: Updated player, updated game_state
+    """
+    game_state.standings = rank_remaining(game_state, player.name)
+    return player, game_state
 
-    return valid, played_cards
+
+timeout_fallbacks = {'draw': draw_on_timeout, 'cpu': play_cpu_on_timeout, 'forfeit': forfeit_on_timeout}
+
+
+def validate_move(hand, game_state, move):
+    """
+    Helper function used to check if potential player's move is valid and possible.
+    Possible plays come from turn context, so they are not computed again in the same turn.
+    :param hand: list of cards on player hand
+    :param game_state: GameState object with all information about state of game
+    :param move: Move object with players potential move
+    :return: bool value of move validity
+    """
+    context = turn_context(hand, game_state)
+    valid = validate_cards(hand, move.cards, context.possible_plays)
+    if valid and len(move.cards) > 1:
+        valid = check_validity_of_pack(hand, move.cards, context.packs)
+    return valid
+
+
+def validate_cards(hand, played_cards, possible_plays):
+    """
+    Helper function used to check if first of played cards is possible to play and all of them are on hand.
+    :param hand: list of cards on player hand
+    :param played_cards: list of tuples with played by player cards
+    :param possible_plays: list of possible plays from players hand
+    :return: True if cards can be played, False otherwise
+    """
+    if len(played_cards) == 0 or played_cards[0] not in possible_plays:
+        return False
+
+    hand_copy = list(hand)
+    for card in played_cards:
+        if card not in hand_copy:
+            return False
+        hand_copy.remove(card)
+    return True
 
 
 async def play_round(game_state):
     """
     Function used to process logic of one round (one move per every player in game).
+    Round is stopped when game ends or its time is over, players who already finished are passed.
     :param game_state: GameState object with all information about state of game
     :return: Updated GameState object with all information about state of game
     """
     gs = game_state
-    for player in gs.players.values():
-        if gs.requested_value_rounds > 0:
-            gs.requested_value_rounds -= 1
-        else:
-            gs.requested_value = None
-
+    for player in gs.seats:
+        if gs.standings is not None:
+            break
+        if player.name in gs.finished:
+            continue
+        if game_time_over(gs):
+            gs = end_game_on_time(gs)
+            break
+        gs = begin_turn(gs)
         last_card = gs.lied_card
-        player.print_foo(f'{player.name} move now.')
+        gs.emit(events.TurnStarted(player.name))
         player, gs = await play_move(player, gs)
+        gs = end_turn(player, gs, last_card)
+        gs.emit(events.TurnEnded(player.name, len(player.hand)))
+        if len(player.hand) == 0:
+            gs = finish_player(player, gs)
+
+    return gs
+
+
+def begin_turn(game_state):
+    """
+    Function used to expire requested value before next player move.
+    :param game_state: GameState object with all information about state of game
+    :return: Updated GameState object with all information about state of game
+    """
+    gs = game_state
+    if gs.requested_value_rounds > 0:
+        gs.requested_value_rounds -= 1
+    else:
+        gs.requested_value = None
+    return gs
+
+
+def end_turn(player, game_state, last_card):
+    """
+    Function used to apply effects lasting after player move: value request of jack and punishment of pikes king.
+    :param player: Player object of player who just moved
+    :param game_state: GameState object with all information about state of game
+    :param last_card: tuple with card lied on table before player move
+    :return: Updated GameState object with all information about state of game
+    """
+    gs = game_state
+    if gs.lied_card is not None:
+        if last_card != gs.lied_card and gs.requested_value is not None and gs.lied_card[1] == 'J':
+            gs.requested_value_rounds = len(gs.players)
 
-        if gs.lied_card is not None:
-            if last_card != gs.lied_card and gs.requested_value is not None and gs.lied_card[1] == 'J':
-                gs.requested_value_rounds = len(gs.players)
+        if gs.lied_card == ('pikes', 'K'):
+            gs = pikes_king_punishment(player, gs)
+    return gs
 
-            if gs.lied_card == ('pikes', 'K'):
-                gs = pikes_king_punishment(player, gs)
-        player.print_foo(f"{player.name} has {len(player.hand)} cards on hand.")
 
+def finish_player(player, game_state):
+    """
+    Function used to add player who just emptied hand to finished players and let ranking policy end game.
+    :param player: Player object of player with empty hand
+    :param game_state: GameState object with all information about state of game
+    :return: Updated GameState object with all information about state of game
+    """
+    gs = game_state
+    if player.name not in gs.finished:
+        gs.finished.append(player.name)
+        gs.standings = gs.ranking(gs)
     return gs
 
 
+def stop_on_first(game_state):
+    """
+    Function used as ranking policy, which ends game when first player empties hand, nobody else is ranked.
+    :param game_state: GameState object
+    :return: list with name of winner, None if nobody finished yet
+    """
+    return list(game_state.finished) if game_state.finished else None
+
+
+def rank_by_cards(game_state):
+    """
+    Function used as ranking policy, which ends game when first player empties hand and ranks the rest
+    by number of cards left on hand, players with the same number in order of seats.
+    :param game_state: GameState object
+    :return: list with names of all players, None if nobody finished yet
+    """
+    if not game_state.finished:
+        return None
+    return rank_remaining(game_state)
+
+
+def rank_remaining(game_state, forfeited=None):
+    """
+    Function used to rank all players: finished ones in order of emptying hands, the rest by number of cards
+    on hand, players with the same number in order of seats.
+    :param game_state: GameState object
+    :param forfeited: string with name of player who forfeited game and is ranked last, None if nobody did
+    :return: list with names of all players
+    """
+    gs = game_state
+    rest = [player for player in gs.seats if player.name not in gs.finished and player.name != forfeited]
+    ranked = gs.finished + [player.name for player in sorted(rest, key=lambda player: len(player.hand))]
+    return ranked + [forfeited] if forfeited is not None else ranked
+
+
+def play_out(game_state):
+    """
+    Function used as ranking policy, which lets players play until only one of them has cards,
+    places are given in order of emptying hands.
+    :param game_state: GameState object
+    :return: list with names of all players, None if more than one player has cards
+    """
+    gs = game_state
+    if len(gs.finished) < len(gs.players) - 1:
+        return None
+    return gs.finished + [player.name for player in gs.seats if player.name not in gs.finished]
+
+
 async def play_game(game_state):
     """
-    Function used to play game on terminal locally
+    Function used to play game on terminal locally.
+    Game ends in the middle of round, as soon as ranking policy of game state sets standings.
     :param game_state: GameState object
-    :return: list of winners
+    :return: list with name of winner
     """
-    winners = []
-    while len(winners) == 0:
+    while game_state.standings is None:
         game_state = await play_round(game_state)
-        for player in game_state.players.values():
-            if len(player.hand) == 0:
-                winners.append(player.name)
-    for player in game_state.players.values():
-        message = 'Game won by '
-        for winner in winners:
-            message += f'{winner}, '
-        player.print_foo(message[:-2])
+    winners = game_state.standings[:1]
+    game_state.emit(events.GameWon(winners))
     return winners
 
 
@@ -183,90 +510,115 @@ def punish_player(player, game_state):
     """
     gs = game_state
     if gs.turns_to_wait > 0:
-        gs.lied_card, gs.turns_to_wait = rules.skip_punishment(player, gs.table, gs.lied_card, gs.turns_to_wait)
+        gs.lied_card, gs.turns_to_wait = \
+            rules.skip_punishment(player, gs.table, gs.lied_card, gs.turns_to_wait, gs.emit)
     else:
         gs.deck, gs.table, gs.lied_card, gs.cards_to_take = \
-            rules.take_cards_punishment(player, gs.deck, gs.table, gs.lied_card, gs.cards_to_take)
+            rules.take_cards_punishment(player, gs.deck, gs.table, gs.lied_card, gs.cards_to_take,
+                                        rng=gs.rng, emit=gs.emit)
     return gs
 
 
 def pikes_king_punishment(player, game_state):
     """
-    Function used to punish with cards last player (one back from current).
+    Function used to punish with cards last player (one back from current), players skipping turns are passed.
     :param player: Player object of current player
     :param game_state: GameState object with all information about state of game
     :return: Updated game_state object
     """
     gs = game_state
-    non_skip_players = [name for name, player in gs.players.items() if player.turns_to_skip == 0]
-    players_list = non_skip_players + non_skip_players
-    for index in range(len(players_list) - 1):
-        if players_list[index + 1] == player.name:
-            rival = gs.players[players_list[index]]
-            gs.deck, gs.table, gs.lied_card, gs.cards_to_take = \
-                rules.take_cards_punishment(rival, gs.deck, gs.table, gs.lied_card, gs.cards_to_take)
-            break
+    rival = gs.seats.previous_active(player.name)
+    if rival is not None:
+        gs.deck, gs.table, gs.lied_card, gs.cards_to_take = \
+            rules.take_cards_punishment(rival, gs.deck, gs.table, gs.lied_card, gs.cards_to_take,
+                                        rng=gs.rng, emit=gs.emit)
     return gs
 
 
-async def cards_play_evaluate(player, played_cards, game_state):
+async def cards_play_evaluate(player, move, game_state, deadline=None):
     """
     Function used to evaluate the effect of played cards on the current game state.
+    Player is asked about request after jack or ace only when move does not have it already,
+    request not made until deadline is not made at all.
+    Request in effect after the move is emitted as event.
     :param player: Player objects
-    :param played_cards: list with tuples with cards data
+    :param move: Move object with played cards and request
     :param game_state: GameState object with all information about state of game
+    :param deadline: float time of event loop until which player can make request, None if there is no limit
     :return: Updated player, updated game_state
     """
     gs = game_state
     ace_jacks_requested = False
-    for played_card in played_cards:
-        played_card_active = rules.check_card_played_active(played_card)
-        if played_card_active and not ace_jacks_requested:
+    for played_card in move.cards:
+        effect = rules.card_effect(played_card)
+        if effect.active and not ace_jacks_requested and (effect.request is None or move.request is not None):
             gs.cards_to_take, gs.requested_color, gs.requested_value, gs.turns_to_wait = \
-                await rules.additional_actions(played_card, gs.cards_to_take, gs.turns_to_wait, player.input_foo)
-            ace_jacks_requested = played_card[1] == 'J' or played_card[1] == 'A'
-
-        player.hand.remove(played_card)
-        if gs.lied_card:
-            gs.table.append(gs.lied_card)
-        if gs.lied_card and played_card[1] != 'A':
-            gs.requested_color = None
-        gs.lied_card = played_card
+                rules.apply_card_effect(played_card, gs.cards_to_take, gs.turns_to_wait)
+            if effect.request is not None:
+                gs.requested_color, gs.requested_value = rules.evaluate_request(played_card, move.request)
+                ace_jacks_requested = True
+        elif effect.active and not ace_jacks_requested:
+            actions = rules.additional_actions(played_card, gs.cards_to_take, gs.turns_to_wait, player.input_foo)
+            try:
+                gs.cards_to_take, gs.requested_color, gs.requested_value, gs.turns_to_wait = \
+                    await await_decision(actions, deadline)
+            except asyncio.TimeoutError:
+                gs.cards_to_take, gs.requested_color, gs.requested_value, gs.turns_to_wait = \
+                    rules.apply_card_effect(played_card, gs.cards_to_take, gs.turns_to_wait)
+            ace_jacks_requested = True
+        gs = lay_card(player, played_card, gs)
+    if ace_jacks_requested:
+        emit_request(player, gs)
     return gs
 
 
-def convert_input_to_cards(hand, played, possible_plays):
+def emit_request(player, game_state):
     """
-    Function used to convert player input to list of cards
-    :param hand: list of cards on player hand
-    :param played: input given by player
-    :param possible_plays: list of possible plays from players hand
-    :return: packs of cards possible to be played, list of cards played by player, True if cards are valid or False
+    Function used to emit request made with jack or ace, if player requested proper color or value.
+    :param player: Player object of player who made request
+    :param game_state: GameState object with all information about state of game
     """
-    played_cards = []
-    valid = True
-    cards_value = ''
-    packs = rules.check_if_pack_on_hand(hand)
-    packs = rules.check_if_packs_can_be_played(packs, possible_plays)
-    for card_data in played.split(','):
-        card = rules.convert_to_card(card_data)
-        if card is None:
-            continue
-        cards_value = card[1]
-        if cards_value not in packs or card not in hand:
-            valid = False
-        played_cards.append(card)
+    request = game_state.requested_color or game_state.requested_value
+    if request is not None:
+        game_state.emit(events.RequestMade(player.name, request))
+
+
+def lay_card(player, played_card, game_state):
+    """
+    Function used to move played card from player hand to top of a table.
+    :param player: Player objects
+    :param played_card: tuple with played card
+    :param game_state: GameState object with all information about state of game
+    :return: Updated GameState object with all information about state of game
+    """
+    gs = game_state
+    player.hand.remove(played_card)
+    if gs.lied_card:
+        gs.table.append(gs.lied_card)
+    if gs.lied_card and rules.card_effect(played_card).request != 'color':
+        gs.requested_color = None
+    gs.lied_card = played_card
+    return gs
 
+
+def check_validity_of_pack(hand, played_cards, packs):
+    """
+    Helper function used to check if played cards are a pack which can be played from player hand.
+    :param hand: list of cards on player hand
+    :param played_cards: list of tuples with played by player cards
+    :param packs: list of values of packs which can be played in this turn, usually TurnContext.packs
+    :return: True if pack is valid or False
+    """
     if len(played_cards) < 3:
-        valid = False
+        return False
 
+    cards_value = played_cards[-1][1]
+    valid = cards_value in packs
     for card in played_cards:
-        if cards_value != card[1]:
+        if cards_value != card[1] or card not in hand:
             valid = False
 
-    valid = check_validity_of_kings(played_cards) and valid
-
-    return packs, played_cards, valid
+    return check_validity_of_kings(played_cards) and valid
 
 
 def check_validity_of_kings(played_cards):
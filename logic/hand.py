@@ -0,0 +1,142 @@
+from logic.logic import card_codes, deck_cards, deck_size
+from logic.zobrist import card_key, mask as key_mask
+
+code_keys = [card_key(card) for card in deck_cards]
+
+
+class Hand(list):
+    """
+    Class used to keep cards on player's hand.
+    It keeps counters of values and colors of cards up to date with every change of the hand,
+    so questions about packs or the most frequent trait do not need to scan whole hand.
+    It also keeps bit mask of card codes on hand, the same as used by possible plays masks in rules,
+    and version number increased with every change, so turn context knows when to compute plays again.
+    Zobrist hash of hand is sum of keys of its cards, so it does not depend on order of cards and sorting keeps it.
+    """
+    __slots__ = ('value_counts', 'color_counts', 'code_counts', 'mask', 'version', 'zobrist')
+
+    def __init__(self, cards=()):
+        list.__init__(self, cards)
+        self.value_counts = {}
+        self.color_counts = {}
+        self.code_counts = [0] * deck_size
+        self.mask = 0
+        self.version = 0
+        self.zobrist = 0
+        self._count(self, 1)
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def copy(self):
+        """
+        Method used to copy hand together with its counters, without counting cards again.
+        :return: new Hand object with the same cards
+        """
+        hand = Hand.__new__(Hand)
+        list.extend(hand, self)
+        hand.value_counts = dict(self.value_counts)
+        hand.color_counts = dict(self.color_counts)
+        hand.code_counts = list(self.code_counts)
+        hand.mask = self.mask
+        hand.version = self.version
+        hand.zobrist = self.zobrist
+        return hand
+
+    def _count(self, cards, change):
+        """
+        Helper method used to update counters of values and colors.
+        :param cards: iterable with cards added or removed from hand
+        :param change: integer 1 when cards were added, -1 when cards were removed
+        """
+        value_counts, color_counts, code_counts = self.value_counts, self.color_counts, self.code_counts
+        mask, zobrist = self.mask, self.zobrist
+        for card in cards:
+            value_counts[card[1]] = value_counts.get(card[1], 0) + change
+            color_counts[card[0]] = color_counts.get(card[0], 0) + change
+            code = card_codes.get(tuple(card))
+            if code is None:
+                continue
+            code_counts[code] += change
+            zobrist += change * code_keys[code]
+            if code_counts[code] > 0:
+                mask |= 1 << code
+            else:
+                mask &= ~(1 << code)
+        self.mask = mask
+        self.zobrist = zobrist & key_mask
+        self.version += 1
+
+    def append(self, card):
+        list.append(self, card)
+        self._count((card,), 1)
+
+    def extend(self, cards):
+        cards = list(cards)
+        list.extend(self, cards)
+        self._count(cards, 1)
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+    def insert(self, index, card):
+        list.insert(self, index, card)
+        self._count((card,), 1)
+
+    def remove(self, card):
+        list.remove(self, card)
+        self._count((card,), -1)
+
+    def pop(self, index=-1):
+        card = list.pop(self, index)
+        self._count((card,), -1)
+        return card
+
+    def clear(self):
+        list.clear(self)
+        self.value_counts.clear()
+        self.color_counts.clear()
+        self.code_counts = [0] * deck_size
+        self.mask = 0
+        self.zobrist = 0
+        self.version += 1
+
+    def sort(self, *, key=None, reverse=False):
+        list.sort(self, key=key, reverse=reverse)
+        self.version += 1
+
+    def reverse(self):
+        list.reverse(self)
+        self.version += 1
+
+    def __setitem__(self, index, cards):
+        if isinstance(index, slice):
+            removed, cards = self[index], list(cards)
+            added = cards
+        else:
+            removed, added = [self[index]], [cards]
+        list.__setitem__(self, index, cards)
+        self._count(removed, -1)
+        self._count(added, 1)
+
+    def __delitem__(self, index):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        list.__delitem__(self, index)
+        self._count(removed, -1)
+
+    def __imul__(self, times):
+        added = list(self) * (times - 1) if times > 0 else []
+        if times <= 0:
+            self.clear()
+        else:
+            list.extend(self, added)
+            self._count(added, 1)
+        return self
+
+    def packs(self):
+        """
+        Method used to find values of cards which can be played as a pack (at least three cards).
+        :return: list of cards values
+        """
+        return [value for value, count in self.value_counts.items() if count >= 3]
@@ -0,0 +1,169 @@
+import logic.logic as rules
+import logic.game as game
+import logic.events as events
+from logic.turn import turn_context
+from logic.rng import set_rng_state
+
+
+def play_move(player, game_state, move=None):
+    """
+    Function used to process logic of player move without event loop, text input or printing,
+    events are emitted only to sinks of game state.
+    Player is asked for decision with decide_foo(game_state, top_card, possible_plays) callback,
+    which returns Move object with cards to play and requested color or value (or None).
+    :param player: Player object with decide_foo callback
+    :param game_state: GameState object with all information about state of game
+    :param move: Move object chosen before, None if player should be asked for decision
+    :return: Updated player, updated game_state
+    """
+    gs = game_state
+    if player.turns_to_skip > 0:
+        player.turns_to_skip -= 1
+        gs.emit(events.TurnSkipped(player.name, player.turns_to_skip))
+        return player, gs
+
+    context = turn_context(player.hand, gs)
+    if not context.can_move:
+        gs.emit(events.NoMove(player.name))
+        return player, game.punish_player(player, gs)
+
+    if move is None:
+        move = player.decide_foo(gs, context.top_card, context.possible_plays)
+    if not game.validate_move(player.hand, gs, move):
+        gs.emit(events.InvalidMove(player.name, move.cards))
+        return player, game.punish_player(player, gs)
+
+    gs.emit(events.CardsPlayed(player.name, move.cards))
+    gs = cards_play_evaluate(player, move, gs)
+    if len(player.hand) == 1:
+        gs.emit(events.Macau(player.name))
+    return player, gs
+
+
+def cards_play_evaluate(player, move, game_state):
+    """
+    Function used to evaluate the effect of played cards on the current game state.
+    Request made together with the first jack or ace is taken from move, no player is asked.
+    :param player: Player objects
+    :param move: Move object with played cards and request, None as request if player made no request
+    :param game_state: GameState object with all information about state of game
+    :return: Updated game_state
+    """
+    gs = game_state
+    ace_jacks_requested = False
+    for played_card in move.cards:
+        effect = rules.card_effect(played_card)
+        if effect.active and not ace_jacks_requested:
+            gs.cards_to_take, gs.requested_color, gs.requested_value, gs.turns_to_wait = \
+                rules.apply_card_effect(played_card, gs.cards_to_take, gs.turns_to_wait)
+            if effect.request is not None:
+                gs.requested_color, gs.requested_value = rules.evaluate_request(played_card, move.request)
+                ace_jacks_requested = True
+        gs = game.lay_card(player, played_card, gs)
+    if ace_jacks_requested:
+        game.emit_request(player, gs)
+    return gs
+
+
+def play_round(game_state):
+    """
+    Function used to process logic of one round (one move per every player in game) without event loop.
+    Round is stopped when game ends, players who already finished are passed.
+    :param game_state: GameState object with all information about state of game
+    :return: Updated GameState object with all information about state of game
+    """
+    gs = game_state
+    for player in gs.seats:
+        if gs.standings is not None:
+            break
+        if player.name in gs.finished:
+            continue
+        player, gs = play_turn(player, gs)
+    return gs
+
+
+def play_turn(player, game_state, move=None):
+    """
+    Function used to play whole turn of one player: expiring of requests, move and its lasting effects.
+    Player who emptied hand is finished, ranking policy can end game then.
+    :param player: Player object of player who moves now
+    :param game_state: GameState object with all information about state of game
+    :param move: Move object chosen before, None if player should be asked for decision
+    :return: Updated player, updated game_state
+    """
+    gs = game.begin_turn(game_state)
+    last_card = gs.lied_card
+    gs.emit(events.TurnStarted(player.name))
+    player, gs = play_move(player, gs, move)
+    gs = game.end_turn(player, gs, last_card)
+    gs.emit(events.TurnEnded(player.name, len(player.hand)))
+    if len(player.hand) == 0:
+        gs = game.finish_player(player, gs)
+    return player, gs
+
+
+def play_game(game_state):
+    """
+    Function used to play whole game without event loop, every player needs decide_foo callback.
+    Game ends as soon as ranking policy of game state sets standings.
+    :param game_state: GameState object
+    :return: list with name of winner
+    """
+    while game_state.standings is None:
+        game_state = play_round(game_state)
+    winners = game_state.standings[:1]
+    game_state.emit(events.GameWon(winners))
+    return winners
+
+
+def apply(game_state, player, move=None):
+    """
+    Function used to play whole turn of player in place, so it can be undone later with undo function.
+    Turns applied one after another have to be undone in reverse order. Decision of player asked when
+    move is None is not undone, only changes of game state are.
+    :param game_state: GameState object with all information about state of game
+    :param player: Player object of player who moves now
+    :param move: Move object, None if player should be asked for decision
+    :return: tuple used as undo token
+    """
+    gs = game_state
+    if gs.deck.journal is None:
+        gs.deck.journal = []
+    counters = (gs.lied_card, gs.cards_to_take, gs.turns_to_wait, gs.requested_value_rounds,
+                gs.requested_value, gs.requested_color)
+    hands = [(rival.hand, len(rival.hand)) for rival in gs.players.values() if rival is not player]
+    token = (len(gs.deck.journal), len(gs.table), counters, player, player.turns_to_skip, list(player.hand), hands)
+
+    gs = game.begin_turn(gs)
+    last_card = gs.lied_card
+    player, gs = play_move(player, gs, move)
+    game.end_turn(player, gs, last_card)
+    return token
+
+
+def undo(game_state, token):
+    """
+    Function used to bring game state back to the moment before turn applied with apply function.
+    Taken cards return to deck, refills of deck are reverted together with shuffles of generator.
+    :param game_state: GameState object with all information about state of game
+    :param token: tuple returned by apply function
+    """
+    gs = game_state
+    position, table_length, counters, player, turns_to_skip, hand, hands = token
+    journal = gs.deck.journal
+    for entry in reversed(journal[position:]):
+        if entry[0] == 'draw':
+            gs.deck.extend(entry[1][::-1])
+        else:
+            _, deck, table, rng_state = entry
+            gs.deck[:], gs.table[:] = deck, table
+            set_rng_state(gs.rng, rng_state)
+    del journal[position:]
+    del gs.table[table_length:]
+
+    gs.lied_card, gs.cards_to_take, gs.turns_to_wait, gs.requested_value_rounds, \
+        gs.requested_value, gs.requested_color = counters
+    player.turns_to_skip = turns_to_skip
+    player.hand[:] = hand
+    for rival_hand, length in hands:
+        del rival_hand[length:]
@@ -1,43 +1,346 @@
-from random import shuffle
+from collections import namedtuple
+from logic.pile import as_pile, draw_cards
+from logic.rng import get_rng_state
+import logic.events as events
 
 
 colors = 'hearts tiles clovers pikes'.split()
 values = '2 3 4 5 6 7 8 9 10 J Q K A'.split()
+deck_size = len(colors) * len(values)
 
+# Cards are encoded as integers: value_index * 4 + color_index gives 0..51 inside one deck
+# (the same order in which prepare_deck builds it) and every next deck adds another 52.
+# Hands, deck and table keep interned (color, value) tuples, because the same lists are sent as JSON
+# by the server and compared with tuples by clients, so codes live in these tables and in Hand counters.
+color_indexes = {color: index for index, color in enumerate(colors)}
+value_indexes = {value: index for index, value in enumerate(values)}
+deck_cards = [(color, value) for value in values for color in colors]
+card_codes = {card: code for code, card in enumerate(deck_cards)}
 
-def prepare_deck(table=None, players=None, how_many=1):
+card_colors = [code % len(colors) for code in range(deck_size)]
+card_ranks = [code // len(colors) for code in range(deck_size)]
+card_active = [card in [('hearts', 'K'), ('pikes', 'K')] or card[1] in '2 3 4 J A'.split() for card in deck_cards]
+card_attack = [5 if card in [('hearts', 'K'), ('pikes', 'K')] else int(card[1]) if card[1] in '2 3'.split() else 0
+               for card in deck_cards]
+card_skip = [1 if card[1] == '4' else 0 for card in deck_cards]
+card_requests = ['value' if card[1] == 'J' else 'color' if card[1] == 'A' else None for card in deck_cards]
+requestable_values = frozenset('5 6 7 8 9 10'.split())
+requestable_colors = frozenset(colors)
+
+# One compiled effect per card code: cards to take, turns to wait, kind of request ('value', 'color' or None)
+# and flag telling whether card is special at all.
+CardEffect = namedtuple('CardEffect', 'attack skip request active')
+card_effects = [CardEffect(*effect) for effect in zip(card_attack, card_skip, card_requests, card_active)]
+
+queen_rank, jack_rank, ace_rank = value_indexes['Q'], value_indexes['J'], value_indexes['A']
+attacking_ranks = {value_indexes[value] for value in '2 3 K'.split()}
+mundane_kings = [card_codes[('tiles', 'K')], card_codes[('clovers', 'K')]]
+
+# Bit masks over card codes of one deck, used to evaluate possible plays with a few bitwise operations.
+full_mask = (1 << deck_size) - 1
+color_masks = [sum(1 << code for code in range(deck_size) if card_colors[code] == color)
+               for color in range(len(colors))]
+rank_masks = [sum(1 << code for code in range(deck_size) if card_ranks[code] == rank)
+              for rank in range(len(values))]
+attack_mask = sum(rank_masks[rank] for rank in attacking_ranks)
+mundane_kings_mask = sum(1 << code for code in mundane_kings)
+
+
+class Card:
+    """
+    Class used to keep canonical data of one card from deck, computed once when module is loaded.
+    key is the interned (color, value) tuple, text is used in terminal, logs and REST moves,
+    marked is text of card possible to be played, image is name of picture used by gui client.
+    """
+    __slots__ = ('key', 'code', 'text', 'marked', 'image', 'rank')
+
+    def __init__(self, code):
+        self.key = deck_cards[code]
+        self.code = code
+        self.text = f'{self.key[0]} {self.key[1]}'
+        self.marked = f'*{self.text}*'
+        self.image = f'{self.key[0]}_{self.key[1]}.png'
+        self.rank = card_ranks[code] + 2
+
+
+cards = [Card(code) for code in range(deck_size)]
+card_spellings = {spelling: card.key for card in cards
+                  for spelling in [card.text, f'{card.key[1]} {card.key[0]}']}
+
+
+def card_data(card):
+    """
+    Function used to get canonical data of card.
+    :param card: tuple (or list) with color and value of a card
+    :return: Card object with precomputed data of this card
+    """
+    return cards[encode_card(card) % deck_size]
+
+
+def card_text(card):
+    """
+    Function used to get text of card used in terminal, logs and moves, without formatting it again.
+    :param card: tuple with color and value of a card
+    :return: string with color and value separated by space
+    """
+    try:
+        return cards[card_codes[card]].text
+    except (KeyError, TypeError):
+        return f'{card[0]} {card[1]}'
+
+
+def encode_card(card, deck_index=0):
+    """
+    Function used to encode card as a compact integer.
+    :param card: tuple (or list) with color and value of a card
+    :param deck_index: integer index of deck from which card comes in multi-deck games
+    :return: integer code of card, 0..51 for first deck and next 52 codes for every next deck
+    """
+    try:
+        code = card_codes[card]
+    except TypeError:
+        code = card_codes[tuple(card)]
+    return code + deck_index * deck_size
+
+
+def decode_card(code):
+    """
+    Function used to decode integer code of card back to card tuple.
+    :param code: integer code of card
+    :return: tuple with color and value of a card
+    """
+    return deck_cards[code % deck_size]
+
+
+class BitHand:
+    """
+    Class used as an optional bitset representation of cards on hand.
+    Bit number n of mask is set when at least one card with code n is on hand,
+    counts keep how many copies of every card there are in multi-deck games.
+    """
+    def __init__(self, cards=()):
+        self.mask = 0
+        self.counts = [0] * deck_size
+        for card in cards:
+            self.add(card)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def __iter__(self):
+        for code, count in enumerate(self.counts):
+            for _ in range(count):
+                yield deck_cards[code]
+
+    def add(self, card):
+        """
+        Method used to put card on hand.
+        :param card: tuple with card
+        """
+        code = encode_card(card)
+        self.counts[code] += 1
+        self.mask |= 1 << code
+
+    def remove(self, card):
+        """
+        Method used to take card from hand.
+        :param card: tuple with card
+        """
+        code = encode_card(card)
+        if self.counts[code] == 0:
+            raise ValueError(f'{card} not on hand')
+        self.counts[code] -= 1
+        if self.counts[code] == 0:
+            self.mask &= ~(1 << code)
+
+
+def cards_to_mask(cards):
+    """
+    Function used to convert list of cards to bit mask.
+    :param cards: list of cards, BitHand or Hand object
+    :return: integer bit mask with bits of all given cards set
+    """
+    if hasattr(cards, 'mask'):
+        return cards.mask
+    mask = 0
+    for card in cards:
+        mask |= 1 << card_codes[card]
+    return mask
+
+
+def mask_to_cards(mask, hand=None):
+    """
+    Function used to convert bit mask back to list of cards.
+    :param mask: integer bit mask of cards
+    :param hand: optional list of cards on hand, when given cards are taken from it in its order (with copies)
+    :return: list of cards
+    """
+    if hand is None:
+        return [deck_cards[code] for code in range(deck_size) if mask >> code & 1]
+    return [card for card in hand if mask >> card_codes[card] & 1]
+
+
+def nonactive_plays_mask(top_card, requested_value=None):
+    """
+    Function used to evaluate mask of all cards which can be played on non-active card.
+    :param top_card: tuple with card on top of a table
+    :param requested_value: string with requested value
+    :return: integer bit mask of cards possible to be played
+    """
+    top = encode_card(top_card)
+    if card_ranks[top] == queen_rank:
+        return full_mask
+    if requested_value is None:
+        return rank_masks[queen_rank] | color_masks[card_colors[top]] | rank_masks[card_ranks[top]]
+    if requested_value in value_indexes:
+        return rank_masks[value_indexes[requested_value]]
+    return 0
+
+
+def active_plays_mask(top_card, requested_color=None, requested_value=None):
+    """
+    Function used to evaluate mask of all cards which can be played on special card.
+    :param top_card: tuple with card on top of a table
+    :param requested_color: string with requested color
+    :param requested_value: string with requested value
+    :return: integer bit mask of cards possible to be played
+    """
+    top = encode_card(top_card)
+    top_color, top_rank = card_colors[top], card_ranks[top]
+    mask = rank_masks[top_rank]
+    attack = top_rank in attacking_ranks
+    if attack:
+        mask |= color_masks[top_color] & attack_mask
+
+    if requested_value and requested_value in value_indexes:
+        mask |= rank_masks[value_indexes[requested_value]]
+
+    if requested_color:
+        mask |= color_masks[color_indexes[requested_color]] if requested_color in color_indexes else 0
+    elif top_rank == ace_rank or (top_rank == jack_rank and not requested_value):
+        mask |= color_masks[top_color]
+
+    if attack:
+        mask &= ~mundane_kings_mask
+    return mask
+
+
+def build_playability_table():
+    """
+    Function used to build table with masks of playable cards for every reachable turn context.
+    Context is made of top card code, activity of top card, requested color and requested value.
+    Attack mode (and removal of non-attacking kings) follows from active 2, 3 or K on top.
+    :return: dictionary with context tuples as keys and integer bit masks as values
+    """
+    table = {}
+    for top in range(deck_size):
+        top_card = deck_cards[top]
+        for requested_value in [None] + values:
+            nonactive = nonactive_plays_mask(top_card, requested_value)
+            for requested_color in [None] + colors:
+                table[(top, False, requested_color, requested_value)] = nonactive
+                table[(top, True, requested_color, requested_value)] = \
+                    active_plays_mask(top_card, requested_color, requested_value)
+    return table
+
+
+playability_table = build_playability_table()
+
+
+def playable_mask(top_card, active=False, requested_color=None, requested_value=None):
+    """
+    Function used to look up mask of playable cards for given turn context.
+    :param top_card: tuple with card on top of a table
+    :param active: bool value, True if top card is active special card
+    :param requested_color: string with requested color
+    :param requested_value: string with requested value
+    :return: integer bit mask of cards possible to be played
+    """
+    mask = playability_table.get((encode_card(top_card), active, requested_color, requested_value))
+    if mask is None:
+        if active:
+            return active_plays_mask(top_card, requested_color, requested_value)
+        return nonactive_plays_mask(top_card, requested_value)
+    return mask
+
+
+def possible_plays_mask(hand, top_card, active=False, requested_color=None, requested_value=None):
+    """
+    Function used to evaluate possible plays as a bit mask, without building any list of cards.
+    :param hand: BitHand object, integer bit mask or list of cards on player hand
+    :param top_card: tuple with card on top of a table
+    :param active: bool value, True if top card is active special card
+    :param requested_color: string with requested color
+    :param requested_value: string with requested value
+    :return: integer bit mask of cards from hand possible to be played
+    """
+    hand_mask = hand if isinstance(hand, int) else cards_to_mask(hand)
+    return hand_mask & playable_mask(top_card, active, requested_color, requested_value)
+
+
+def find_possible_plays(hand, top_card, active=False, requested_color=None, requested_value=None):
+    """
+    Function used to evaluate possible plays for given hand and whole turn context.
+    :param hand: list of cards on player hand
+    :param top_card: tuple with card on top of a table
+    :param active: bool value, True if top card is active special card which still takes effect
+    :param requested_color: string with requested color
+    :param requested_value: string with requested value
+    :return: list of possible plays, bool value if there is any move
+    """
+    if active:
+        return active_card_possible_plays(hand, top_card, requested_color, requested_value)
+    return nonactive_card_possible_plays(hand, top_card, requested_value)
+
+
+def prepare_deck(table=None, players=None, how_many=1, *, rng):
     """
     Function used to prepare deck of 52 cards and shuffle it.
     If cards was dealt to players, this cards will not be in newly prepared deck.
     :param table: list with cards lied on table
     :param players: dictionary of Player objects which contains players hands
     :param how_many: integer of how many decks will be in game
+    :param rng: Random object used to shuffle deck, usually GameState.rng
     :return: list with deck, list with table, dictionary with players
+    :raise ValueError: when hands and table hold more copies of a card than all decks have
     """
-    deck = [(color, value) for value in values for color in colors] * how_many
-
+    excluded = [0] * deck_size
     if players:
-        [deck.remove(card) for player in players.values() for card in player.hand]
+        for player in players.values():
+            for card in player.hand:
+                excluded[encode_card(card)] += 1
 
     if table and len(table) >= 1:
         table = [table[0]]
-        deck.remove(table[0])
-    shuffle(deck)
+        excluded[encode_card(table[0])] += 1
+
+    deck = []
+    for code, card in enumerate(deck_cards):
+        if excluded[code] > how_many:
+            raise ValueError(f'{excluded[code]} copies of {card_text(card)} in game with {how_many} decks')
+        deck += [card] * (how_many - excluded[code])
+    rng.shuffle(deck)
     return deck, table, players
 
 
-def clean_table(deck, table):
+def clean_table(deck, table, rng):
     """
     Function used to take all cards from table and shuffle them to deck. Top card will stay on table.
+    Cards are shuffled as plain list, so swaps of shuffle do not update hash of table one by one.
+    If deck keeps journal, piles and generator before refill are written to it.
     :param deck: list with deck of cards from which cards will be dealt
     :param table: list with cards lied on table
+    :param rng: Random object used to shuffle cards from table
     :return: list with deck, list with table
     """
-    top_card = table[-1]
-    shuffle(table)
-    deck = table + deck
-    deck.remove(top_card)
-    table = [top_card]
+    deck, table = as_pile(deck), as_pile(table)
+    if deck.journal is not None:
+        deck.journal.append(('refill', list(deck), list(table), get_rng_state(rng)))
+    top_card = table.pop()
+    recycled = list(table)
+    rng.shuffle(recycled)
+    deck.recycle_under(recycled)
+    table[:] = [top_card]
     return deck, table
 
 
@@ -48,19 +351,22 @@ def deal_cards(deck, how_many):
     :param how_many: number of cards to deal
     :return: list with dealt cards, list with deck, number of dealt cards
     """
-    cards = []
-
-    if len(deck) >= how_many:
-        for _ in range(how_many):
-            cards.append(deck.pop())
-        cards_dealt = how_many
+    cards = draw_cards(deck, how_many)
+    return cards, deck, len(cards)
 
-    else:
-        cards_dealt = len(deck)
-        for _ in range(len(deck)):
-            cards.append(deck.pop())
 
-    return cards, deck, cards_dealt
+def deal_hands(deck, how_many_players, how_many_cards):
+    """
+    Function used to deal starting hands to all players at once.
+    Hands are the same as if cards were dealt to players one after another with deal_cards.
+    :param deck: list with deck of cards from which cards will be dealt
+    :param how_many_players: integer of how many hands will be dealt
+    :param how_many_cards: integer of how many cards will be dealt to every player
+    :return: list with lists of dealt cards for every player, list with deck
+    """
+    cards = draw_cards(deck, how_many_players * how_many_cards)
+    hands = [cards[index * how_many_cards:(index + 1) * how_many_cards] for index in range(how_many_players)]
+    return hands, deck
 
 
 def nonactive_card_possible_plays(hand, top_card, requested_value=None):
@@ -71,20 +377,11 @@ def nonactive_card_possible_plays(hand, top_card, requested_value=None):
     :param requested_value: string with requested value
     :return: list of possible plays, bool value if there is any move
     """
-    if top_card[1] == 'Q':
+    allowed = playable_mask(top_card, False, None, requested_value)
+    if allowed == full_mask:
         return hand, len(hand)
 
-    possible_plays = []
-    queens = [(color, 'Q') for color in colors]
-    from_value = [(color, top_card[1]) for color in colors]
-    from_color = [(top_card[0], value) for value in values]
-
-    if requested_value is None:
-        [possible_plays.append(card) for card in hand if card in queens + from_color + from_value]
-    else:
-        req_value = [(color, requested_value) for color in colors]
-        [possible_plays.append(card) for card in hand if card in req_value]
-
+    possible_plays = playable_cards(hand, allowed)
     return possible_plays, len(possible_plays) > 0
 
 
@@ -97,27 +394,31 @@ def active_card_possible_plays(hand, top_card, requested_color=None, requested_v
     :param requested_value: string with requested value
     :return: list of possible plays, bool value if there is any move
     """
-    attack = False
-    possible_plays, req_value, req_color, from_color = [], [], [], []
-    from_value = [(color, top_card[1]) for color in colors]
-    if top_card[1] in '2 3 K'.split():
-        from_color = [(top_card[0], value) for value in '2 3 K'.split()]
-        attack = True
+    allowed = playable_mask(top_card, True, requested_color, requested_value)
+    possible_plays = list(dict.fromkeys(playable_cards(hand, allowed)))
+    return possible_plays, len(possible_plays) > 0
 
-    if requested_value:
-        req_value = [(color, requested_value) for color in colors]
-    elif top_card[1] == 'J':
-        req_color = [(top_card[0], value) for value in values]
 
-    if requested_color:
-        req_color = [(requested_color, value) for value in values]
-    elif top_card[1] == 'A':
-        req_color = [(top_card[0], value) for value in values]
+def playable_cards(hand, allowed):
+    """
+    Function used to take cards allowed by mask from hand, in order of hand.
+    Hand keeping its own mask is answered without scanning its cards when none of them is allowed.
+    :param hand: list of cards or Hand object on player hand
+    :param allowed: integer bit mask of cards possible to be played
+    :return: list of cards from hand possible to be played
+    """
+    if not getattr(hand, 'mask', allowed) & allowed:
+        return []
+    return [card for card in hand if allowed >> card_codes[card] & 1]
 
-    [possible_plays.append(card) for card in hand if card in req_color + req_value + from_value + from_color]
-    possible_plays = list(set(possible_plays))
-    [possible_plays.remove(king) for king in [('tiles', 'K'), ('clovers', 'K')] if attack and king in possible_plays]
-    return possible_plays, len(possible_plays) > 0
+
+def card_effect(card):
+    """
+    Function used to get compiled effect of card.
+    :param card: tuple with card
+    :return: CardEffect with attack, skip, request and active fields
+    """
+    return card_effects[encode_card(card) % deck_size]
 
 
 def check_card_played_active(laid_card):
@@ -126,14 +427,7 @@ def check_card_played_active(laid_card):
     :param laid_card: tuple with last played card
     :return: bool value, True if card is special, False otherwise
     """
-    if laid_card in [('hearts', 'K'), ('pikes', 'K')]:
-        return True
-
-    value = laid_card[1]
-    if value in '2 3 4 J A'.split():
-        return True
-
-    return False
+    return card_effect(laid_card).active
 
 
 def evaluate_cards_to_take(laid_card, cards_to_take=0):
@@ -143,14 +437,7 @@ def evaluate_cards_to_take(laid_card, cards_to_take=0):
     :param cards_to_take: integer value with earlier punishment
     :return: integer value with punishment after card played
     """
-    if laid_card in [('hearts', 'K'), ('pikes', 'K')]:
-        cards_to_take += 5
-
-    value = laid_card[1]
-    if value in ['2', '3']:
-        cards_to_take += int(value)
-
-    return cards_to_take
+    return cards_to_take + card_effect(laid_card).attack
 
 
 def evaluate_turns_to_wait(laid_card, turns_to_wait=0):
@@ -160,11 +447,20 @@ def evaluate_turns_to_wait(laid_card, turns_to_wait=0):
     :param turns_to_wait: integer value with earlier punishment
     :return: integer value with punishment after card played
     """
-    value = laid_card[1]
-    if value == '4':
-        turns_to_wait += 1
+    return turns_to_wait + card_effect(laid_card).skip
 
-    return turns_to_wait
+
+def evaluate_request(laid_card, request):
+    """
+    Function used to evaluate request made by player together with played jack or ace special card.
+    :param laid_card: tuple with last played card
+    :param request: string with requested value or color, None if player made no request
+    :return: string object of requested color or None, string object of requested value or None
+    """
+    kind = card_effect(laid_card).request
+    requested_color = request if kind == 'color' and request in requestable_colors else None
+    requested_value = request if kind == 'value' and request in requestable_values else None
+    return requested_color, requested_value
 
 
 async def evaluate_requested_value(laid_card, input_foo):
@@ -174,12 +470,10 @@ async def evaluate_requested_value(laid_card, input_foo):
     :param input_foo: function used to ask player about value
     :return: string object of requested value or None
     """
-    value = laid_card[1]
     requested_value = None
-    if value == 'J':
+    if card_effect(laid_card).request == 'value':
         requested_value = await input_foo('Enter VALUE of requested cards: ')
-        if requested_value not in '5 6 7 8 9 10'.split():
-            requested_value = None
+        _, requested_value = evaluate_request(laid_card, requested_value)
 
     return requested_value
 
@@ -191,12 +485,10 @@ async def evaluate_requested_color(laid_card, input_foo):
     :param input_foo: function used to ask player about value
     :return: string object of requested color or None
     """
-    value = laid_card[1]
     requested_color = None
-    if value == 'A':
+    if card_effect(laid_card).request == 'color':
         requested_color = await input_foo('Enter COLOR of requested cards: ')
-        if requested_color not in colors:
-            requested_color = None
+        requested_color, _ = evaluate_request(laid_card, requested_color)
 
     return requested_color
 
@@ -207,20 +499,15 @@ def check_if_pack_on_hand(hand):
     :param hand: list of cards on player hand
     :return: list of cards values which can be played as pack
     """
-    tmp = {}
-    for card in hand:
-        if card[1] in tmp.keys():
-            tmp[card[1]] += 1
-        else:
-            tmp[card[1]] = 1
+    packs = getattr(hand, 'packs', None)
+    if packs is not None:
+        return packs()
 
-    keys = tmp.keys()
-    packs = []
-    for key in keys:
-        if tmp[key] >= 3:
-            packs.append(key)
+    counts = {}
+    for card in hand:
+        counts[card[1]] = counts.get(card[1], 0) + 1
 
-    return packs
+    return [value for value, count in counts.items() if count >= 3]
 
 
 def check_if_packs_can_be_played(packs, possible_plays):
@@ -230,9 +517,8 @@ def check_if_packs_can_be_played(packs, possible_plays):
     :param possible_plays: list with all possible cards to play
     :return: list with possible to play packs
     """
-    possible_packs = []
-    [possible_packs.append(pack) for pack in packs for card in possible_plays if pack == card[1]]
-    return list(set(possible_packs))
+    playable = {card[1] for card in possible_plays}
+    return [pack for pack in packs if pack in playable]
 
 
 def convert_to_card(played):
@@ -241,6 +527,12 @@ def convert_to_card(played):
     :param played: string description of a card
     :return: tuple with color and value of a card
     """
+    card = card_spellings.get(played)
+    if card is None:
+        card = card_spellings.get(' '.join(played.split()))
+    if card is not None:
+        return card
+
     color = None
     value = None
     chopped = played.split(' ')
@@ -250,13 +542,27 @@ def convert_to_card(played):
         elif data in values:
             value = data
     if color is not None and value is not None:
-        return color, value
+        return card_spellings[f'{color} {value}']
     return None
 
 
+def apply_card_effect(played_card, cards_to_take, turns_to_wait):
+    """
+    Function used to take additional action for played card which does not need any request from player.
+    :param played_card: tuple with played card
+    :param cards_to_take: integer value of cards to take
+    :param turns_to_wait: integer value of turns to skip
+    :return: integer with cards to take, None as requested color,
+     None as requested value, integer value with turns to skip
+    """
+    effect = card_effect(played_card)
+    return cards_to_take + effect.attack, None, None, turns_to_wait + effect.skip
+
+
 async def additional_actions(played_card, cards_to_take, turns_to_wait, input_foo):
     """
     Function combines all other functions used to take additional action for played card.
+    Player is asked only when card requests color or value, other cards are evaluated without awaiting.
     :param played_card: tuple with played card
     :param cards_to_take: integer value of cards to take
     :param turns_to_wait: integer value of turns to skip
@@ -264,14 +570,17 @@ async def additional_actions(played_card, cards_to_take, turns_to_wait, input_fo
     :return: integer with cards to take, string with requested color,
      string with requested value, integer value with turns to skip
     """
-    requested_value = await evaluate_requested_value(played_card, input_foo)
-    requested_color = await evaluate_requested_color(played_card, input_foo)
-    cards_to_take = evaluate_cards_to_take(played_card, cards_to_take)
-    turns_to_wait = evaluate_turns_to_wait(played_card, turns_to_wait)
+    cards_to_take, requested_color, requested_value, turns_to_wait = \
+        apply_card_effect(played_card, cards_to_take, turns_to_wait)
+    request = card_effect(played_card).request
+    if request == 'value':
+        requested_value = await evaluate_requested_value(played_card, input_foo)
+    elif request == 'color':
+        requested_color = await evaluate_requested_color(played_card, input_foo)
     return cards_to_take, requested_color, requested_value, turns_to_wait
 
 
-def take_cards_punishment(player, deck, table, lied_card=None, cards_to_take=0):
+def take_cards_punishment(player, deck, table, lied_card=None, cards_to_take=0, *, rng, emit=None):
     """
     Function used to punish player with cards.
     :param player: Player objects
@@ -279,39 +588,44 @@ def take_cards_punishment(player, deck, table, lied_card=None, cards_to_take=0):
     :param table: list with cards on table
     :param lied_card: tuple with last lied card
     :param cards_to_take: integer value of take card punishment
+    :param rng: Random object used to shuffle cards from table when deck runs out
+    :param emit: function used to emit events of punishment, usually GameState.emit, None if nobody is informed
     :return: integer of cards to take, list with cards inside deck, last lied card
     """
     if len(deck) <= cards_to_take:
-        player.print_foo('Not enough cards in the deck. Grabbing from the table.')
-        deck, table = clean_table(deck, table)
+        if emit is not None:
+            emit(events.DeckRefilled(player.name))
+        deck, table = clean_table(deck, table, rng)
 
+    announced = cards_to_take
     if cards_to_take > 0:
-        player.print_foo(f'{player.name} will have to take {cards_to_take} cards.')
         cards, deck, how_many = deal_cards(deck, cards_to_take)
         cards_to_take = 0
         if lied_card:
             table.append(lied_card)
         lied_card = None
     else:
-        player.print_foo(f'{player.name} will have to take a card.')
         cards, deck, how_many = deal_cards(deck, 1)
 
     player.hand += cards
-    player.print_foo(f'{len(cards)} cards dealt to {player.name}. | on hand: {len(player.hand)} cards.')
+    if emit is not None:
+        emit(events.CardsTaken(player.name, announced, len(cards), len(player.hand)))
     return deck, table, lied_card, cards_to_take
 
 
-def skip_punishment(player, table, lied_card=None, turns_to_wait=0):
+def skip_punishment(player, table, lied_card=None, turns_to_wait=0, emit=None):
     """
     Function used to punish player with turns to skip.
     :param player: Player object
     :param table: list with cards on table
     :param lied_card: tuple with last lied card
     :param turns_to_wait: integer value of take card punishment
+    :param emit: function used to emit events of punishment, usually GameState.emit, None if nobody is informed
     :return: tuple with last lied card, integer value of turns to skip
     """
     player.turns_to_skip = turns_to_wait - 1
-    player.print_foo(f'{player.name} will have to skip this and next {player.turns_to_skip} turns.')
+    if emit is not None:
+        emit(events.TurnsPunished(player.name, player.turns_to_skip))
     turns_to_wait = 0
     if lied_card:
         table.append(lied_card)
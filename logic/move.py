@@ -0,0 +1,46 @@
+from logic.logic import convert_to_card
+from logic.events import cards_text
+
+
+class Move:
+    """
+    Class used to describe one move of player: cards laid on table, in order of playing,
+    and color or value requested with jack or ace. Request left as None is asked from player after validation.
+    """
+    __slots__ = ('cards', 'request')
+
+    def __init__(self, cards=(), request=None):
+        self.cards = list(cards)
+        self.request = request
+
+    def __eq__(self, other):
+        if not isinstance(other, Move):
+            return NotImplemented
+        return self.cards == other.cards and self.request == other.request
+
+    def __repr__(self):
+        return f'Move({self.cards!r}, {self.request!r})'
+
+    @property
+    def text(self):
+        """
+        Property with cards of move written the way players type them, not recognized cards are left out.
+        :return: string with cards separated by commas
+        """
+        return cards_text(self.cards)
+
+
+def parse_move(played, request=None):
+    """
+    Function used to convert move typed by player, like 'hearts 5, tiles 5, pikes 5', to Move object.
+    Marks of possible plays are ignored. Not recognized single card is kept as None, so move is invalid,
+    not recognized parts of pack are skipped.
+    :param played: string with player's move
+    :param request: string with requested color or value, None if player should be asked later
+    :return: Move object
+    """
+    parts = played.replace('*', '').split(',')
+    if len(parts) == 1:
+        return Move([convert_to_card(parts[0])], request)
+    cards = [convert_to_card(part) for part in parts]
+    return Move([card for card in cards if card is not None], request)
@@ -0,0 +1,399 @@
+from collections import namedtuple
+import logic.game as game
+import logic.headless as headless
+import logic.zobrist as zobrist
+from logic.hand import Hand
+from logic.pile import Pile
+from logic.rng import create_rng, get_rng_state, set_rng_state
+from player.player import Player
+
+# Persistent pile is a linked list of immutable cells from its top card down, None is empty pile.
+# Cell keeps size and zobrist hash of the pile it starts, so new pile made by laying or taking cards
+# shares all cells under changed top with old one, and old pile stays valid.
+Cards = namedtuple('Cards', 'card below size zobrist')
+# Seat keeps hand of player as tuple together with its zobrist hash, unchanged seats are shared between states.
+SeatState = namedtuple('SeatState', 'name hand zobrist turns_to_skip')
+
+
+class PersistentState(namedtuple('PersistentState', 'seed rng deck table seats turn lied_card cards_to_take '
+                                                    'turns_to_wait requested_value_rounds requested_value '
+                                                    'requested_color finished standings ranking')):
+    """
+    Class used to keep immutable state of game: persistent piles, seats with hands as tuples, counters,
+    state of generator (None for secure generator) and number of seat which moves now.
+    New state made by step copies only changed parts, so old states stay valid for history and rewind,
+    and they cost little memory.
+    """
+    __slots__ = ()
+
+    def state_hash(self):
+        """
+        Method used to get zobrist hash of state, the same as hash of equal GameState, in constant time for given
+        number of players, because hashes of piles and hands are kept in their cells and seats.
+        :return: integer from 0 to 2 ** 64 - 1
+        """
+        counters = (self.lied_card, self.cards_to_take, self.turns_to_wait, self.requested_value_rounds,
+                    self.requested_value, self.requested_color)
+        seats = ((seat.zobrist, seat.turns_to_skip) for seat in self.seats)
+        return zobrist.state_hash(pile_zobrist(self.deck), pile_zobrist(self.table), counters, seats)
+
+
+def push(pile, cards):
+    """
+    Function used to lay cards on top of persistent pile.
+    :param pile: Cards object with top of pile or None for empty pile
+    :param cards: iterable with cards, last one will be on top
+    :return: Cards object with top of new pile
+    """
+    for card in cards:
+        size = pile.size + 1 if pile is not None else 1
+        key = zobrist.card_key(card) ^ zobrist.position_key(size - 1)
+        pile = Cards(card, pile, size, (pile_zobrist(pile) + key) & zobrist.mask)
+    return pile
+
+
+def pile_cards(pile):
+    """
+    Function used to list cards of persistent pile, from the bottom to the top like in Pile.
+    :param pile: Cards object with top of pile or None
+    :return: list with cards
+    """
+    cards = []
+    while pile is not None:
+        cards.append(pile.card)
+        pile = pile.below
+    cards.reverse()
+    return cards
+
+
+def pile_size(pile):
+    """
+    Function used to get number of cards in persistent pile.
+    :param pile: Cards object with top of pile or None
+    :return: integer
+    """
+    return pile.size if pile is not None else 0
+
+
+def pile_zobrist(pile):
+    """
+    Function used to get zobrist hash of persistent pile, equal to hash of Pile with the same cards.
+    :param pile: Cards object with top of pile or None
+    :return: integer
+    """
+    return pile.zobrist if pile is not None else 0
+
+
+class PileView(Pile):
+    """
+    Class used as adapter of persistent pile to rule functions, which change piles in place.
+    Only cards which rules touched are copied from persistent pile to view, the rest stays in shared cells.
+    Rules take and lay cards on top, so usually view holds only a few cards, only refill of deck
+    and operations under the top copy whole pile.
+    """
+    __slots__ = ('base',)
+
+    def __init__(self, base=None):
+        list.__init__(self)
+        self.journal = None
+        self.base = base
+        self.zobrist = pile_zobrist(base)
+
+    def __reduce__(self):
+        return self.__class__, (self.freeze(),)
+
+    def _cover(self, position):
+        """
+        Helper method used to copy cards from persistent pile to view, down to given position of pile.
+        :param position: integer index of the lowest position which has to be in view
+        """
+        base, cards = self.base, []
+        while base is not None and base.size > position:
+            cards.append(base.card)
+            base = base.below
+        if cards:
+            list.__setitem__(self, slice(0, 0), cards[::-1])
+            self.base = base
+
+    def _locate(self, index):
+        """
+        Helper method used to copy cards touched by index or slice to view and to translate it to index of view.
+        :param index: integer or slice, like for list of all cards of pile
+        :return: integer or slice for cards kept in view
+        """
+        length = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            positions = range(start, stop, step)
+            if not positions:
+                return slice(0, 0)
+            self._cover(min(positions[0], positions[-1]))
+            offset = pile_size(self.base)
+            stop -= offset
+            return slice(start - offset, stop if stop >= 0 else None, step)
+        position = index + length if index < 0 else index
+        if not 0 <= position < length:
+            raise IndexError('pile index out of range')
+        self._cover(position)
+        return position - pile_size(self.base)
+
+    def _whole(self):
+        """
+        Helper method used to copy all cards of persistent pile to view, before operations on whole pile.
+        :return: the same PileView object
+        """
+        self._cover(0)
+        return self
+
+    def freeze(self):
+        """
+        Method used to make persistent pile with cards of view, which shares all cells not copied to view.
+        :return: Cards object with top of pile or None
+        """
+        return push(self.base, list.__iter__(self))
+
+    def copy(self):
+        return PileView(self.freeze())
+
+    @property
+    def top(self):
+        if list.__len__(self) == 0:
+            return self.base.card if self.base is not None else None
+        return list.__getitem__(self, -1)
+
+    def __len__(self):
+        return list.__len__(self) + pile_size(self.base)
+
+    def __getitem__(self, index):
+        return list.__getitem__(self, self._locate(index))
+
+    def __delitem__(self, index):
+        index = self._locate(index)
+        self._change(pile_size(self.base), list.__delitem__, index)
+
+    def pop(self, index=-1):
+        index = self._locate(index)
+        return self._change(pile_size(self.base), list.pop, index)
+
+    def __setitem__(self, index, cards):
+        Pile.__setitem__(self._whole(), index, cards)
+
+    def insert(self, index, card):
+        Pile.insert(self._whole(), index, card)
+
+    def remove(self, card):
+        Pile.remove(self._whole(), card)
+
+    def sort(self, *, key=None, reverse=False):
+        Pile.sort(self._whole(), key=key, reverse=reverse)
+
+    def reverse(self):
+        Pile.reverse(self._whole())
+
+    def clear(self):
+        Pile.clear(self)
+        self.base = None
+
+    def recycle_under(self, cards):
+        Pile.recycle_under(self._whole(), cards)
+
+    def __imul__(self, times):
+        return Pile.__imul__(self._whole(), times)
+
+    def __iter__(self):
+        return list.__iter__(self._whole())
+
+    def __reversed__(self):
+        return list.__reversed__(self._whole())
+
+    def __contains__(self, card):
+        return list.__contains__(self._whole(), card)
+
+    def index(self, card, *args):
+        return list.index(self._whole(), card, *args)
+
+    def count(self, card):
+        return list.count(self._whole(), card)
+
+    def __add__(self, cards):
+        return list.__add__(self._whole(), cards)
+
+    def __eq__(self, other):
+        if isinstance(other, PileView):
+            other._whole()
+        return list.__eq__(self._whole(), other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return list.__repr__(self._whole())
+
+
+class PlayerView:
+    """
+    Class used as adapter of seat to rule functions, which change hands and turns to skip of players in place.
+    Hand is built from tuple of seat only when rules look at it.
+    """
+    __slots__ = ('seat', 'name', 'turns_to_skip', '_hand', 'decide_foo')
+
+    def __init__(self, seat, decide_foo):
+        self.seat = seat
+        self.name = seat.name
+        self.turns_to_skip = seat.turns_to_skip
+        self._hand = None
+        self.decide_foo = decide_foo
+
+    @property
+    def hand(self):
+        if self._hand is None:
+            self._hand = Hand(self.seat.hand)
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        self._hand = cards if isinstance(cards, Hand) else Hand(cards)
+
+    def freeze(self):
+        """
+        Method used to make seat with hand and turns to skip of player, the same seat if nothing changed.
+        :return: SeatState object
+        """
+        seat, hand = self.seat, self._hand
+        if hand is None or (hand.zobrist == seat.zobrist and tuple(hand) == seat.hand):
+            if self.turns_to_skip == seat.turns_to_skip:
+                return seat
+            return seat._replace(turns_to_skip=self.turns_to_skip)
+        return SeatState(self.name, tuple(hand), hand.zobrist, self.turns_to_skip)
+
+
+class RngView:
+    """
+    Class used as adapter of saved state of generator to rule functions. Generator is created from state
+    only when rules use it, which happens only when deck is refilled.
+    """
+    __slots__ = ('state', 'rng')
+
+    def __init__(self, state):
+        self.state = state
+        self.rng = None
+
+    def __getattr__(self, name):
+        if self.rng is None:
+            self.rng = create_rng(secure=self.state is None)
+            set_rng_state(self.rng, self.state)
+        return getattr(self.rng, name)
+
+    def freeze(self):
+        """
+        Method used to get state of generator after rules used it.
+        :return: object with state of generator, None for secure generator
+        """
+        return self.state if self.rng is None else get_rng_state(self.rng)
+
+
+def freeze(game_state, turn=0):
+    """
+    Function used to make persistent state from game state, for example right after prepare_game.
+    Views made by step are frozen sharing unchanged parts, other piles and hands are copied.
+    :param game_state: GameState object
+    :param turn: integer number of seat which moves now
+    :return: PersistentState object
+    """
+    gs = game_state
+    deck, table = gs.deck, gs.table
+    deck = deck.freeze() if isinstance(deck, PileView) else push(None, deck)
+    table = table.freeze() if isinstance(table, PileView) else push(None, table)
+    rng = gs.rng.freeze() if isinstance(gs.rng, RngView) else get_rng_state(gs.rng)
+    seats = tuple(player.freeze() if isinstance(player, PlayerView) else
+                  SeatState(player.name, tuple(player.hand), player.hand.zobrist, player.turns_to_skip)
+                  for player in gs.players.values())
+    standings = tuple(gs.standings) if gs.standings is not None else None
+    return PersistentState(gs.seed, rng, deck, table, seats, turn, gs.lied_card, gs.cards_to_take, gs.turns_to_wait,
+                           gs.requested_value_rounds, gs.requested_value, gs.requested_color, tuple(gs.finished),
+                           standings, gs.ranking)
+
+
+def view(state, decide_foo=None, sinks=()):
+    """
+    Function used to make game state, which rule functions can change, with views of persistent state.
+    State itself is never changed, changes are kept only in views.
+    :param state: PersistentState object
+    :param decide_foo: function used by players to decide about move, like Player.decide_foo
+    :param sinks: list with sinks of events, which do not need callbacks of players, like events.list_sink
+    :return: GameState object
+    """
+    gs = game.GameState.__new__(game.GameState)
+    gs.seed = state.seed
+    gs.rng = RngView(state.rng)
+    gs.deck = PileView(state.deck)
+    gs.table = PileView(state.table)
+    gs.players = {seat.name: PlayerView(seat, decide_foo) for seat in state.seats}
+    gs.lied_card = state.lied_card
+    gs.cards_to_take = state.cards_to_take
+    gs.turns_to_wait = state.turns_to_wait
+    gs.requested_value_rounds = state.requested_value_rounds
+    gs.requested_value = state.requested_value
+    gs.requested_color = state.requested_color
+    gs.turn_context = None
+    gs.sinks = list(sinks)
+    gs.finished = list(state.finished)
+    gs.standings = list(state.standings) if state.standings is not None else None
+    gs.ranking = state.ranking
+    gs.move_timeout = None
+    gs.game_deadline = None
+    gs.timeout_fallback = game.draw_on_timeout
+    return gs
+
+
+def thaw(state, players=None):
+    """
+    Function used to make independent game state from persistent state, for example to continue game with engine.
+    :param state: PersistentState object
+    :param players: dictionary with Player objects of game, copied with hands from state, None for plain players
+    :return: GameState object
+    """
+    gs = game.GameState(state.seed, secure=state.rng is None)
+    set_rng_state(gs.rng, state.rng)
+    gs.deck = pile_cards(state.deck)
+    gs.table = pile_cards(state.table)
+    gs.players = {}
+    for seat in state.seats:
+        player = players[seat.name].clone() if players is not None else Player(seat.name)
+        player.hand = list(seat.hand)
+        player.turns_to_skip = seat.turns_to_skip
+        gs.players[seat.name] = player
+    gs.lied_card = state.lied_card
+    gs.cards_to_take = state.cards_to_take
+    gs.turns_to_wait = state.turns_to_wait
+    gs.requested_value_rounds = state.requested_value_rounds
+    gs.requested_value = state.requested_value
+    gs.requested_color = state.requested_color
+    gs.finished = list(state.finished)
+    gs.standings = list(state.standings) if state.standings is not None else None
+    gs.ranking = state.ranking
+    return gs
+
+
+def step(state, move=None, decide_foo=None, sinks=()):
+    """
+    Function used to play turn of player at seat of state with headless engine, as pure function of state.
+    :param state: PersistentState object of game which is not over yet
+    :param move: Move object of player, None if player should be asked with decide_foo
+    :param decide_foo: function used to decide about move, like Player.decide_foo, needed when move is None
+    :param sinks: list with sinks of events, which do not need callbacks of players, like events.list_sink
+    :return: new PersistentState object, with the next seat to move
+    """
+    if state.standings is not None:
+        raise ValueError('Game is already over')
+
+    def missing_move(_game_state, _top_card, _possible_plays):
+        raise ValueError(f'Move of player {player.name} is needed')
+    gs = view(state, decide_foo or missing_move, sinks)
+    seats = gs.seats
+    player = seats.player(state.turn)
+    player, gs = headless.play_turn(player, gs, move)
+    turn = state.turn + 1
+    while seats.player(turn).name in gs.finished and turn < state.turn + len(seats):
+        turn += 1
+    return freeze(gs, turn % len(seats))
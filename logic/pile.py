@@ -0,0 +1,158 @@
+from logic.zobrist import card_key, mask, pile_hash, position_key
+
+
+class Pile(list):
+    """
+    Class used to keep pile of cards, like deck or table.
+    Top of the pile is the end of the list, so taking and laying cards never moves other cards.
+    Pile can keep journal of taken cards and refills, used to undo moves in place.
+    It also keeps zobrist hash of its cards, updated with every change. Keys depend on positions of cards,
+    so changes at the top of the pile cost as much as number of changed cards, only changes under the top,
+    like recycle_under, sum keys of all moved cards again.
+    """
+    __slots__ = ('journal', 'zobrist')
+
+    def __init__(self, cards=(), journal=None):
+        list.__init__(self, cards)
+        self.journal = journal
+        self.zobrist = pile_hash(self) & mask
+
+    def __reduce__(self):
+        return self.__class__, (list(self), self.journal)
+
+    def copy(self):
+        """
+        Method used to copy pile together with its hash, without summing keys again. Journal is not copied.
+        :return: new Pile object with the same cards
+        """
+        pile = Pile.__new__(Pile)
+        list.extend(pile, self)
+        pile.journal = None
+        pile.zobrist = self.zobrist
+        return pile
+
+    def _change(self, start, change, *args):
+        """
+        Helper method used to change cards of pile from given position to the top and update hash.
+        Keys of positions from start are subtracted before change and added again after it.
+        :param start: integer index of first position which can be changed
+        :param change: list method doing the change
+        :param args: arguments of list method
+        :return: result of list method
+        """
+        removed = pile_hash(self, start)
+        result = change(self, *args)
+        self.zobrist = (self.zobrist - removed + pile_hash(self, start)) & mask
+        return result
+
+    def _start(self, index):
+        """
+        Helper method used to find first position changed by operation on given index or slice.
+        :param index: integer or slice
+        :return: integer index, not less than 0
+        """
+        if isinstance(index, slice):
+            start, _, step = index.indices(len(self))
+            return start if step == 1 else 0
+        return max(index + len(self) if index < 0 else index, 0)
+
+    def append(self, card):
+        list.append(self, card)
+        self.zobrist = (self.zobrist + (card_key(card) ^ position_key(len(self) - 1))) & mask
+
+    def extend(self, cards):
+        self._change(len(self), list.extend, cards)
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+    def insert(self, index, card):
+        self._change(min(self._start(index), len(self)), list.insert, index, card)
+
+    def remove(self, card):
+        self._change(self.index(card), list.remove, card)
+
+    def pop(self, index=-1):
+        return self._change(self._start(index), list.pop, index)
+
+    def clear(self):
+        list.clear(self)
+        self.zobrist = 0
+
+    def sort(self, *, key=None, reverse=False):
+        self._change(0, lambda pile: list.sort(pile, key=key, reverse=reverse))
+
+    def reverse(self):
+        self._change(0, list.reverse)
+
+    def __setitem__(self, index, cards):
+        if isinstance(index, slice):
+            self._change(self._start(index), list.__setitem__, index, cards)
+            return
+        position = self._start(index)
+        removed = card_key(self[index]) ^ position_key(position)
+        list.__setitem__(self, index, cards)
+        self.zobrist = (self.zobrist - removed + (card_key(cards) ^ position_key(position))) & mask
+
+    def __delitem__(self, index):
+        self._change(self._start(index), list.__delitem__, index)
+
+    def __imul__(self, times):
+        self._change(0, list.__imul__, times)
+        return self
+
+    @property
+    def top(self):
+        """
+        Property with card on top of the pile.
+        :return: tuple with top card or None if pile is empty
+        """
+        return self[-1] if self else None
+
+    def draw(self, how_many=1):
+        """
+        Method used to take many cards from top of the pile at once.
+        Cards are returned in order in which they would be taken one by one.
+        :param how_many: integer of how many cards to take
+        :return: list with taken cards, shorter if there is not enough cards on pile
+        """
+        return draw_cards(self, how_many)
+
+    def recycle_under(self, cards):
+        """
+        Method used to put cards at the bottom of the pile, under all cards already on it.
+        Cards already on the pile are shifted, so it costs as much as copying both lists.
+        clean_table refills deck only when it has fewer cards than a punishment, so the shifted part is short.
+        :param cards: list with cards
+        """
+        self[:0] = cards
+
+
+def draw_cards(cards, how_many):
+    """
+    Function used to take many cards from the end of list in one slice operation.
+    Result is the same as popping cards one by one. Taken cards are written to journal of pile, if it has one.
+    :param cards: list with cards, end of list is top of pile
+    :param how_many: integer of how many cards to take
+    :return: list with taken cards, shorter if there is not enough cards in list
+    """
+    if how_many <= 0:
+        return []
+    taken = cards[:-how_many - 1:-1]
+    del cards[len(cards) - len(taken):]
+    journal = getattr(cards, 'journal', None)
+    if journal is not None and taken:
+        journal.append(('draw', taken))
+    return taken
+
+
+def as_pile(cards):
+    """
+    Function used to make sure that list of cards is a Pile object.
+    :param cards: list with cards or Pile object
+    :return: the same Pile object or new Pile object with given cards
+    """
+    if isinstance(cards, Pile):
+        return cards
+    return Pile(cards)
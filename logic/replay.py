@@ -0,0 +1,113 @@
+from collections import namedtuple
+from hashlib import blake2b
+import logic.codec as codec
+import logic.events as events
+import logic.game as game
+import logic.headless as headless
+from logic.move import Move
+
+# Log of game: seed and configuration needed to deal the same cards again, moves of players in order of turns
+# (invalid ones too, because they are punished) and hash of final state, None until log is finished.
+GameLog = namedtuple('GameLog', 'seed names how_many_decks how_many_cards ranking moves state_hash')
+
+
+def snapshot_hash(game_state):
+    """
+    Function used to evaluate hash of whole game state, from its compact snapshot.
+    :param game_state: GameState object
+    :return: string with hexadecimal digest
+    """
+    return blake2b(codec.encode(game_state), digest_size=16).hexdigest()
+
+
+def record_game(game_state, how_many_decks, how_many_cards):
+    """
+    Function used to start recording of game prepared with game.prepare_game, before first turn.
+    Moves are collected by sink added to game state, from events of played cards, invalid moves and requests,
+    so games played by any engine and any players can be recorded. Turn of player who ran out of time is recorded
+    as empty move, punished the same way as draw fallback, or as cards played by cpu fallback.
+    Games ended by forfeit or by deadline of game can not be replayed, headless engine has no time limits.
+    :param game_state: GameState object with seed
+    :param how_many_decks: integer of how many decks were used to prepare game
+    :param how_many_cards: integer of how many cards were dealt to players at start
+    :return: GameLog object, its moves are filled during game
+    """
+    gs = game_state
+    if gs.seed is None:
+        raise ValueError('Game without seed can not be replayed')
+    log = GameLog(gs.seed, list(gs.players), how_many_decks, how_many_cards, gs.ranking.__name__, [], None)
+
+    timed_out = []
+
+    def sink(_game_state, event):
+        if isinstance(event, events.MoveTimedOut):
+            timed_out.append(event.player)
+            log.moves.append(Move([]))
+        elif isinstance(event, (events.CardsPlayed, events.InvalidMove)):
+            if timed_out:
+                log.moves.pop()
+            log.moves.append(Move(event.cards))
+        elif isinstance(event, events.RequestMade):
+            log.moves[-1].request = event.request
+        elif isinstance(event, events.TurnEnded):
+            timed_out.clear()
+    gs.sinks.append(sink)
+    return log
+
+
+def finish_log(log, game_state):
+    """
+    Function used to close log of game with hash of its final state.
+    :param log: GameLog object returned by record_game
+    :param game_state: GameState object of the same game after its end
+    :return: GameLog object with state hash
+    """
+    return log._replace(state_hash=snapshot_hash(game_state))
+
+
+def replay(log, check=True):
+    """
+    Function used to play game from log again with headless engine, every player makes moves from log.
+    :param log: GameLog object
+    :param check: bool value, True if all moves have to be used and hash of final state has to match log
+    :return: GameState object after the game, list with name of winner
+    """
+    gs = game.GameState(log.seed)
+    gs.deck, gs.table, gs.players = game.prepare_game(log.names, log.how_many_decks, log.how_many_cards, rng=gs.rng)
+    gs.ranking = getattr(game, log.ranking)
+    moves = iter(log.moves)
+
+    def decide(_game_state, _top_card, _possible_plays):
+        move = next(moves, None)
+        if move is None:
+            raise ValueError(f'Log of game with seed {log.seed} has not enough moves')
+        return move
+    for player in gs.players.values():
+        player.decide_foo = decide
+
+    winners = headless.play_game(gs)
+    if check and next(moves, None) is not None:
+        raise ValueError(f'Game with seed {log.seed} ended before last move of log')
+    if check and snapshot_hash(gs) != log.state_hash:
+        raise ValueError(f'Replay of game with seed {log.seed} does not match hash of log')
+    return gs, winners
+
+
+def log_to_dict(log):
+    """
+    Function used to convert log to dictionary, which can be saved as json, for example in corpus of games.
+    :param log: GameLog object
+    :return: dictionary with fields of log, moves as lists of cards and requests
+    """
+    return {**log._asdict(), 'moves': [[move.cards, move.request] for move in log.moves]}
+
+
+def log_from_dict(data):
+    """
+    Function used to read log from dictionary made by log_to_dict, also after json round trip.
+    :param data: dictionary with fields of log
+    :return: GameLog object
+    """
+    moves = [Move([tuple(card) if card is not None else None for card in cards], request)
+             for cards, request in data['moves']]
+    return GameLog(**{**data, 'moves': moves})
@@ -0,0 +1,62 @@
+from random import Random, SystemRandom
+
+
+def create_rng(seed=None, secure=False):
+    """
+    Function used to create random numbers generator used in game.
+    Seeded generator repeats exactly the same shuffles and choices, secure one ignores seed and can not be replayed.
+    :param seed: integer or string seed of generator, None to seed it from system
+    :param secure: bool value, True if cryptographically secure generator should be created
+    :return: Random object with shuffle and choice methods
+    """
+    if secure:
+        return SystemRandom()
+    return Random(seed)
+
+
+def spawn_rng(rng):
+    """
+    Function used to create child generator, independent from parent after creation.
+    Child of seeded generator is seeded by parent, so the whole family is repeatable from one seed.
+    :param rng: Random object of parent generator
+    :return: Random object of child generator of the same kind as parent
+    """
+    if isinstance(rng, SystemRandom):
+        return SystemRandom()
+    return Random(rng.getrandbits(64))
+
+
+def copy_rng(rng):
+    """
+    Function used to copy generator together with its state, so copy repeats the same numbers as original.
+    Copy is not seeded before its state is set, seeding from system would cost more than copying.
+    Secure generator has no state to copy, so new secure generator is created.
+    :param rng: Random object to be copied
+    :return: Random object of the same kind as rng
+    """
+    if isinstance(rng, SystemRandom):
+        return SystemRandom()
+    copied = Random.__new__(type(rng))
+    copied.setstate(rng.getstate())
+    return copied
+
+
+def get_rng_state(rng):
+    """
+    Function used to save state of generator, so its next numbers can be repeated.
+    :param rng: Random object
+    :return: object with state of generator, None for secure generator, which has no state
+    """
+    if isinstance(rng, SystemRandom):
+        return None
+    return rng.getstate()
+
+
+def set_rng_state(rng, state):
+    """
+    Function used to bring back state of generator saved with get_rng_state.
+    :param rng: Random object
+    :param state: object with state of generator, None for secure generator
+    """
+    if state is not None:
+        rng.setstate(state)
@@ -0,0 +1,93 @@
+class SeatRing:
+    """
+    Class used to keep order of turns around the table. Seats are numbered in order of players dictionary,
+    next and previous seats are found with index arithmetic, so every lookup takes constant time.
+    Players are taken from dictionary at lookup, so their objects can be replaced under the same name.
+    """
+    __slots__ = ('players', 'names', 'seats')
+
+    def __init__(self, players):
+        self.players = players
+        self.names = list(players)
+        self.seats = {name: seat for seat, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        """
+        Method used to walk through players in order of turns, starting from first seat.
+        :return: iterator of Player objects
+        """
+        players = self.players
+        return (players[name] for name in self.names)
+
+    def matches(self, players):
+        """
+        Method used to check if ring still describes given players, cheaply, without comparing names.
+        :param players: dictionary with players, usually GameState.players
+        :return: bool value, False if ring has to be built again
+        """
+        return self.players is players and len(self.names) == len(players)
+
+    def player(self, seat):
+        """
+        Method used to get player sitting at given seat, counted cyclically.
+        :param seat: integer number of seat
+        :return: Player object
+        """
+        return self.players[self.names[seat % len(self.names)]]
+
+    def next(self, name, steps=1):
+        """
+        Method used to find player who moves given number of turns after player with given name.
+        :param name: string with name of player
+        :param steps: integer of how many seats forward, negative numbers go backward
+        :return: Player object
+        """
+        return self.player(self.seats[name] + steps)
+
+    def previous(self, name):
+        """
+        Method used to find player who moved just before player with given name.
+        :param name: string with name of player
+        :return: Player object
+        """
+        return self.next(name, -1)
+
+    def following(self, name, how_many):
+        """
+        Method used to find players of next seats after player with given name, going around the table,
+        so in small games player itself can be one of them. Players who already emptied hands are passed.
+        :param name: string with name of player
+        :param how_many: integer of how many next seats are taken
+        :return: list of Player objects, empty if player is not at the table
+        """
+        if name not in self.seats:
+            return []
+        seat, following = self.seats[name], []
+        for step in range(1, len(self.names) * how_many + 1):
+            rival = self.player(seat + step)
+            if len(rival.hand) > 0 or rival.name == name:
+                following.append(rival)
+                if len(following) == how_many:
+                    break
+        return following
+
+    def previous_active(self, name):
+        """
+        Method used to find nearest player before player with given name, who does not skip turns
+        and still has cards.
+        Only seats of skipping players are passed, so in usual game it is found at once.
+        :param name: string with name of player
+        :return: Player object, player itself if everybody else skips, None if player skips too
+        """
+        player = self.players[name]
+        if player.turns_to_skip > 0:
+            return None
+        seat = self.seats[name]
+        for step in range(1, len(self.names)):
+            rival = self.player(seat - step)
+            if rival.turns_to_skip == 0 and len(rival.hand) > 0:
+                return rival
+        return player
@@ -0,0 +1,85 @@
+import logic.logic as rules
+
+
+class TurnContext:
+    """
+    Class used to keep everything what is known about plays of one hand in current turn.
+    It is computed once by turn_context and shared by engine, validation, cpu players, gui and server,
+    until game state or hand changes.
+    """
+    __slots__ = ('key', 'hand', 'top_card', 'active', 'possible_plays', 'can_move', '_packs')
+
+    def __init__(self, key, hand, top_card, active, possible_plays, can_move):
+        self.key = key
+        self.hand = hand
+        self.top_card = top_card
+        self.active = active
+        self.possible_plays = possible_plays
+        self.can_move = can_move
+        self._packs = None
+
+    @property
+    def packs(self):
+        """
+        Property with values of packs on hand which can be played in this turn, computed on first use.
+        :return: list of cards values
+        """
+        if self._packs is None:
+            packs = rules.check_if_pack_on_hand(self.hand)
+            self._packs = rules.check_if_packs_can_be_played(packs, self.possible_plays)
+        return self._packs
+
+
+def turn_key(hand, game_state):
+    """
+    Function used to describe everything which plays of hand depend on.
+    Hand object keeps version of its content, plain lists are described by their cards.
+    :param hand: list of cards on player hand
+    :param game_state: GameState object with all information about state of game
+    :return: tuple which changes whenever possible plays can change
+    """
+    gs = game_state
+    version = getattr(hand, 'version', None)
+    if version is None:
+        version = tuple(tuple(card) for card in hand)
+    lied_card = gs.lied_card
+    top_card = tuple(lied_card) if lied_card else gs.table.top
+    if top_card is not None:
+        top_card = tuple(top_card)
+    return version, lied_card is None, top_card, gs.requested_color, gs.requested_value
+
+
+def cached_turn_context(hand, game_state):
+    """
+    Function used to get turn context of hand only if it was already computed and is still up to date.
+    :param hand: list of cards on player hand
+    :param game_state: GameState object with all information about state of game
+    :return: TurnContext object or None
+    """
+    context = getattr(game_state, 'turn_context', None)
+    if context is None or context.hand is not hand or context.key != turn_key(hand, game_state):
+        return None
+    return context
+
+
+def turn_context(hand, game_state):
+    """
+    Function used to get turn context of hand, computed only when state of game or hand changed since last call.
+    Context is kept in game_state.turn_context.
+    :param hand: list of cards on player hand
+    :param game_state: GameState object with all information about state of game
+    :return: TurnContext object
+    """
+    gs = game_state
+    key = turn_key(hand, gs)
+    context = gs.turn_context
+    if context is not None and context.hand is hand and context.key == key:
+        return context
+
+    top_card = gs.lied_card
+    if not top_card:
+        top_card = gs.table.top
+    active = rules.check_card_played_active(top_card) and gs.lied_card is not None
+    possible_plays, can_move = rules.find_possible_plays(hand, top_card, active, gs.requested_color, gs.requested_value)
+    gs.turn_context = TurnContext(key, hand, top_card, active, possible_plays, can_move)
+    return gs.turn_context
@@ -0,0 +1,431 @@
+import numpy as np
+import logic.logic as rules
+
+# Tables of card traits indexed by card code (see logic.logic), used to evaluate effects of many cards at once.
+# Requests are kept as indexes: rank of requested value or index of requested color, -1 when nothing is requested.
+card_attack = np.array(rules.card_attack, dtype=np.int32)
+card_skip = np.array(rules.card_skip, dtype=np.int32)
+card_active = np.array(rules.card_active, dtype=bool)
+card_colors = np.array(rules.card_colors, dtype=np.int8)
+card_ranks = np.array(rules.card_ranks, dtype=np.int8)
+value_request = np.array([request == 'value' for request in rules.card_requests], dtype=bool)
+color_request = np.array([request == 'color' for request in rules.card_requests], dtype=bool)
+requestable_ranks = np.array(sorted(rules.value_indexes[value] for value in rules.requestable_values), dtype=np.int8)
+requestable_rank = np.isin(np.arange(len(rules.values)), requestable_ranks)
+jack_rank = rules.jack_rank
+pikes_king = rules.card_codes[('pikes', 'K')]
+
+
+def build_legal_table():
+    """
+    Function used to build table of playable cards for every turn context, from the same masks as rules use.
+    :return: bool array indexed by top card code, activity of top card, requested color + 1, requested rank + 1
+     and code of played card
+    """
+    table = np.zeros((rules.deck_size, 2, len(rules.colors) + 1, len(rules.values) + 1, rules.deck_size), dtype=bool)
+    codes = np.arange(rules.deck_size)
+    for top, top_card in enumerate(rules.deck_cards):
+        for active in [False, True]:
+            for color_index, requested_color in enumerate([None] + rules.colors):
+                for value_index, requested_value in enumerate([None] + rules.values):
+                    mask = rules.playable_mask(top_card, active, requested_color, requested_value)
+                    table[top, int(active), color_index, value_index] = (mask >> codes) & 1
+    return table
+
+
+legal_table = build_legal_table()
+
+
+class GameArrays:
+    """
+    Class used to keep many games of the same size at once, every field is an array with game index as first axis.
+    Hands keep counts of every card code, deck and table keep codes with top of pile at index deck_len - 1
+    and table_len - 1, lied card, requested color and requested value are -1 when there is none.
+    All games move in lockstep: the same seat moves in every game which is not finished yet.
+    """
+    __slots__ = ('hands', 'deck', 'deck_len', 'table', 'table_len', 'lied_card', 'cards_to_take', 'turns_to_wait',
+                 'requested_value_rounds', 'requested_value', 'requested_color', 'turns_to_skip', 'finished')
+
+    def __init__(self, how_many_games, how_many_players, how_many_decks=1):
+        capacity = rules.deck_size * how_many_decks
+        self.hands = np.zeros((how_many_games, how_many_players, rules.deck_size), dtype=np.int16)
+        self.deck = np.zeros((how_many_games, capacity), dtype=np.int16)
+        self.deck_len = np.zeros(how_many_games, dtype=np.int32)
+        self.table = np.zeros((how_many_games, capacity), dtype=np.int16)
+        self.table_len = np.zeros(how_many_games, dtype=np.int32)
+        self.lied_card = np.full(how_many_games, -1, dtype=np.int16)
+        self.cards_to_take = np.zeros(how_many_games, dtype=np.int32)
+        self.turns_to_wait = np.zeros(how_many_games, dtype=np.int32)
+        self.requested_value_rounds = np.zeros(how_many_games, dtype=np.int32)
+        self.requested_value = np.full(how_many_games, -1, dtype=np.int8)
+        self.requested_color = np.full(how_many_games, -1, dtype=np.int8)
+        self.turns_to_skip = np.zeros((how_many_games, how_many_players), dtype=np.int32)
+        self.finished = np.zeros(how_many_games, dtype=bool)
+
+    def select(self, index):
+        """
+        Method used to copy chosen games to new, smaller object.
+        :param index: integer array with indexes of games or bool array of chosen games
+        :return: GameArrays object
+        """
+        selected = GameArrays.__new__(GameArrays)
+        for name in GameArrays.__slots__:
+            setattr(selected, name, getattr(self, name)[index])
+        return selected
+
+    def update(self, index, selected):
+        """
+        Method used to write back games copied earlier with select method.
+        :param index: integer array with indexes of games used in select
+        :param selected: GameArrays object returned by select
+        """
+        for name in GameArrays.__slots__:
+            getattr(self, name)[index] = getattr(selected, name)
+
+    @property
+    def how_many_games(self):
+        return self.hands.shape[0]
+
+    @property
+    def how_many_players(self):
+        return self.hands.shape[1]
+
+
+def prepare_games(how_many_games, how_many_players, how_many_decks=1, how_many_cards=5, *, rng):
+    """
+    Function used to prepare many games at once, the same way as logic.game.prepare_game does it for one game:
+    one card goes to table, special cards are covered with next ones, then hands are dealt from top of deck.
+    :param how_many_games: integer of how many games will be played
+    :param how_many_players: integer of how many players are in every game
+    :param how_many_decks: integer of how many decks are in every game
+    :param how_many_cards: integer of how many cards will be dealt to players at start
+    :param rng: numpy Generator object used to shuffle decks
+    :return: GameArrays object
+    """
+    games = GameArrays(how_many_games, how_many_players, how_many_decks)
+    capacity = games.deck.shape[1]
+    order = np.argsort(rng.random((how_many_games, capacity)), axis=1)
+    games.deck[:] = np.tile(np.arange(rules.deck_size, dtype=np.int16), how_many_decks)[order]
+    games.deck_len[:] = capacity
+    everyone = np.ones(how_many_games, dtype=bool)
+    to_cover = everyone
+    while to_cover.any():
+        index = np.nonzero(to_cover)[0]
+        games.deck_len[index] -= 1
+        games.table[index, games.table_len[index]] = games.deck[index, games.deck_len[index]]
+        games.table_len[index] += 1
+        to_cover = everyone & card_active[games.table[np.arange(how_many_games), games.table_len - 1]]
+
+    for seat in range(how_many_players):
+        draw(games, everyone, np.full(how_many_games, seat), np.full(how_many_games, how_many_cards))
+    return games
+
+
+def from_game_states(game_states, how_many_decks=1):
+    """
+    Function used to convert states of reference engine to arrays, for example to check parity of rules.
+    Every state has to have the same number of players, their order is order of players dictionary.
+    :param game_states: list of GameState objects
+    :param how_many_decks: integer of how many decks are in every game
+    :return: GameArrays object
+    """
+    games = GameArrays(len(game_states), len(game_states[0].players), how_many_decks)
+    for index, gs in enumerate(game_states):
+        for seat, player in enumerate(gs.players.values()):
+            for card in player.hand:
+                games.hands[index, seat, rules.card_codes[card]] += 1
+            games.turns_to_skip[index, seat] = player.turns_to_skip
+        games.deck[index, :len(gs.deck)] = [rules.card_codes[card] for card in gs.deck]
+        games.deck_len[index] = len(gs.deck)
+        games.table[index, :len(gs.table)] = [rules.card_codes[card] for card in gs.table]
+        games.table_len[index] = len(gs.table)
+        games.lied_card[index] = rules.card_codes[gs.lied_card] if gs.lied_card else -1
+        games.cards_to_take[index] = gs.cards_to_take
+        games.turns_to_wait[index] = gs.turns_to_wait
+        games.requested_value_rounds[index] = gs.requested_value_rounds
+        games.requested_value[index] = rules.value_indexes.get(gs.requested_value, -1)
+        games.requested_color[index] = rules.color_indexes.get(gs.requested_color, -1)
+    return games
+
+
+def top_cards(games):
+    """
+    Function used to find card on top of a table in every game: lied card or top of table if there is no lied card.
+    :param games: GameArrays object
+    :return: array with code of top card and array with bool value if this card is still active
+    """
+    on_table = games.table[np.arange(games.how_many_games), np.maximum(games.table_len - 1, 0)]
+    lied = games.lied_card >= 0
+    top = np.where(lied, games.lied_card, on_table)
+    return top, card_active[top] & lied
+
+
+def legal_masks(games, seat):
+    """
+    Function used to evaluate cards from hand of given seat which can be played in every game.
+    :param games: GameArrays object
+    :param seat: integer index of player
+    :return: bool array with game index and card code axes
+    """
+    top, active = top_cards(games)
+    allowed = legal_table[top, active.astype(np.int8), games.requested_color + 1, games.requested_value + 1]
+    return allowed & (games.hands[:, seat] > 0)
+
+
+def draw(games, mask, seats, how_many):
+    """
+    Function used to take cards from top of deck to hands, in every game chosen by mask.
+    There is no refill here, games with too short deck get fewer cards.
+    :param games: GameArrays object
+    :param mask: bool array of games in which cards are taken
+    :param seats: integer array with index of player who takes cards in every game
+    :param how_many: integer array with number of cards to take in every game
+    """
+    how_many = np.where(mask, np.minimum(how_many, games.deck_len), 0)
+    for step in range(int(how_many.max(initial=0))):
+        index = np.nonzero(how_many > step)[0]
+        games.deck_len[index] -= 1
+        cards = games.deck[index, games.deck_len[index]]
+        games.hands[index, seats[index], cards] += 1
+
+
+def push_lied_card(games, mask):
+    """
+    Function used to put lied card on table and leave no lied card, in every game chosen by mask.
+    :param games: GameArrays object
+    :param mask: bool array of games
+    """
+    index = np.nonzero(mask & (games.lied_card >= 0))[0]
+    games.table[index, games.table_len[index]] = games.lied_card[index]
+    games.table_len[index] += 1
+    games.lied_card[mask] = -1
+
+
+def clean_tables(games, mask, rng):
+    """
+    Function used to shuffle cards from table under deck, top card of table stays, like rules.clean_table.
+    :param games: GameArrays object
+    :param mask: bool array of games in which deck is refilled
+    :param rng: numpy Generator object used to shuffle cards from tables
+    """
+    index = np.nonzero(mask)[0]
+    if len(index) == 0:
+        return
+    capacity = games.deck.shape[1]
+    positions = np.arange(capacity)
+    recycled = games.table_len[index, None] - 1
+    keys = np.where(positions < recycled, rng.random((len(index), capacity)), 2.0)
+    shuffled = np.take_along_axis(games.table[index], np.argsort(keys, axis=1), axis=1)
+    old_deck = np.take_along_axis(games.deck[index], np.clip(positions - recycled, 0, capacity - 1), axis=1)
+    top = games.table[index, recycled[:, 0]]
+    games.deck[index] = np.where(positions < recycled, shuffled, old_deck)
+    games.deck_len[index] += recycled[:, 0]
+    games.table[index, 0] = top
+    games.table_len[index] = 1
+
+
+def take_cards_punishment(games, mask, seats, rng):
+    """
+    Function used to punish players with cards in every game chosen by mask, like rules.take_cards_punishment.
+    :param games: GameArrays object
+    :param mask: bool array of games
+    :param seats: integer array with index of punished player in every game
+    :param rng: numpy Generator object used to shuffle cards from tables
+    """
+    clean_tables(games, mask & (games.deck_len <= games.cards_to_take), rng)
+    attacked = mask & (games.cards_to_take > 0)
+    draw(games, mask, seats, np.where(attacked, games.cards_to_take, 1))
+    games.cards_to_take[attacked] = 0
+    push_lied_card(games, attacked)
+
+
+def punish_players(games, mask, seat, rng):
+    """
+    Function used to punish player who has no move with turns or cards, like logic.game.punish_player.
+    :param games: GameArrays object
+    :param mask: bool array of games
+    :param seat: integer index of punished player
+    :param rng: numpy Generator object used to shuffle cards from tables
+    """
+    waiting = mask & (games.turns_to_wait > 0)
+    games.turns_to_skip[waiting, seat] = games.turns_to_wait[waiting] - 1
+    games.turns_to_wait[waiting] = 0
+    push_lied_card(games, waiting)
+    take_cards_punishment(games, mask & ~waiting, np.full(games.how_many_games, seat), rng)
+
+
+def lay_cards(games, mask, seat, cards, requests):
+    """
+    Function used to play one card from hand of given seat in every game chosen by mask,
+    with the same effects as engine evaluates them. Request is used only with jack or ace.
+    :param games: GameArrays object
+    :param mask: bool array of games
+    :param seat: integer index of player
+    :param cards: integer array with code of played card in every game
+    :param requests: integer array with requested rank after jack or color after ace, -1 for no request
+    """
+    index = np.nonzero(mask)[0]
+    cards, requests = cards[index], requests[index]
+    active = index[card_active[cards]]
+    active_cards = cards[card_active[cards]]
+    games.cards_to_take[active] += card_attack[active_cards]
+    games.turns_to_wait[active] += card_skip[active_cards]
+    games.requested_color[active] = -1
+    games.requested_value[active] = -1
+
+    valid_request = requests >= 0
+    by_value = value_request[cards] & valid_request & requestable_rank[np.clip(requests, 0, len(requestable_rank) - 1)]
+    games.requested_value[index[by_value]] = requests[by_value]
+    by_color = color_request[cards] & valid_request & (requests < len(rules.colors))
+    games.requested_color[index[by_color]] = requests[by_color]
+
+    games.hands[index, seat, cards] -= 1
+    covering = games.lied_card[index] >= 0
+    games.requested_color[index[covering & ~color_request[cards]]] = -1
+    push_lied_card(games, mask)
+    games.lied_card[index] = cards
+
+
+def pikes_king_punishment(games, mask, seat, rng):
+    """
+    Function used to punish with cards the closest player before given seat who does not skip turns,
+    it is the same player when everybody else skips, like logic.game.pikes_king_punishment.
+    :param games: GameArrays object
+    :param mask: bool array of games
+    :param seat: integer index of player who played pikes king
+    :param rng: numpy Generator object used to shuffle cards from tables
+    """
+    how_many_players = games.how_many_players
+    rivals = np.full(games.how_many_games, seat)
+    found = ~mask
+    for back in range(1, how_many_players):
+        rival = (seat - back) % how_many_players
+        now = ~found & (games.turns_to_skip[:, rival] == 0)
+        rivals[now] = rival
+        found |= now
+    take_cards_punishment(games, mask, rivals, rng)
+
+
+def play_turn(games, seat, policy, rng):
+    """
+    Function used to play turn of given seat in every game which is not finished, like headless.play_move
+    together with beginning and end of turn in headless.play_round.
+    :param games: GameArrays object
+    :param seat: integer index of player
+    :param policy: function policy(games, seat, legal, rng) returning arrays with card codes and requests
+    :param rng: numpy Generator object
+    """
+    alive = ~games.finished
+    expired = alive & (games.requested_value_rounds == 0)
+    games.requested_value[expired] = -1
+    games.requested_value_rounds[alive & ~expired] -= 1
+    last_card = games.lied_card.copy()
+
+    skipping = alive & (games.turns_to_skip[:, seat] > 0)
+    games.turns_to_skip[skipping, seat] -= 1
+    legal = legal_masks(games, seat)
+    can_move = legal.any(axis=1)
+    punish_players(games, alive & ~skipping & ~can_move, seat, rng)
+    moving = alive & ~skipping & can_move
+    if moving.any():
+        cards, requests = policy(games, seat, legal, rng)
+        lay_cards(games, moving, seat, cards, requests)
+
+    lied = alive & (games.lied_card >= 0)
+    jack = lied & (last_card != games.lied_card) & (games.requested_value >= 0)
+    jack &= card_ranks[np.maximum(games.lied_card, 0)] == jack_rank
+    games.requested_value_rounds[jack] = games.how_many_players
+    pikes_king_punishment(games, lied & (games.lied_card == pikes_king), seat, rng)
+
+
+def play_round(games, policies, rng):
+    """
+    Function used to play one round in every game which is not finished. Game is marked as finished
+    right after turn in which player emptied hand, so next seats do not move in it, like in game.play_round.
+    :param games: GameArrays object
+    :param policies: list with policy function of every seat
+    :param rng: numpy Generator object
+    :return: bool array with game index and seat axes, True for players who won in this round
+    """
+    winners = np.zeros(games.hands.shape[:2], dtype=bool)
+    for seat, policy in enumerate(policies):
+        play_turn(games, seat, policy, rng)
+        winners[:, seat] = ~games.finished & (games.hands[:, seat].sum(axis=1) == 0)
+        games.finished |= winners[:, seat]
+    return winners
+
+
+def play_games(games, policies, rng, max_rounds=1000):
+    """
+    Function used to play all games to the end, or until limit of rounds.
+    When most of games are finished, the rest is moved to smaller arrays, so finished games cost nothing.
+    :param games: GameArrays object
+    :param policies: list with policy function of every seat
+    :param rng: numpy Generator object
+    :param max_rounds: integer limit of rounds, games not finished until then have no winners
+    :return: bool array of winners with game index and seat axes, integer array with number of rounds of every game
+    """
+    winners = np.zeros(games.hands.shape[:2], dtype=bool)
+    rounds = np.zeros(games.how_many_games, dtype=np.int32)
+    index, playing = np.arange(games.how_many_games), games
+    for _ in range(max_rounds):
+        alive = ~playing.finished
+        if not alive.any():
+            break
+        if alive.sum() * 2 < len(alive):
+            games.update(index, playing)
+            index, playing = index[alive], playing.select(alive)
+        rounds[index[~playing.finished]] += 1
+        winners[index] |= play_round(playing, policies, rng)
+    games.update(index, playing)
+    return winners, rounds
+
+
+def choose_requests(games, seat, cards, rng=None):
+    """
+    Helper function used to choose request after jack or ace: the most frequent requestable value or color
+    left on hand, chosen at random from all of them when rng is given.
+    :param games: GameArrays object
+    :param seat: integer index of player
+    :param cards: integer array with code of played card in every game
+    :param rng: numpy Generator object, None to choose by counts on hand
+    :return: integer array with requested rank or color, -1 when card does not request anything
+    """
+    how_many_games = games.how_many_games
+    if rng is not None:
+        values = requestable_ranks[rng.integers(0, len(requestable_ranks), how_many_games)]
+        colors = rng.integers(0, len(rules.colors), how_many_games).astype(np.int8)
+    else:
+        hand = games.hands[:, seat].astype(np.int32)
+        hand[np.arange(how_many_games), cards] -= 1
+        by_rank = hand.reshape(how_many_games, len(rules.values), len(rules.colors))
+        values = requestable_ranks[by_rank.sum(axis=2)[:, requestable_ranks].argmax(axis=1)]
+        colors = by_rank.sum(axis=1).argmax(axis=1).astype(np.int8)
+    return np.where(value_request[cards], values, np.where(color_request[cards], colors, -1))
+
+
+def random_policy(games, seat, legal, rng):
+    """
+    Policy which plays random legal card and requests random value or color.
+    :param games: GameArrays object
+    :param seat: integer index of player
+    :param legal: bool array of legal cards, from legal_masks
+    :param rng: numpy Generator object
+    :return: integer array with card codes, integer array with requests
+    """
+    chosen = (rng.random(len(legal)) * legal.sum(axis=1)).astype(np.int8)
+    cards = (np.cumsum(legal, axis=1, dtype=np.int8) > chosen[:, None]).argmax(axis=1)
+    return cards, choose_requests(games, seat, cards, rng)
+
+
+def lowest_card_policy(games, seat, legal, _rng):
+    """
+    Policy which plays legal card with the lowest code and requests trait most frequent on hand.
+    :param games: GameArrays object
+    :param seat: integer index of player
+    :param legal: bool array of legal cards, from legal_masks
+    :param _rng: numpy Generator object
+    :return: integer array with card codes, integer array with requests
+    """
+    cards = legal.argmax(axis=1)
+    return cards, choose_requests(games, seat, cards)
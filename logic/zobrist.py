@@ -0,0 +1,107 @@
+from hashlib import blake2b
+
+# Zobrist keys are 64-bit numbers derived from blake2b of their description, so they are the same in every process
+# and hashes of game states can be compared between runs, for example in replay corpus.
+# Keys are summed modulo 2 ** 64 instead of xored, so many copies of the same card in game with few decks
+# do not cancel each other out.
+mask = (1 << 64) - 1
+card_keys = {}
+position_keys = []
+value_keys = {}
+counter_names = ('lied_card', 'cards_to_take', 'turns_to_wait', 'requested_value_rounds', 'requested_value',
+                 'requested_color')
+
+
+def random_key(*parts):
+    """
+    Function used to derive stable pseudo-random 64-bit key from its description.
+    :param parts: strings, numbers or tuples describing key
+    :return: integer key
+    """
+    return int.from_bytes(blake2b(repr(parts).encode(), digest_size=8).digest(), 'little')
+
+
+def card_key(card):
+    """
+    Function used to get key of card, computed once and kept in cache.
+    :param card: tuple or list with card
+    :return: integer key
+    """
+    try:
+        return card_keys[card]
+    except KeyError:
+        key = card_keys[card] = random_key('card', card)
+        return key
+    except TypeError:
+        return card_key(tuple(card))
+
+
+def position_key(position):
+    """
+    Function used to get key of position in pile, keys are generated for longer piles when needed.
+    :param position: integer index of card in pile
+    :return: integer key
+    """
+    while len(position_keys) <= position:
+        position_keys.append(random_key('position', len(position_keys)))
+    return position_keys[position]
+
+
+def value_key(name, value):
+    """
+    Function used to get key of counter or request of game state with given value.
+    :param name: string with name of field
+    :param value: value of field, like integer, card or color
+    :return: integer key
+    """
+    field = (name, value)
+    key = value_keys.get(field)
+    if key is None:
+        key = value_keys[field] = random_key('value', name, value)
+    return key
+
+
+def pile_hash(cards, start=0):
+    """
+    Function used to sum keys of cards lying on given positions of pile, from start to top of pile.
+    Key of card in pile depends on its position, so piles with the same cards in other order differ.
+    :param cards: list with cards
+    :param start: integer index of first summed position
+    :return: integer sum of keys, not reduced modulo 2 ** 64
+    """
+    total = 0
+    for position in range(start, len(cards)):
+        total += card_key(cards[position]) ^ position_key(position)
+    return total
+
+
+def mix(number):
+    """
+    Function used to scramble 64-bit number with finalizer of splitmix64, so hashes of different parts of state
+    can be summed without cancelling out, when card moves from one part to another.
+    :param number: integer
+    :return: integer from 0 to 2 ** 64 - 1
+    """
+    number &= mask
+    number = (number ^ (number >> 30)) * 0xbf58476d1ce4e5b9 & mask
+    number = (number ^ (number >> 27)) * 0x94d049bb133111eb & mask
+    return number ^ (number >> 31)
+
+
+def state_hash(deck, table, counters, seats):
+    """
+    Function used to combine hashes of piles and hands with counters of game into one hash of game state.
+    :param deck: integer zobrist hash of deck
+    :param table: integer zobrist hash of table
+    :param counters: tuple with lied card, cards to take, turns to wait, rounds of requested value,
+     requested value and requested color
+    :param seats: iterable with zobrist hash of hand and turns to skip of every player, in order of seats
+    :return: integer from 0 to 2 ** 64 - 1
+    """
+    total = mix(deck + value_key('pile', 'deck')) + mix(table + value_key('pile', 'table'))
+    for name, value in zip(counter_names, counters):
+        total += value_key(name, value)
+    for seat, (hand, turns_to_skip) in enumerate(seats):
+        total += mix(hand + value_key('seat', seat))
+        total += value_key('turns_to_skip', (seat, turns_to_skip))
+    return mix(total)
@@ -1,4 +1,5 @@
 import logic.game as game
+import logic.events as events
 import os
 import asyncio
 
@@ -11,7 +12,7 @@ async def main(print_foo=print, input_foo=input):
     how_many_cards = int(input_foo('How many cards on start?: '))
     if how_many_cards < 3:
         raise Exception('Wrong number of starting cards entered!')
-    how_many_deck = round(0.5 + ((how_many_players * how_many_cards) * 2) / 52)
+    how_many_deck = game.count_decks(how_many_players, how_many_cards)
     print_foo(f'Game will be played with {how_many_deck} decks.')
 
     names = []
@@ -20,7 +21,9 @@ async def main(print_foo=print, input_foo=input):
         names.append(name)
 
     game_state = game.GameState()
-    game_state.deck, game_state.table, game_state.players = game.prepare_game(names, how_many_deck, how_many_cards)
+    game_state.sinks.append(events.print_sink)
+    game_state.deck, game_state.table, game_state.players = \
+        game.prepare_game(names, how_many_deck, how_many_cards, rng=game_state.rng)
     os.system('cls||clear')
     await game.play_game(game_state)
 
@@ -0,0 +1,39 @@
+import argparse
+from logic.batch import BatchConfig, BatchStats, run_batch, strategies
+
+
+def parse_args(args=None):
+    """
+    Function used to read configuration of batch from command line.
+    :param args: list of strings with arguments, None to read them from sys.argv
+    :return: Namespace object with arguments
+    """
+    parser = argparse.ArgumentParser(description='Play many headless Macau games and print statistics.')
+    parser.add_argument('strategies', nargs='+', choices=sorted(strategies), help='strategy of every seat')
+    parser.add_argument('-g', '--games', type=int, default=1000, help='how many games will be played')
+    parser.add_argument('-c', '--cards', type=int, default=5, help='how many cards are dealt at start')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='seed of first game')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes, one per core by default')
+    parser.add_argument('--chunk', type=int, default=200, help='how many games are sent to worker at once')
+    parser.add_argument('--max-rounds', type=int, default=1000, help='limit of rounds of one game')
+    parser.add_argument('--progress', action='store_true', help='print statistics after every chunk')
+    return parser.parse_args(args)
+
+
+def main(args=None, print_foo=print):
+    args = parse_args(args)
+    if len(args.strategies) < 2:
+        raise Exception('Wrong number of players entered!')
+    config = BatchConfig(tuple(args.strategies), args.cards, args.max_rounds)
+    stats = BatchStats(config)
+    for result in run_batch(config, args.games, args.seed, args.workers, args.chunk):
+        stats.add(result)
+        if args.progress and stats.games % args.chunk == 0:
+            print_foo(stats.report()[0])
+    for line in stats.report():
+        print_foo(line)
+    return stats
+
+
+if __name__ == '__main__':
+    main()
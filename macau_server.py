@@ -5,6 +5,9 @@ from pydantic import BaseModel
 import asyncio
 from player.player import Player
 import logic.game as game
+import logic.events as events
+import logic.replay as replay
+from logic.turn import cached_turn_context
 import uuid
 
 app = FastAPI()
@@ -14,6 +17,10 @@ games_container = []
 class GameParams(BaseModel):
     how_many_cards: int
     players_names: list
+    seed: Optional[int] = None
+    move_timeout: Optional[float] = None
+    game_timeout: Optional[float] = None
+    timeout_fallback: str = 'draw'
 
 
 def create_print_foo(game_id: int):
@@ -52,9 +59,7 @@ def create_input_foo(name: str, game_id: int):
         gc = games_container[game_id]
         gc['outputs'][name].append(message)
         await waiter()
-        move = gc['inputs'][name].pop()
-        gc['state'].players[name].print_foo(f'{name} plays: {move}.')
-        return move
+        return gc['inputs'][name].pop()
 
     return input_foo
 
@@ -62,15 +67,29 @@ def create_input_foo(name: str, game_id: int):
 async def create_io_foo(game_id, game_state):
     """
     Function used to inject proper print and input functions to human players.
+    Events of game are printed as text and collected in compact form for clients reading them directly.
     :param game_id: integer value of game id
     :param game_state: GameState object with all game data inside
     """
+    game_state.sinks = [events.print_sink, events.list_sink(games_container[game_id]['events'])]
     for player in game_state.players.values():
         player.print_foo = create_print_foo(game_id)
         if type(player) is Player:
             player.input_foo = create_input_foo(player.name, game_id)
 
 
+async def play_recorded_game(game_id, game_state):
+    """
+    Function used to play game and close its log with hash of final state, if game is recorded.
+    :param game_id: integer value of game id
+    :param game_state: GameState object with all game data inside
+    """
+    await game.play_game(game_state)
+    gc = games_container[game_id]
+    if gc['log'] is not None:
+        gc['log'] = replay.finish_log(gc['log'], game_state)
+
+
 def validate_game_and_player_data(game_id: int, player_name: str):
     """
     Function used to ease validation of data given to post_player_move and get_player_ui
@@ -136,13 +155,22 @@ async def read_root():
 async def start_game(game_params: GameParams):
     """
     Method used to create game instance with given parameters
-    :param game_params: GameParams object with integer how_many_cards and list of strings with players_names
+    :param game_params: GameParams object with integer how_many_cards, list of strings with players_names
+     and optional integer seed, games without seed are shuffled with secure generator.
+     Optional move_timeout and game_timeout limit in seconds time of every decision and of whole game,
+     timeout_fallback ('draw', 'cpu' or 'forfeit') decides what happens to player who ran out of time
     :return: integer value of game_id
     """
-    game_state = game.GameState()
     gp = game_params
+    if gp.timeout_fallback not in game.timeout_fallbacks:
+        return JSONResponse(content={'status': 'Wrong fallback', 'game_id': None}, status_code=400)
+    game_state = game.GameState(gp.seed, secure=gp.seed is None)
+    game_state.move_timeout = gp.move_timeout
+    game_state.timeout_fallback = game.timeout_fallbacks[gp.timeout_fallback]
+    if gp.game_timeout is not None:
+        game_state.game_deadline = asyncio.get_running_loop().time() + gp.game_timeout
     names = gp.players_names
-    macau = {"state": game_state, "inputs": {}, 'outputs': {}, 'tokens': {}}
+    macau = {"state": game_state, "inputs": {}, 'outputs': {}, 'tokens': {}, 'events': [], 'log': None}
     for name in names:
         if type(name) is not str:
             return JSONResponse(content={'status': 'Wrong names', 'game_id': None}, status_code=400)
@@ -150,12 +178,15 @@ async def start_game(game_params: GameParams):
         macau['outputs'][name] = []
         macau['tokens'][name] = ''
     macau['outputs']['game'] = []
-    how_many_deck = round(0.5 + ((len(names) * gp.how_many_cards) * 2) / 52)
-    game_state.deck, game_state.table, game_state.players = game.prepare_game(names, how_many_deck, gp.how_many_cards)
+    how_many_deck = game.count_decks(len(names), gp.how_many_cards)
+    game_state.deck, game_state.table, game_state.players = \
+        game.prepare_game(names, how_many_deck, gp.how_many_cards, rng=game_state.rng)
     games_container.append(macau)
     game_id = len(games_container) - 1
     await create_io_foo(game_id, game_state)
-    asyncio.create_task(game.play_game(game_state))
+    if gp.seed is not None:
+        macau['log'] = replay.record_game(game_state, how_many_deck, gp.how_many_cards)
+    asyncio.create_task(play_recorded_game(game_id, game_state))
     content = {'status': 'OK', 'game_id': game_id}
     return content
 
@@ -186,6 +217,35 @@ def get_game_log(game_id: int):
     return {"status": "OK", "output": outputs}
 
 
+@app.get("/macau/{game_id}/log")
+def get_game_replay_log(game_id: int):
+    """
+    Method used to get log of game with seed, which can be replayed with logic.replay module.
+    Hash of final state is None until game ends.
+    :param game_id: integer value of existing game
+    :return: dictionary with seed, configuration and moves of game
+    """
+    if game_id >= len(games_container):
+        return JSONResponse(content={'status': 'No game', 'log': None}, status_code=404)
+    log = games_container[game_id]['log']
+    if log is None:
+        return JSONResponse(content={'status': 'Game without seed', 'log': None}, status_code=404)
+    return {"status": "OK", "log": replay.log_to_dict(log)}
+
+
+@app.get("/macau/{game_id}/events")
+def get_game_events(game_id: int, start: int = 0):
+    """
+    Method used to get events of macau game with given game id as dictionaries, without text to parse.
+    :param game_id: integer value of existing game
+    :param start: integer index of first event to send, so clients can get only new events
+    :return: list with dictionaries of events with name under 'event' key and its fields
+    """
+    if game_id >= len(games_container):
+        return JSONResponse(content={'status': 'No game', 'events': None}, status_code=404)
+    return {"status": "OK", "events": games_container[game_id]['events'][start:]}
+
+
 @app.get("/macau/{game_id}/{player_name}/key")
 def get_key_for_player_ui(game_id: int, player_name: str):
     """
@@ -233,6 +293,7 @@ def get_player_state(game_id: int, player_name: str, access_token: Optional[str]
     """
     Method used to get most of important information about current state of game,
      with additional private data for player.
+    Possible plays are sent only when player is asked for move, taken from turn context computed by game.
     :param game_id: integer value of existing game
     :param player_name: string with name of player
     :param access_token: User private access token
@@ -248,6 +309,8 @@ def get_player_state(game_id: int, player_name: str, access_token: Optional[str]
     state = generate_state_json(game_id)
     gs = games_container[game_id]['state']
     state['hand'] = gs.players[player_name].hand
+    context = cached_turn_context(state['hand'], gs)
+    state['possible_plays'] = context.possible_plays if context is not None else None
     state['rivals'] = {}
     for name, rival in gs.players.items():
         if name != player_name:
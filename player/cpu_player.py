@@ -1,17 +1,34 @@
 from copy import copy
-from secrets import choice
-from logic.logic import check_if_pack_on_hand, check_if_packs_can_be_played
+from logic.rng import copy_rng
+from logic.logic import check_if_pack_on_hand, check_if_packs_can_be_played, card_text
 from player.player import Player
 from player.helpers import find_best_attack_card
+from logic.turn import cached_turn_context
+from logic.move import Move
+
+special_values = '2 3 4 J Q K A'.split()
 
 
 class CPUPlayer(Player):
-    def __init__(self, name):
+    def __init__(self, name, rng):
         Player.__init__(self, name)
+        self.rng = rng
         self.next_moves = []
         self.move_counter = -1
         self.gui_foo = self.__cpu_gui
         self.input_foo = self.__cpu_input
+        self.decide_foo = self.__cpu_decide
+        self.move_foo = self.__cpu_move
+
+    def clone(self):
+        """
+        Method used to make independent copy of cpu player, with its own copy of generator and plans.
+        :return: copied CPUPlayer object
+        """
+        player = Player.clone(self)
+        player.rng = copy_rng(self.rng)
+        player.next_moves = list(self.next_moves)
+        return player
 
     async def __cpu_gui(self, game_state, _top_card, possible_plays):
         """
@@ -23,6 +40,39 @@ class CPUPlayer(Player):
         :return: empty string object
         """
         self.move_counter = -1
+        self.plan_move(game_state, possible_plays)
+        return ''
+
+    def __cpu_decide(self, game_state, _top_card, possible_plays):
+        """
+        Function used as a decision callback of cpu player in headless games.
+        It builds the same strategy as gui function, but returns it without any text.
+        :param game_state: GameState object with all information about state of game
+        :param _top_card: tuple with card on top of a table
+        :param possible_plays: list of cards possible to be played
+        :return: Move object with cards to be played and requested color or value
+        """
+        self.plan_move(game_state, possible_plays)
+        request = self.next_moves[1] if len(self.next_moves) > 1 else None
+        return Move(self.planned_cards(), request)
+
+    async def __cpu_move(self, game_state, top_card, possible_plays):
+        """
+        Function used as a move function of cpu player, it passes decision to game without any text to parse.
+        Move is announced to other players by game, the same way as typed moves.
+        :param game_state: GameState object with all information about state of game
+        :param top_card: tuple with card on top of a table
+        :param possible_plays: list of cards possible to be played
+        :return: Move object with cards to be played and requested color or value
+        """
+        return self.__cpu_decide(game_state, top_card, possible_plays)
+
+    def plan_move(self, game_state, possible_plays):
+        """
+        Helper function used to plan next moves of cpu player: cards to play and request after jack or ace.
+        :param game_state: GameState object with all information about state of game
+        :param possible_plays: list of cards possible to be played
+        """
         self.choose_first_move(game_state, possible_plays)
         check_card = ('', '')
         if type(self.next_moves[0]) is tuple:
@@ -36,8 +86,6 @@ class CPUPlayer(Player):
         elif check_card[1] == 'J':
             self.next_moves.append(self.evaluate_jack_request())
 
-        return ''
-
     def choose_first_move(self, game_state, possible_plays):
         """
         Helper function used to choose first move of cpu player.
@@ -48,18 +96,24 @@ class CPUPlayer(Player):
             self.next_moves = ['']
         else:
             if not self.need_to_attack(game_state):
-                self.next_moves = [choice(possible_plays)]
+                self.next_moves = [self.rng.choice(possible_plays)]
             else:
-                self.next_moves = find_best_attack_card(possible_plays)
-        self.consider_pack_play(possible_plays)
+                self.next_moves = find_best_attack_card(possible_plays, self.rng)
+        context = cached_turn_context(self.hand, game_state)
+        packs = None
+        if context is not None and context.possible_plays is possible_plays:
+            packs = context.packs
+        self.consider_pack_play(possible_plays, packs)
 
-    def consider_pack_play(self, possible_plays):
+    def consider_pack_play(self, possible_plays, packs=None):
         """
         Helper function used to consider pack as a play
         :param possible_plays: list of cards possible to be played
+        :param packs: list of values of packs which can be played, taken from turn context, None to find them
         """
-        packs = check_if_pack_on_hand(self.hand)
-        packs = check_if_packs_can_be_played(packs, possible_plays)
+        if packs is None:
+            packs = check_if_pack_on_hand(self.hand)
+            packs = check_if_packs_can_be_played(packs, possible_plays)
         if len(packs) > 0 and self.next_moves[0] != '' and self.next_moves[0][1] in packs:
             hand_copy = copy(self.hand)
             hand_copy.remove(self.next_moves[0])
@@ -76,20 +130,12 @@ class CPUPlayer(Player):
 
     def need_to_attack(self, game_state):
         """
-        Helper function used to evaluate if attacking now is good strategy.
+        Helper function used to evaluate if attacking now is good strategy: one of two next players
+        (cpu itself in game of two) has less than three cards.
         :param game_state: GameState object with all information about state of game
         :return: bool True if cpu should attack, False otherwise
         """
-        copy_players = list(game_state.players.values()) + list(game_state.players.values())
-        after_me = 0
-        need_to_attack = False
-        for rival in copy_players:
-            if after_me > 0 and len(rival.hand) < 3:
-                need_to_attack = True
-            after_me -= 1
-            if rival.name == self.name:
-                after_me = 2
-        return need_to_attack
+        return any(len(rival.hand) < 3 for rival in game_state.seats.following(self.name, 2))
 
     def evaluate_jack_request(self):
         """
@@ -98,17 +144,27 @@ class CPUPlayer(Player):
         """
         biggest_value, appearances_value = self.find_biggest('value')
         biggest_color, appearances_color = self.find_biggest('color')
+        if appearances_color <= appearances_value:
+            return biggest_value
+
         hand_copy = self.copy_hand_remove_next_moves()
-        if appearances_color > appearances_value:
-            biggest_cards = [card for card in hand_copy
-                             if card[0] == biggest_color and card[1] not in '2 3 4 J Q K A'.split()]
-        else:
-            biggest_cards = [card for card in hand_copy if card[1] == biggest_value]
+        biggest_cards = [card for card in hand_copy if card[0] == biggest_color and card[1] not in special_values]
         chosen_card = ('', '')
         if len(biggest_cards) > 0:
-            chosen_card = choice(biggest_cards)
+            chosen_card = self.rng.choice(biggest_cards)
         return chosen_card[1]
 
+    def planned_cards(self):
+        """
+        Helper function used to list cards chosen to be played as a next move.
+        :return: list of cards from next move
+        """
+        if type(self.next_moves[0]) is list:
+            return self.next_moves[0]
+        if type(self.next_moves[0]) is tuple:
+            return [self.next_moves[0]]
+        return []
+
     def copy_hand_remove_next_moves(self):
         """
         Helper function used to make a copy of hand and remove cards chosen to be played from this copy.
@@ -127,26 +183,26 @@ class CPUPlayer(Player):
     def find_biggest(self, what='color'):
         """
         Helper function used to find color of value most frequent in hand
+        Counts come from hand counters, ties are resolved by order of cards on hand.
         :param what: string which allow to choose what trait needs to be found
         :return: string with biggest trait on hand,
         int with how many cards on hand have this trait
         """
-        index = bool(what != 'color')
-        hand_copy = self.copy_hand_remove_next_moves()
-        on_hand = {}
-        for card in hand_copy:
-            trait = card[index]
-            if trait in on_hand.keys():
-                on_hand[trait] += 1
-            else:
-                on_hand[trait] = 1
+        index = int(what != 'color')
+        counts = self.hand.value_counts if index else self.hand.color_counts
+        on_hand = dict(counts)
+        for card in self.planned_cards():
+            on_hand[card[index]] = on_hand.get(card[index], 0) - 1
         if index == 1:
-            [on_hand.pop(value) for value in '2 3 4 J Q K A'.split() if value in on_hand.keys()]
-        biggest = max(on_hand, key=on_hand.get, default='')
-        appearances = 0
-        if biggest in on_hand:
-            appearances = on_hand[biggest]
-        return biggest, appearances
+            [on_hand.pop(value) for value in special_values if value in on_hand]
+        appearances = max(on_hand.values(), default=0)
+        if appearances <= 0:
+            return '', 0
+
+        for card in self.copy_hand_remove_next_moves():
+            if on_hand.get(card[index]) == appearances:
+                return card[index], appearances
+        return '', 0
 
     async def __cpu_input(self, _message):
         """
@@ -159,15 +215,12 @@ class CPUPlayer(Player):
         cards_left = len(self.hand)
         if len(self.next_moves) > self.move_counter:
             if type(self.next_moves[self.move_counter]) is list:
-                for card in self.next_moves[self.move_counter]:
-                    cpu_move += f'{card[0]} {card[1]}, '
-                    cards_left -= 1
-                cpu_move = cpu_move[:-2]
+                cpu_move = ', '.join(card_text(card) for card in self.next_moves[self.move_counter])
+                cards_left -= len(self.next_moves[self.move_counter])
             elif type(self.next_moves[self.move_counter]) is str:
                 cpu_move = self.next_moves[self.move_counter]
                 cards_left -= len(self.next_moves[self.move_counter-1])
             else:
-                cpu_move = f'{self.next_moves[self.move_counter][0]} {self.next_moves[self.move_counter][1]}'
+                cpu_move = card_text(self.next_moves[self.move_counter])
                 cards_left -= 1
-        self.print_foo(f'{self.name} plays: {cpu_move}.')
         return cpu_move
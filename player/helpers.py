@@ -1,4 +1,4 @@
-from secrets import choice
+from logic.logic import card_effect
 
 
 def find_offensive_plays(possible_plays):
@@ -9,24 +9,24 @@ def find_offensive_plays(possible_plays):
     """
     offensive_plays = []
     for card in possible_plays:
-        if card == ('pikes', 'K') or card == ('hearts', 'K'):
-            offensive_plays.append(card)
-        elif card[1] in '2 3 4 J'.split():
+        effect = card_effect(card)
+        if effect.attack or effect.skip or effect.request == 'value':
             offensive_plays.append(card)
     return offensive_plays
 
 
-def find_best_attack_card(possible_plays):
+def find_best_attack_card(possible_plays, rng):
     """
     Helper function used to find best card to play as attack.
     :param possible_plays: list of cards possible to be played
+    :param rng: Random object used to choose one of equally good cards
     :return: list with one element with the best card to be played
     """
     offensive_plays = find_offensive_plays(possible_plays)
     if len(offensive_plays) > 0:
-        return [choice(offensive_plays)]
+        return [rng.choice(offensive_plays)]
     else:
         plays_no_queens = [card for card in possible_plays if card[1] != 'Q']
         if len(plays_no_queens) > 0:
-            return [choice(plays_no_queens)]
+            return [rng.choice(plays_no_queens)]
     return ['']
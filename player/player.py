@@ -1,4 +1,7 @@
 import os
+from logic.hand import Hand
+from logic.logic import card_data, card_text
+from logic.move import parse_move
 
 
 class Player:
@@ -9,11 +12,46 @@ class Player:
         self.input_foo = self.__input_foo
         self.print_foo = print
         self.gui_foo = self.__gui_builder
+        self.move_foo = self.__text_move
+
+    def clone(self):
+        """
+        Method used to make independent copy of player for forked game states.
+        Callbacks bound to this player are bound to the copy, other callbacks are shared.
+        :return: copied Player object
+        """
+        player = object.__new__(type(self))
+        attributes = player.__dict__
+        attributes.update(self.__dict__)
+        for name, foo in attributes.items():
+            if getattr(foo, '__self__', None) is self:
+                attributes[name] = foo.__func__.__get__(player)
+        player.hand = self.hand.copy()
+        return player
+
+    @property
+    def hand(self):
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        self._hand = cards if isinstance(cards, Hand) else Hand(cards)
 
     async def __input_foo(self, message):
-        move = input(message)
-        self.print_foo(f'{self.name} plays: {move}.')
-        return move
+        return input(message)
+
+    async def __text_move(self, game_state, top_card, possible_plays):
+        """
+        Function used to get move of player typed as a text, after showing information from gui function.
+        Request after jack or ace is not part of typed move, player is asked about it after validation.
+        :param game_state: GameState object with all information about state of game
+        :param top_card: tuple with card on top of a table
+        :param possible_plays: list of cards possible to be played
+        :return: Move object
+        """
+        message = await self.gui_foo(game_state, top_card, possible_plays)
+        played = await self.input_foo(message)
+        return parse_move(played)
 
     async def __gui_builder(self, game_state, top_card, possible_plays):
         """
@@ -44,7 +82,7 @@ class Player:
         gui += f'\n---------------------------Table-----------------------------' \
                f'\nCards in deck: {len(gs.deck)}' \
                f'\nCards on table: {len(gs.table)}' \
-               f'\nOn top: {top_card[0]} {top_card[1]}' \
+               f'\nOn top: {card_text(top_card)}' \
                f'\n---------------------------Hand------------------------------'
 
         gui += f'\n{self.sort_cards_and_mark_possible_plays(possible_plays)}' \
@@ -59,15 +97,14 @@ class Player:
         :param possible_plays: list of cards possible to be played
         :return: string with information about players hand
         """
-        value_dict = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
-                      '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
         cards = ''
-        self.hand.sort(key=lambda play: value_dict[play[1]])
+        playable = set(possible_plays)
+        self.hand.sort(key=lambda play: card_data(play).rank)
         for index, card in enumerate(self.hand):
-            if card in possible_plays:
-                cards += f'*{card[0]} {card[1]}*'
+            if card in playable:
+                cards += card_data(card).marked
             else:
-                cards += f'{card[0]} {card[1]}'
+                cards += card_text(card)
             if index < len(self.hand) - 1:
                 cards += ', '
             if index % 5 == 4 and index != len(self.hand) - 1:
@@ -0,0 +1,61 @@
+import pytest
+import macau_batch
+import tests.common as common
+from logic.batch import BatchConfig, BatchStats, GameResult, play_batch_game, run_batch
+from tests.common import dumper_factory
+
+
+def test_play_batch_game_repeatable():
+    config = BatchConfig(('cpu', 'random', 'cpu'), 5)
+    result = play_batch_game(config, 7)
+    assert result == play_batch_game(config, 7)
+    assert result.seed == 7
+    assert len(result.winners) > 0
+    assert result.rounds > 0
+
+
+def test_play_batch_game_round_limit():
+    result = play_batch_game(BatchConfig(('cpu', 'cpu'), 20, 1), 0)
+    assert result == GameResult(0, (), 1)
+
+
+def test_run_batch_same_in_workers():
+    config = BatchConfig(('cpu', 'random'), 4)
+    inline = list(run_batch(config, 30, first_seed=100, workers=1, chunk_size=7))
+    pooled = list(run_batch(config, 30, first_seed=100, workers=2, chunk_size=7))
+    assert sorted(result.seed for result in inline) == list(range(100, 130))
+    assert sorted(inline) == sorted(pooled)
+
+
+def test_run_batch_unknown_strategy():
+    with pytest.raises(ValueError):
+        list(run_batch(BatchConfig(('cpu', 'smart')), 1, workers=1))
+
+
+def test_batch_stats():
+    stats = BatchStats(BatchConfig(('cpu', 'random', 'cpu')))
+    for result in [GameResult(0, (0,), 10), GameResult(1, (1,), 20), GameResult(2, (0, 2), 30),
+                   GameResult(3, (), 40)]:
+        stats.add(result)
+    assert stats.games == 4
+    assert stats.unfinished == 1
+    assert stats.seat_win_rates() == [0.5, 0.25, 0.25]
+    assert stats.strategy_win_rates() == {'cpu': 0.375, 'random': 0.25}
+    assert stats.length_percentiles((25, 50, 100)) == {25: 10, 50: 20, 100: 40}
+    report = stats.report()
+    assert report[1] == 'Seat 0 (cpu): 50.0% won'
+    assert report[-1] == 'Rounds: mean=25.0, p10=10, p50=20, p90=40, p99=40, max=40'
+
+
+def test_macau_batch_main():
+    stats = macau_batch.main(['cpu', 'random', '-g', '12', '-w', '1', '--chunk', '4', '--progress'],
+                             print_foo=dumper_factory())
+    assert stats.games == 12
+    assert common.outputs[0].startswith('Games: 4, ')
+    assert common.outputs[3].startswith('Games: 12, ')
+    assert common.outputs[4] == f'Seat 0 (cpu): {stats.seat_win_rates()[0]:.1%} won'
+
+
+def test_macau_batch_too_few_players():
+    with pytest.raises(Exception, match='Wrong number of players entered!'):
+        macau_batch.main(['cpu', '-g', '1', '-w', '1'])
@@ -0,0 +1,96 @@
+import pickle
+import pytest
+import logic.codec as codec
+import logic.game as game
+import logic.headless as headless
+from logic.move import Move
+from player.cpu_player import CPUPlayer
+
+
+def first_possible_play(_game_state, _top_card, possible_plays):
+    return Move(possible_plays[:1])
+
+
+def prepare_played_game(seed, how_many_players=4, how_many_decks=2, how_many_cards=7, rounds=5):
+    gs = game.GameState(seed)
+    names = [f'CPU{index}' for index in range(how_many_players - 1)] + ['John']
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+    gs.players['John'].decide_foo = first_possible_play
+    for _ in range(rounds):
+        gs = headless.play_round(gs)
+    return gs
+
+
+def snapshot(gs):
+    players = [(type(player), name, player.turns_to_skip, list(player.hand)) for name, player in gs.players.items()]
+    return (gs.seed, list(gs.deck), list(gs.table), gs.lied_card, gs.cards_to_take, gs.turns_to_wait,
+            gs.requested_value_rounds, gs.requested_value, gs.requested_color, players,
+            gs.ranking, gs.finished, gs.standings)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 3])
+def test_round_trip(seed):
+    gs = prepare_played_game(seed)
+    data = codec.encode(gs)
+    decoded = codec.decode(data)
+    assert snapshot(decoded) == snapshot(gs)
+    assert codec.encode(decoded) == data
+
+
+@pytest.mark.parametrize('seed', [None, -1, 2 ** 70, 'tournament'])
+def test_round_trip_of_seeds(seed):
+    gs = game.GameState(seed)
+    gs.players = {}
+    assert codec.decode(codec.encode(gs)).seed == seed
+
+
+def test_round_trip_of_finished_game():
+    gs = prepare_played_game(4, rounds=0)
+    gs.ranking = game.rank_by_cards
+    gs.players['CPU1'].hand = []
+    gs = game.finish_player(gs.players['CPU1'], gs)
+    gs.requested_value, gs.requested_color, gs.turns_to_wait = '7', 'tiles', 3
+    decoded = codec.decode(codec.encode(gs))
+    assert snapshot(decoded) == snapshot(gs)
+    assert decoded.standings[0] == 'CPU1'
+
+
+def test_decoded_game_continues_the_same():
+    gs = prepare_played_game(5)
+    decoded = codec.decode(codec.encode(gs, with_rng=True))
+    decoded.players['John'].decide_foo = first_possible_play
+    assert headless.play_game(decoded) == headless.play_game(gs)
+    assert snapshot(decoded) == snapshot(gs)
+
+
+def test_decoded_game_without_rng_is_playable():
+    gs = prepare_played_game(6)
+    decoded = codec.decode(codec.encode(gs))
+    assert type(decoded.players['CPU0']) is CPUPlayer
+    decoded.players['John'].decide_foo = first_possible_play
+    assert len(headless.play_game(decoded)) == 1
+
+
+def test_secure_game_round_trip():
+    gs = game.GameState(secure=True)
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'CPU'], rng=gs.rng)
+    decoded = codec.decode(codec.encode(gs, with_rng=True))
+    assert type(decoded.rng) is type(gs.rng)
+    assert type(decoded.players['CPU'].rng) is type(gs.rng)
+
+
+def test_snapshot_of_big_game_is_small():
+    gs = prepare_played_game(7, how_many_players=10, how_many_decks=8, how_many_cards=20, rounds=3)
+    data = codec.encode(gs)
+    assert len(data) < 600
+    assert len(data) * 2 < len(pickle.dumps(snapshot(gs)))
+
+
+def test_decode_wrong_data():
+    data = codec.encode(prepare_played_game(8, rounds=0))
+    with pytest.raises(ValueError):
+        codec.decode(b'XX' + data[2:])
+    with pytest.raises(ValueError):
+        codec.decode(data[:2] + bytes([codec.version + 1]) + data[3:])
+    with pytest.raises(ValueError):
+        codec.write_varint(bytearray(), -1)
@@ -1,18 +1,19 @@
 import logic.game as game
 import pytest
 from player.cpu_player import CPUPlayer
+from logic.rng import create_rng
 
 
 @pytest.fixture
 def gs_cpu():
     gs = game.GameState()
-    cpu = CPUPlayer('cpu')
+    cpu = CPUPlayer('cpu', create_rng())
     gs.players['cpu'] = cpu
     return gs
 
 
 def test_cpu_player_init():
-    cpu = CPUPlayer('cpu')
+    cpu = CPUPlayer('cpu', create_rng())
     assert cpu.next_moves == []
     assert cpu.move_counter == -1
     assert cpu.name == 'cpu'
@@ -51,7 +52,7 @@ async def test_cpu_no_possible_move(gs_cpu):
     ('tiles', 'J'), ('hearts', 'K'),
 ])
 async def test_cpu_need_of_offensive_play(special, gs_cpu):
-    gs_cpu.players['other'] = CPUPlayer('other')
+    gs_cpu.players['other'] = CPUPlayer('other', create_rng())
     gs_cpu.players['other'].hand = [('tiles', '6'), ('hearts', '5')]
     cpu = gs_cpu.players['cpu']
     cpu.hand = [('tiles', '5'), ('tiles', '6'), ('tiles', '7'), ('tiles', '8'),
@@ -226,7 +227,7 @@ async def test_cpu_input_with_packs(gs_cpu):
 
 
 def test_cpu_consider_pack_play_logic():
-    cpu = CPUPlayer('cpu')
+    cpu = CPUPlayer('cpu', create_rng())
     possible = [('tiles', '7')]
     cpu.next_moves = [('tiles', '7')]
     cpu.hand = [('tiles', '7'), ('hearts', '7'), ('pikes', '7')]
@@ -282,7 +283,7 @@ def test_cpu_consider_pack_play_logic():
 
 def test_cpu_need_to_attack_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['CPU1', '2', '3', 'CPU4'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['CPU1', '2', '3', 'CPU4'], rng=gs.rng)
     cpu = gs.players['CPU1']
     assert not cpu.need_to_attack(gs)
 
@@ -301,7 +302,7 @@ def test_cpu_need_to_attack_logic():
     gs.players['3'].hand = [('clovers', '9')]
     assert cpu.need_to_attack(gs)
 
-    gs.deck, gs.table, gs.players = game.prepare_game(['CPU1', '2', '3', 'CPU4'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['CPU1', '2', '3', 'CPU4'], rng=gs.rng)
     cpu = gs.players['CPU4']
     assert not cpu.need_to_attack(gs)
 
@@ -323,7 +324,7 @@ def test_cpu_need_to_attack_logic():
 
 def test_choose_first_move():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['CPU1', '2'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['CPU1', '2'], rng=gs.rng)
     cpu = gs.players['CPU1']
     rival = gs.players['2']
     cpu.choose_first_move(gs, [])
@@ -345,7 +346,7 @@ def test_choose_first_move():
 
 
 def test_find_biggest_color():
-    cpu = CPUPlayer('1')
+    cpu = CPUPlayer('1', create_rng())
     cpu.next_moves.append(('hearts', 'A'))
     cpu.hand = [('hearts', '6'), ('hearts', '7'), ('clovers', 'J'), ('hearts', 'A')]
     biggest, appearances = cpu.find_biggest('color')
@@ -369,8 +370,20 @@ def test_find_biggest_color():
     assert biggest == 'hearts'
 
 
+def test_find_biggest_ties_follow_hand_order():
+    cpu = CPUPlayer('1', create_rng())
+    cpu.next_moves = ['']
+    cpu.hand = [('hearts', '6'), ('tiles', '7')]
+    cpu.hand.remove(('hearts', '6'))
+    cpu.hand += [('clovers', '8'), ('hearts', '9')]
+    assert cpu.find_biggest('color') == ('tiles', 1)
+    cpu.hand.remove(('tiles', '7'))
+    assert cpu.find_biggest('color') == ('clovers', 1)
+    assert cpu.find_biggest('value') == ('8', 1)
+
+
 def test_find_biggest_value():
-    cpu = CPUPlayer('1')
+    cpu = CPUPlayer('1', create_rng())
     cpu.next_moves = [('clovers', 'J')]
     cpu.hand = [('hearts', '6'), ('pikes', '6'), ('clovers', 'J'), ('tiles', '6')]
     biggest, appearances = cpu.find_biggest('value')
@@ -404,7 +417,7 @@ def test_find_biggest_value():
 
 
 def test_cpu_evaluate_jack_request():
-    cpu = CPUPlayer('1')
+    cpu = CPUPlayer('1', create_rng())
     cpu.next_moves = [('clovers', 'J')]
     cpu.hand = [('hearts', '6'), ('pikes', '6'), ('clovers', 'J'), ('tiles', '6')]
     assert cpu.evaluate_jack_request() == '6'
@@ -415,3 +428,16 @@ def test_cpu_evaluate_jack_request():
 
     cpu.hand = [('hearts', 'K'), ('pikes', 'K'), ('clovers', 'J'), ('tiles', 'K')]
     assert cpu.evaluate_jack_request() == ''
+
+
+def test_cpu_need_to_attack_in_many_seats():
+    gs = game.GameState()
+    names = [f'CPU{index}' for index in range(40)]
+    gs.deck, gs.table, gs.players = game.prepare_game(names, 10, 5, rng=gs.rng)
+    cpu = gs.players['CPU38']
+    assert not cpu.need_to_attack(gs)
+    gs.players['CPU0'].hand = [('pikes', '2')]
+    assert cpu.need_to_attack(gs)
+    gs.players['CPU37'].hand = [('pikes', '3')]
+    assert gs.players['CPU35'].need_to_attack(gs)
+    assert not gs.players['CPU34'].need_to_attack(gs)
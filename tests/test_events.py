@@ -0,0 +1,77 @@
+import pytest
+import logic.events as events
+import logic.game as game
+import logic.headless as headless
+import logic.logic as rules
+from player.player import Player
+from logic.rng import create_rng
+
+
+@pytest.mark.parametrize('event, lines', [
+    (events.TurnStarted('John'), ['John move now.']),
+    (events.TurnEnded('John', 3), ['John has 3 cards on hand.']),
+    (events.TurnSkipped('John', 2), ['John waits. 2 turns to skip left.']),
+    (events.NoMove('John'), ['John has no move.']),
+    (events.InvalidMove('John', [None]), [' is invalid. John makes invalid move.']),
+    (events.CardsPlayed('John', [('hearts', '5'), ('tiles', '5'), ('pikes', '5')]),
+     ['John plays: hearts 5, tiles 5, pikes 5.']),
+    (events.RequestMade('John', 'tiles'), ['John plays: tiles.']),
+    (events.DeckRefilled('John'), ['Not enough cards in the deck. Grabbing from the table.']),
+    (events.CardsTaken('John', 0, 1, 6),
+     ['John will have to take a card.', '1 cards dealt to John. | on hand: 6 cards.']),
+    (events.CardsTaken('John', 5, 5, 8),
+     ['John will have to take 5 cards.', '5 cards dealt to John. | on hand: 8 cards.']),
+    (events.TurnsPunished('John', 3), ['John will have to skip this and next 3 turns.']),
+    (events.Macau('John'), ['John has macau!']),
+    (events.MoveTimedOut('John'), ['John ran out of time.']),
+    (events.GameTimedOut(), ['Time for game is over.']),
+    (events.GameWon(['John', 'Tony']), ['Game won by John, Tony']),
+])
+def test_event_lines(event, lines):
+    assert event.lines() == lines
+
+
+def test_compact_event():
+    assert events.compact(events.TurnEnded('John', 3)) == {'event': 'TurnEnded', 'player': 'John', 'cards_on_hand': 3}
+    assert events.compact(events.GameWon(['John'])) == {'event': 'GameWon', 'winners': ['John']}
+    assert events.compact(events.GameTimedOut()) == {'event': 'GameTimedOut'}
+
+
+def test_print_sink():
+    gs = game.GameState()
+    outputs = {'John': [], 'Tony': []}
+    gs.players = {name: Player(name) for name in outputs}
+    for name, player in gs.players.items():
+        player.print_foo = outputs[name].append
+    gs.sinks.append(events.print_sink)
+    gs.emit(events.NoMove('Tony'))
+    gs.emit(events.GameWon(['John']))
+    assert outputs == {'John': ['Game won by John'], 'Tony': ['Tony has no move.', 'Game won by John']}
+
+
+def test_punishment_events():
+    emitted = []
+    player = Player('John')
+    player.hand = [('hearts', '5')]
+    deck, table = [('tiles', '7')], [('clovers', '8'), ('pikes', '9')]
+    rules.take_cards_punishment(player, deck, table, ('hearts', '2'), 2, rng=create_rng(0), emit=emitted.append)
+    assert emitted == [events.DeckRefilled('John'), events.CardsTaken('John', 2, 2, 3)]
+
+    emitted.clear()
+    rules.skip_punishment(player, table, ('hearts', '4'), 3, emitted.append)
+    assert emitted == [events.TurnsPunished('John', 2)]
+
+
+def test_headless_game_events():
+    gs = game.GameState(4)
+    names = [f'CPU{index}' for index in range(3)]
+    gs.deck, gs.table, gs.players = game.prepare_game(names, 1, 5, rng=gs.rng)
+    for player in gs.players.values():
+        player.print_foo = None
+    collected = []
+    gs.sinks.append(events.list_sink(collected))
+    winners = headless.play_game(gs)
+    assert collected[0] == {'event': 'TurnStarted', 'player': 'CPU0'}
+    assert collected[-1] == {'event': 'GameWon', 'winners': winners}
+    assert {'event': 'Macau', 'player': winners[0]} in collected
+    assert gs.clone().sinks == []
@@ -1,30 +1,36 @@
+import asyncio
 import logic.game as game
+import logic.events as events
 import pytest
 from copy import deepcopy
+from timeit import timeit
+import logic.headless as headless
 from logic.logic import values, colors
 from player.player import Player
 from player.cpu_player import CPUPlayer
+from logic.rng import create_rng
+from logic.move import Move, parse_move
 from tests.common import helper_factory_async, dumper_factory
 
 
 @pytest.fixture
 def game_state():
     gs = game.GameState()
-    gs.output_foo = dumper_factory()
+    dumper_factory()
     gs.players = {'One': Player('One')}
     gs.deck = [(color, value) for value in values for color in colors]
     return gs
 
 
 def test_prepare_game():
-    deck, table, players = game.prepare_game(['One', 'Two'])
+    deck, table, players = game.prepare_game(['One', 'Two'], rng=create_rng())
     assert len(table) > 0
     assert len(deck) <= 41
     assert len(players) == 2
     assert len(players['One'].hand) == 5
     assert len(players['Two'].hand) == 5
 
-    deck, table, players = game.prepare_game(['One', 'Two', 'Three'])
+    deck, table, players = game.prepare_game(['One', 'Two', 'Three'], rng=create_rng())
     assert len(table) > 0
     assert len(deck) <= 36
     assert len(players) == 3
@@ -32,14 +38,14 @@ def test_prepare_game():
     assert len(players['Two'].hand) == 5
     assert len(players['Three'].hand) == 5
 
-    deck, table, players = game.prepare_game([])
+    deck, table, players = game.prepare_game([], rng=create_rng())
     assert len(table) > 0
     assert len(deck) <= 51
     assert len(players) == 0
 
 
 def test_prepare_game_with_cpus():
-    deck, table, players = game.prepare_game(['One', 'CPU_Two', 'Three_CPU', 'CPU'])
+    deck, table, players = game.prepare_game(['One', 'CPU_Two', 'Three_CPU', 'CPU'], rng=create_rng())
     cpus = 0
     for player in players.values():
         if type(player) is CPUPlayer:
@@ -49,13 +55,13 @@ def test_prepare_game_with_cpus():
 
 @pytest.mark.parametrize('how_many_decks', [2, 3, 5])
 def test_prepare_game_with_more_decks(how_many_decks):
-    deck, table, players = game.prepare_game(['One'], how_many_decks)
+    deck, table, players = game.prepare_game(['One'], how_many_decks, rng=create_rng())
     all_cards = len(deck) + len(table) + 5
     assert all_cards == 52 * how_many_decks
 
 
 def test_prepare_game_with_no_decks():
-    deck, table, players = game.prepare_game(['One'], 0)
+    deck, table, players = game.prepare_game(['One'], 0, rng=create_rng())
     assert len(deck) == 0
     assert len(table) == 0
     assert len(players['One'].hand) == 0
@@ -63,13 +69,13 @@ def test_prepare_game_with_no_decks():
 
 @pytest.mark.parametrize('how_many_cards', [2, 5, 15, 20])
 def test_prepare_game_with_more_dealt_cards(how_many_cards):
-    deck, table, players = game.prepare_game(['One'], how_many_cards=how_many_cards)
+    deck, table, players = game.prepare_game(['One'], how_many_cards=how_many_cards, rng=create_rng())
     player = players['One']
     assert len(player.hand) == how_many_cards
 
 
 def test_prepare_game_with_more_cards_to_deal_than_in_deck():
-    deck, table, players = game.prepare_game(['One'], how_many_cards=60)
+    deck, table, players = game.prepare_game(['One'], how_many_cards=60, rng=create_rng())
     player = players['One']
     assert len(player.hand) == 52 - len(table)
 
@@ -310,7 +316,7 @@ async def test_play_move_jack_requests(game_state):
 @pytest.mark.asyncio
 async def test_play_round_no_move_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     deck_len = len(gs.deck)
     assert len(gs.players['One'].hand) == 5
     assert len(gs.players['Two'].hand) == 5
@@ -318,7 +324,7 @@ async def test_play_round_no_move_logic():
     input_list += input_list
     for player in gs.players.values():
         player.input_foo = helper_factory_async(input_list)
-    gs.output_foo = dumper_factory()
+    dumper_factory()
     await game.play_round(gs)
     assert len(gs.players['One'].hand) == 6
     assert len(gs.players['Two'].hand) == 6
@@ -486,7 +492,7 @@ async def test_forbidden_play_move_pack_kings(game_state):
 @pytest.mark.asyncio
 async def test_play_round_mundane_moves_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     deck_len = len(gs.deck)
     gs.table = [('hearts', 'K')]
     gs.players['One'].hand = [('hearts', '5'), ('pikes', '8'), ('tiles', '6')]
@@ -511,19 +517,19 @@ async def test_play_round_mundane_moves_logic():
     assert gs.lied_card == ('tiles', '8')
     gs = await game.play_round(gs)
     assert len(gs.players['One'].hand) == 0
-    assert len(gs.players['Two'].hand) == 0
+    assert len(gs.players['Two'].hand) == 1
+    assert gs.standings == ['One']
     assert len(gs.deck) == deck_len
-    assert len(gs.table) == 6
-    assert ('tiles', '6') in gs.table
-    assert gs.lied_card == ('tiles', '9')
+    assert len(gs.table) == 5
+    assert gs.lied_card == ('tiles', '6')
 
 
 @pytest.mark.asyncio
 async def test_play_round_take_cards_attack_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     deck_len = len(gs.deck)
-    gs.players['One'].hand = [('hearts', 'K')]
+    gs.players['One'].hand = [('hearts', 'K'), ('clovers', '3')]
     gs.players['One'].print_foo = dumper_factory()
     gs.players['Two'].hand = [('tiles', '6')]
     gs.players['Two'].print_foo = dumper_factory()
@@ -531,7 +537,7 @@ async def test_play_round_take_cards_attack_logic():
     gs.players['One'].input_foo = helper_factory_async(['hearts K'])
     saved_gs = deepcopy(gs)
     gs = await game.play_round(gs)
-    assert len(gs.players['One'].hand) == 0
+    assert len(gs.players['One'].hand) == 1
     assert len(gs.players['Two'].hand) == 6
     assert len(gs.deck) == deck_len - 5
 
@@ -556,7 +562,7 @@ async def test_play_round_take_cards_attack_logic():
 @pytest.mark.asyncio
 async def test_play_round_take_cards_attack_most_cards_on_table():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     gs.table = gs.table + gs.deck[:20]
     [gs.deck.remove(card) for card in gs.table if card in gs.deck]
     deck_len = len(gs.deck)
@@ -566,7 +572,7 @@ async def test_play_round_take_cards_attack_most_cards_on_table():
     gs.players['Two'].hand = [('tiles', '6')]
     gs.table.append(('hearts', '5'))
     gs.cards_to_take = 20
-    gs.output_foo = dumper_factory()
+    dumper_factory()
     gs = await game.play_round(gs)
     assert len(gs.players['One'].hand) == 5
     assert len(gs.players['Two'].hand) == 26
@@ -580,7 +586,7 @@ async def test_play_round_take_cards_attack_most_cards_on_table():
 @pytest.mark.asyncio
 async def test_play_round_pikes_king_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     deck_len = len(gs.deck)
     gs.players['One'].hand = [('pikes', 'K'), ('tiles', '5')]
     gs.players['One'].print_foo = dumper_factory()
@@ -630,7 +636,7 @@ async def test_play_round_pikes_king_logic():
 @pytest.mark.asyncio
 async def test_play_round_ace_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     deck_len = len(gs.deck)
     gs.players['One'].hand = [('clovers', 'A'), ('tiles', '5')]
     gs.players['One'].print_foo = dumper_factory()
@@ -648,10 +654,11 @@ async def test_play_round_ace_logic():
     assert gs.lied_card == ('clovers', 'A')
     assert len(gs.table) == 1
 
+    gs.players['One'].hand.append(('hearts', '3'))
     gs = await game.play_round(gs)
     assert gs.requested_color is None
     assert len(gs.deck) == deck_len - 1
-    assert len(gs.players['One'].hand) == 0
+    assert len(gs.players['One'].hand) == 1
     assert len(gs.players['Two'].hand) == 2
     assert gs.lied_card == ('clovers', '5')
     assert len(gs.table) == 3
@@ -688,7 +695,7 @@ async def test_play_round_ace_logic():
 @pytest.mark.asyncio
 async def test_play_round_jack_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     deck_len = len(gs.deck)
     gs.players['One'].hand = [('clovers', 'J'), ('tiles', '5')]
     gs.players['One'].print_foo = dumper_factory()
@@ -706,11 +713,12 @@ async def test_play_round_jack_logic():
     assert len(gs.players['Two'].hand) == 3
     assert gs.lied_card == ('clovers', 'J')
     assert len(gs.table) == 1
+    gs.players['One'].hand.append(('hearts', '3'))
     gs = await game.play_round(gs)
     assert gs.requested_value is None
     assert gs.requested_value_rounds == 0
     assert len(gs.deck) == deck_len - 1
-    assert len(gs.players['One'].hand) == 0
+    assert len(gs.players['One'].hand) == 1
     assert len(gs.players['Two'].hand) == 2
     assert gs.lied_card == ('tiles', '6')
     assert len(gs.table) == 3
@@ -748,7 +756,7 @@ async def test_play_round_jack_logic():
 @pytest.mark.asyncio
 async def test_play_round_skip_turns_logic():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['One', 'Two'], rng=gs.rng)
     deck_len = len(gs.deck)
     gs.players['One'].hand = [('pikes', '4'), ('tiles', '5')]
     gs.players['One'].print_foo = dumper_factory()
@@ -811,7 +819,7 @@ async def test_play_round_skip_turns_logic():
 def test_pikes_king_punishment(how_many_players, who_played_pikes_king):
     gs = game.GameState()
     players_name_list = [str(number) for number in range(1, how_many_players+1)]
-    gs.deck, gs.table, gs.players = game.prepare_game(players_name_list)
+    gs.deck, gs.table, gs.players = game.prepare_game(players_name_list, rng=gs.rng)
     who_will_be_punished = (who_played_pikes_king - 1)
     if who_will_be_punished == 0:
         who_will_be_punished = how_many_players
@@ -834,7 +842,7 @@ def test_pikes_king_punishment(how_many_players, who_played_pikes_king):
 def test_pikes_king_punishment_with_skip_turn():
     gs = game.GameState()
     players_name_list = [str(number) for number in range(1, 5)]
-    gs.deck, gs.table, gs.players = game.prepare_game(players_name_list)
+    gs.deck, gs.table, gs.players = game.prepare_game(players_name_list, rng=gs.rng)
     gs.deck = gs.table + gs.deck
     gs.table = []
     gs.lied_card = ('pikes', 'K')
@@ -868,14 +876,14 @@ def test_pikes_king_punishment_with_skip_turn():
 def test_validate_move():
     gs = game.GameState()
     names = ['1', '2']
-    gs.deck, gs.table, gs.players = game.prepare_game(names)
+    gs.deck, gs.table, gs.players = game.prepare_game(names, rng=gs.rng)
     gs.table = [('tiles', '7')]
     gs.players['1'].hand = [('clovers', '7'), ('tiles', '7'), ('pikes', '7')]
-    valid, _ = game.validate_move(gs.players['1'].hand, gs, 'tiles 7, tiles 7, pikes 7')
-    assert not valid
-
-    valid, _ = game.validate_move(gs.players['1'].hand, gs, 'tiles 7, clovers 7, pikes 7')
-    assert valid
+    assert not game.validate_move(gs.players['1'].hand, gs, parse_move('tiles 7, tiles 7, pikes 7'))
+    assert game.validate_move(gs.players['1'].hand, gs, parse_move('tiles 7, clovers 7, pikes 7'))
+    assert not game.validate_move(gs.players['1'].hand, gs, parse_move('tiles 7, clovers 7'))
+    assert not game.validate_move(gs.players['1'].hand, gs, parse_move('tiles 8'))
+    assert game.validate_move(gs.players['1'].hand, gs, Move([('tiles', '7')]))
 
 
 @pytest.mark.asyncio
@@ -901,20 +909,207 @@ async def test_play_game_logic(game_state):
     gs.players['2'].hand = [('pikes', '5'), ('tiles', '7')]
     gs.players['2'].input_foo = helper_factory_async(['tiles 7', 'pikes 5'], 1)
     winners = await game.play_game(gs)
-    assert len(gs.table) == 4
-    assert gs.lied_card == ('pikes', '5')
-    assert len(winners) == 2
-    assert '1' in winners
-    assert '2' in winners
+    assert len(gs.table) == 3
+    assert gs.lied_card == ('tiles', '5')
+    assert winners == ['1']
+    assert len(gs.players['2'].hand) == 1
+    assert gs.standings == ['1']
+
+
+def answers_factory(lines):
+    answers = iter(lines)
+
+    async def answer(_message):
+        return next(answers)
+    return answer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('ranking, standings', [(game.stop_on_first, ['2']),
+                                                (game.rank_by_cards, ['2', '3', '1']),
+                                                (game.play_out, ['2', '3', '1'])])
+async def test_play_game_rankings(game_state, ranking, standings):
+    gs = game_state
+    gs.ranking = ranking
+    gs.players = {'1': Player('1'), '2': Player('2'), '3': Player('3')}
+    for player in gs.players.values():
+        player.print_foo = dumper_factory()
+    gs.players['1'].hand = [('hearts', '8'), ('hearts', '10'), ('clovers', '10'), ('clovers', '3')]
+    gs.players['1'].input_foo = answers_factory(['hearts 8', 'hearts 10'])
+    gs.players['2'].hand = [('hearts', '9')]
+    gs.players['2'].input_foo = answers_factory(['hearts 9'])
+    gs.players['3'].hand = [('hearts', '6'), ('hearts', '7')]
+    gs.players['3'].input_foo = answers_factory(['hearts 6', 'hearts 7'])
+    gs.table = [('hearts', '5')]
+    winners = await game.play_game(gs)
+    assert winners == ['2']
+    assert gs.standings == standings
+    assert len(gs.players['3'].hand) == (0 if ranking is game.play_out else 2)
 
 
 @pytest.mark.asyncio
 async def test_cpu_self_game():
     game_state = game.GameState()
     names = [f'CPU{index}' for index in range(1, 18)]
-    game_state.deck, game_state.table, game_state.players = game.prepare_game(names, 20, 50)
+    game_state.deck, game_state.table, game_state.players = game.prepare_game(names, 20, 50, rng=game_state.rng)
     for player in game_state.players.values():
         player.print_foo = dumper_factory()
     winners = await game.play_game(game_state)
     assert len(winners) > 0
     assert len(game_state.players[winners[0]].hand) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('seed', [0, 7, 2021])
+async def test_same_seed_same_game(seed):
+    transcripts = []
+    for _ in range(2):
+        game_state = game.GameState(seed)
+        names = [f'CPU{index}' for index in range(1, 5)]
+        game_state.deck, game_state.table, game_state.players = \
+            game.prepare_game(names, 2, 7, rng=game_state.rng)
+        transcript = [list(game_state.deck), list(game_state.table)]
+        game_state.sinks.append(events.print_sink)
+        for player in game_state.players.values():
+            player.print_foo = transcript.append
+        winners = await game.play_game(game_state)
+        assert transcript[-1] == f'Game won by {", ".join(winners)}'
+        transcripts.append((winners, transcript))
+    assert transcripts[0] == transcripts[1]
+
+
+def test_secure_game_state():
+    gs = game.GameState(secure=True)
+    deck, table, players = game.prepare_game(['One', 'CPU'], rng=gs.rng)
+    assert len(deck) + len(table) + 10 == 52
+    assert type(players['CPU'].rng) is type(gs.rng)
+
+
+def prepare_cpu_game_state(seed):
+    gs = game.GameState(seed)
+    names = [f'CPU{index}' for index in range(1, 5)]
+    gs.deck, gs.table, gs.players = game.prepare_game(names, 2, 7, rng=gs.rng)
+    return gs
+
+
+def test_game_state_has_fixed_attributes():
+    gs = game.GameState()
+    with pytest.raises(AttributeError):
+        gs.unknown_attribute = 0
+
+
+def test_clone_is_independent():
+    gs = prepare_cpu_game_state(5)
+    gs.lied_card, gs.cards_to_take, gs.requested_color = ('hearts', 'A'), 2, 'tiles'
+    cloned = gs.clone()
+    assert cloned.lied_card == gs.lied_card
+    assert (cloned.cards_to_take, cloned.requested_color) == (2, 'tiles')
+    assert list(cloned.deck) == list(gs.deck) and cloned.deck is not gs.deck
+    assert list(cloned.table) == list(gs.table) and cloned.table is not gs.table
+    for name, player in gs.players.items():
+        copied = cloned.players[name]
+        assert copied is not player
+        assert copied.hand == player.hand and copied.hand is not player.hand
+        assert copied.move_foo.__self__ is copied
+        assert copied.decide_foo.__self__ is copied
+    cloned.deck.pop()
+    cloned.players['CPU1'].hand.pop()
+    assert len(cloned.deck) == len(gs.deck) - 1
+    assert len(cloned.players['CPU1'].hand) == len(gs.players['CPU1'].hand) - 1
+
+
+def test_clone_plays_the_same_game():
+    gs = prepare_cpu_game_state(8)
+    cloned = gs.clone()
+    assert headless.play_game(cloned) == headless.play_game(gs)
+    assert list(cloned.deck) == list(gs.deck)
+    assert list(cloned.table) == list(gs.table)
+
+
+def test_clone_faster_than_deepcopy():
+    gs = prepare_cpu_game_state(13)
+    clone_time = timeit(gs.clone, number=200)
+    deepcopy_time = timeit(lambda: deepcopy(gs), number=200)
+    assert clone_time * 5 < deepcopy_time
+
+
+async def never_decide(_message):
+    await asyncio.sleep(3600)
+
+
+def prepare_timed_game(fallback, move_timeout=0.01):
+    gs = game.GameState(0)
+    gs.players = {name: Player(name) for name in ['One', 'Two']}
+    gs.players['One'].hand = [('hearts', '5'), ('tiles', '9')]
+    gs.players['Two'].hand = [('hearts', '6'), ('clovers', '7'), ('clovers', '8')]
+    gs.deck = [('clovers', '2'), ('hearts', '3'), ('tiles', '4')]
+    gs.table = [('hearts', '10')]
+    for player in gs.players.values():
+        player.print_foo = dumper_factory()
+        player.input_foo = never_decide
+    gs.move_timeout = move_timeout
+    gs.timeout_fallback = fallback
+    collected = []
+    gs.sinks.append(events.list_sink(collected))
+    return gs, collected
+
+
+@pytest.mark.asyncio
+async def test_play_move_timeout_fallbacks():
+    gs, collected = prepare_timed_game(game.draw_on_timeout)
+    _, gs = await game.play_move(gs.players['One'], gs)
+    assert gs.players['One'].hand == [('hearts', '5'), ('tiles', '9'), ('tiles', '4')]
+    assert collected == [{'event': 'MoveTimedOut', 'player': 'One'},
+                         {'event': 'CardsTaken', 'player': 'One', 'cards_to_take': 0, 'taken': 1, 'cards_on_hand': 3}]
+
+    gs, collected = prepare_timed_game(game.play_cpu_on_timeout)
+    rng_state = gs.rng.getstate()
+    _, gs = await game.play_move(gs.players['One'], gs)
+    assert gs.players['One'].hand == [('tiles', '9')]
+    assert gs.lied_card == ('hearts', '5')
+    assert gs.rng.getstate() == rng_state
+    assert collected[0] == {'event': 'MoveTimedOut', 'player': 'One'}
+    assert collected[1] == {'event': 'CardsPlayed', 'player': 'One', 'cards': [('hearts', '5')]}
+
+    gs, collected = prepare_timed_game(game.forfeit_on_timeout)
+    gs.players['One'].hand = [('hearts', '5')]
+    winners = await game.play_game(gs)
+    assert gs.standings == ['Two', 'One']
+    assert winners == ['Two']
+    assert collected[-1] == {'event': 'GameWon', 'winners': ['Two']}
+
+
+@pytest.mark.asyncio
+async def test_request_timeout():
+    gs, collected = prepare_timed_game(game.draw_on_timeout)
+    gs.players['One'].hand = [('hearts', 'J'), ('tiles', '9')]
+    answers = ['hearts J']
+
+    async def play_jack_then_wait(message):
+        if answers:
+            return answers.pop()
+        return await never_decide(message)
+    gs.players['One'].input_foo = play_jack_then_wait
+    _, gs = await game.play_move(gs.players['One'], gs)
+    assert gs.players['One'].hand == [('tiles', '9')]
+    assert gs.lied_card == ('hearts', 'J')
+    assert gs.requested_value is None
+    assert {'event': 'MoveTimedOut', 'player': 'One'} not in collected
+
+
+@pytest.mark.asyncio
+async def test_play_game_deadline():
+    gs, collected = prepare_timed_game(game.draw_on_timeout, move_timeout=None)
+    gs.game_deadline = asyncio.get_running_loop().time() + 0.02
+    winners = await game.play_game(gs)
+    assert winners == ['One']
+    assert gs.standings == ['One', 'Two']
+    assert {'event': 'GameTimedOut'} in collected
+    assert {'event': 'MoveTimedOut', 'player': 'One'} not in collected
+    assert collected[-1] == {'event': 'GameWon', 'winners': ['One']}
+
+    gs, _ = prepare_timed_game(game.draw_on_timeout, move_timeout=None)
+    gs.game_deadline = asyncio.get_running_loop().time() - 1
+    assert await game.play_game(gs) == ['One']
+    assert gs.players['One'].hand == [('hearts', '5'), ('tiles', '9')]
+    assert gs.clone().game_deadline == gs.game_deadline
@@ -0,0 +1,82 @@
+from logic.hand import Hand
+from logic.logic import card_codes, find_possible_plays
+from player.player import Player
+from copy import copy, deepcopy
+
+
+def check_counters(hand):
+    values, colors = {}, {}
+    for card in hand:
+        values[card[1]] = values.get(card[1], 0) + 1
+        colors[card[0]] = colors.get(card[0], 0) + 1
+    assert {value: count for value, count in hand.value_counts.items() if count} == values
+    assert {color: count for color, count in hand.color_counts.items() if count} == colors
+    assert hand.mask == sum(1 << code for code in {card_codes[card] for card in hand})
+
+
+def test_hand_counters_follow_changes():
+    hand = Hand([('hearts', '5'), ('tiles', '5'), ('pikes', 'K')])
+    check_counters(hand)
+    hand.append(('clovers', '5'))
+    hand += [('hearts', '7'), ('hearts', '8')]
+    hand.extend(card for card in [('pikes', '2')])
+    hand.insert(0, ('tiles', 'A'))
+    check_counters(hand)
+    hand.remove(('hearts', '5'))
+    hand.pop()
+    hand.pop(0)
+    check_counters(hand)
+    hand[0] = ('clovers', '9')
+    hand[1:3] = [('hearts', '2'), ('hearts', '3'), ('hearts', '4')]
+    del hand[-1]
+    del hand[:1]
+    check_counters(hand)
+    hand.sort()
+    check_counters(hand)
+    hand.clear()
+    check_counters(hand)
+
+
+def test_hand_packs():
+    hand = Hand([('hearts', '5'), ('tiles', '5'), ('pikes', 'K'), ('clovers', '5')])
+    assert hand.packs() == ['5']
+    hand.remove(('tiles', '5'))
+    assert hand.packs() == []
+
+
+def test_hand_copies_keep_counters():
+    hand = Hand([('hearts', '5'), ('tiles', '5')])
+    for copied in [copy(hand), deepcopy(hand)]:
+        assert type(copied) is Hand
+        assert copied == hand
+        check_counters(copied)
+
+
+def test_player_keeps_hand():
+    player = Player('One')
+    player.hand = [('hearts', '5')]
+    player.hand += [('tiles', '5'), ('pikes', '5')]
+    assert type(player.hand) is Hand
+    assert player.hand.value_counts['5'] == 3
+
+
+def test_hand_mask_gives_same_possible_plays():
+    cards = [('hearts', '5'), ('tiles', '9'), ('pikes', 'K'), ('hearts', '5'), ('clovers', 'J')]
+    for top_card, active, requested_color, requested_value in [(('hearts', '7'), False, None, None),
+                                                               (('pikes', '2'), True, None, None),
+                                                               (('tiles', 'J'), False, None, '8'),
+                                                               (('clovers', 'A'), True, 'tiles', None)]:
+        expected = find_possible_plays(list(cards), top_card, active, requested_color, requested_value)
+        assert find_possible_plays(Hand(cards), top_card, active, requested_color, requested_value) == expected
+
+
+def test_hand_copy_keeps_counters():
+    hand = Hand([('hearts', '5'), ('tiles', '5'), ('pikes', '5')])
+    copied = hand.copy()
+    assert type(copied) is Hand
+    assert copied == hand
+    copied.remove(('tiles', '5'))
+    check_counters(copied)
+    check_counters(hand)
+    assert hand.packs() == ['5']
+    assert copied.packs() == []
@@ -0,0 +1,157 @@
+import logic.game as game
+import logic.headless as headless
+import pytest
+from logic.move import Move
+from logic.rng import create_rng
+from logic.turn import turn_context
+from player.player import Player
+
+
+def prepare_cpu_game(seed, how_many_players=4, how_many_decks=2, how_many_cards=7):
+    gs = game.GameState(seed)
+    names = [f'CPU{index}' for index in range(1, how_many_players + 1)]
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+    return gs
+
+
+def game_snapshot(gs):
+    hands = {name: list(player.hand) for name, player in gs.players.items()}
+    return hands, list(gs.deck), list(gs.table), gs.lied_card, gs.cards_to_take, gs.turns_to_wait
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3, 4, 5])
+def test_headless_cpu_game_without_printing(seed):
+    gs = prepare_cpu_game(seed)
+
+    def forbidden_print(message):
+        raise AssertionError(f'headless game printed: {message}')
+    for player in gs.players.values():
+        player.print_foo = forbidden_print
+    winners = headless.play_game(gs)
+    assert len(winners) > 0
+    for winner in winners:
+        assert len(gs.players[winner].hand) == 0
+
+
+@pytest.mark.parametrize('seed', [6, 7, 8])
+def test_headless_game_rankings(seed):
+    gs = prepare_cpu_game(seed)
+    gs.ranking = game.rank_by_cards
+    winners = headless.play_game(gs)
+    assert gs.standings[:1] == winners == gs.finished
+    assert sorted(gs.standings) == sorted(gs.players)
+    cards = [len(gs.players[name].hand) for name in gs.standings]
+    assert cards == sorted(cards)
+
+    gs = prepare_cpu_game(seed)
+    gs.ranking = game.play_out
+    winners = headless.play_game(gs)
+    assert gs.standings[:-1] == gs.finished
+    assert [name for name in gs.standings if len(gs.players[name].hand) > 0] == gs.standings[-1:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('seed', [11, 12, 13])
+async def test_headless_game_same_as_async_game(seed):
+    gs = prepare_cpu_game(seed)
+    winners = headless.play_game(gs)
+
+    async_gs = prepare_cpu_game(seed)
+    for player in async_gs.players.values():
+        player.print_foo = lambda _: None
+    assert await game.play_game(async_gs) == winners
+    assert game_snapshot(async_gs) == game_snapshot(gs)
+
+
+def test_headless_move_with_decision_callback():
+    gs = game.GameState(0)
+    player = Player('One')
+    player.hand = [('hearts', 'J'), ('tiles', 'J'), ('pikes', 'J'), ('hearts', '8')]
+    player.decide_foo = lambda _gs, _top, _plays: Move([('hearts', 'J'), ('tiles', 'J'), ('pikes', 'J')], '8')
+    gs.players = {'One': player}
+    gs.table = [('hearts', '5')]
+    player, gs = headless.play_move(player, gs)
+    assert player.hand == [('hearts', '8')]
+    assert gs.lied_card == ('pikes', 'J')
+    assert gs.requested_value == '8'
+    assert len(gs.table) == 3
+
+
+@pytest.mark.parametrize('decision', [Move([('tiles', '9')]), Move(), Move([('hearts', '6'), ('hearts', '7')])])
+def test_headless_invalid_decision_punished(decision):
+    gs = game.GameState(0)
+    player = Player('One')
+    player.hand = [('hearts', '6'), ('hearts', '7'), ('tiles', '9')]
+    player.decide_foo = lambda _gs, _top, _plays: decision
+    gs.players = {'One': player}
+    gs.deck = [('clovers', '2')]
+    gs.table = [('hearts', '5')]
+    player, gs = headless.play_move(player, gs)
+    assert len(player.hand) == 4
+    assert len(gs.deck) == 0
+
+
+def state_snapshot(gs):
+    players = {name: (list(player.hand), player.turns_to_skip) for name, player in gs.players.items()}
+    counters = (gs.lied_card, gs.cards_to_take, gs.turns_to_wait, gs.requested_value_rounds,
+                gs.requested_value, gs.requested_color)
+    return players, list(gs.deck), list(gs.table), counters, gs.rng.getstate()
+
+
+def random_move(player, gs, rng):
+    if rng.random() < 0.3 and len(player.hand) > 0:
+        return Move([rng.choice(player.hand)], rng.choice(['tiles', '7', None]))
+    context = turn_context(player.hand, gs)
+    return player.decide_foo(gs, context.top_card, context.possible_plays)
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_apply_undo_restores_state(seed):
+    gs = prepare_cpu_game(seed, how_many_players=5, how_many_decks=1, how_many_cards=8)
+    rng = create_rng(seed)
+    refills = 0
+    for _ in range(60):
+        for player in gs.players.values():
+            before, hash_before = state_snapshot(gs), gs.state_hash()
+            move = random_move(player, gs, rng)
+            token = headless.apply(gs, player, move)
+            after, hash_after = state_snapshot(gs), gs.state_hash()
+            refills += after[4] != before[4]
+            headless.undo(gs, token)
+            assert state_snapshot(gs) == before
+            assert gs.state_hash() == hash_before
+            headless.apply(gs, player, move)
+            assert state_snapshot(gs) == after
+            assert gs.state_hash() == hash_after
+        if any(len(player.hand) == 0 for player in gs.players.values()):
+            break
+    assert refills > 0
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_undo_many_turns_in_reverse_order(seed):
+    gs = prepare_cpu_game(seed, how_many_players=3, how_many_decks=1, how_many_cards=10)
+    rng = create_rng(seed)
+    start = state_snapshot(gs)
+    tokens = []
+    for _ in range(10):
+        for player in gs.players.values():
+            tokens.append(headless.apply(gs, player, random_move(player, gs, rng)))
+    for token in reversed(tokens):
+        headless.undo(gs, token)
+    assert state_snapshot(gs) == start
+
+
+def test_apply_undo_pikes_king_punishment():
+    gs = game.GameState(0)
+    gs.players = {name: Player(name) for name in ['One', 'Two', 'Three']}
+    gs.players['One'].hand = [('hearts', '5'), ('tiles', '9')]
+    gs.players['Two'].hand = [('pikes', 'K'), ('tiles', '9')]
+    gs.players['Three'].hand = [('clovers', '9')]
+    gs.deck = [('clovers', '2'), ('hearts', '3'), ('tiles', '4'), ('clovers', '6'), ('hearts', '6')]
+    gs.table = [('tiles', '5'), ('pikes', '5')]
+    before = state_snapshot(gs)
+    token = headless.apply(gs, gs.players['Two'], Move([('pikes', 'K')]))
+    assert len(gs.players['One'].hand) == 7
+    headless.undo(gs, token)
+    assert state_snapshot(gs) == before
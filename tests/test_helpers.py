@@ -1,5 +1,6 @@
 import player.helpers as helpers
 import pytest
+from logic.rng import create_rng
 
 
 def test_find_offensive_plays():
@@ -42,5 +43,5 @@ def test_find_offensive_plays():
     ([('hearts', 'Q'), ('hearts', '3'), ('tiles', 'K')], ('hearts', '3')),
 ])
 def test_find_best_attack_card(possible, chosen):
-    assert len(helpers.find_best_attack_card(possible)) == 1
-    assert helpers.find_best_attack_card(possible)[0] == chosen
+    assert len(helpers.find_best_attack_card(possible, create_rng())) == 1
+    assert helpers.find_best_attack_card(possible, create_rng())[0] == chosen
@@ -1,6 +1,7 @@
 import pytest
 import logic.logic as logic
 from player.player import Player
+from logic.rng import create_rng
 
 
 @pytest.fixture
@@ -10,7 +11,7 @@ def deck():
 
 
 def test_prepare_deck_no_param():
-    deck, _, _ = logic.prepare_deck()
+    deck, _, _ = logic.prepare_deck(rng=create_rng())
     assert len(deck) == 52
     assert type(deck[0]) == tuple
     assert type(deck[-1]) == tuple
@@ -25,7 +26,7 @@ def test_prepare_deck_no_param():
 
 @pytest.mark.parametrize('how_many', [2, 3, 4])
 def test_prepare_deck_with_more_cards(how_many):
-    deck, _, _ = logic.prepare_deck(how_many=how_many)
+    deck, _, _ = logic.prepare_deck(how_many=how_many, rng=create_rng())
     assert len(deck) == 52 * how_many
     assert type(deck[0]) == tuple
     assert type(deck[-1]) == tuple
@@ -47,7 +48,7 @@ def test_prepare_deck_with_table(deck):
     assert type(table) == list
 
     top_card = table[0]
-    deck, table, _ = logic.prepare_deck(table)
+    deck, table, _ = logic.prepare_deck(table, rng=create_rng())
     assert len(deck) == 51
     assert type(deck) == list
     assert len(table) == 1
@@ -60,7 +61,7 @@ def test_prepare_deck_with_players(deck):
     players = {'One': Player('One'), 'Two': Player("Two")}
     players['One'].hand = deck[:6]
     players['Two'].hand = deck[12:18]
-    deck, _, players = logic.prepare_deck(players=players)
+    deck, _, players = logic.prepare_deck(players=players, rng=create_rng())
     assert len(players['One'].hand) == 6
     assert len(players['Two'].hand) == 6
     assert len(deck) == 40
@@ -76,7 +77,7 @@ def test_clean_table(deck):
     assert len(table) == 30
     top_from_table = table[-1]
     top_from_deck = deck[-1]
-    deck, table = logic.clean_table(deck, table)
+    deck, table = logic.clean_table(deck, table, create_rng())
     assert len(deck) == 51
     assert len(table) == 1
     assert top_from_deck == deck[-1]
@@ -371,6 +372,38 @@ async def test_evaluate_requested_color(card, response, returned):
     assert (await logic.evaluate_requested_color(card, helper)) is returned
 
 
+def test_card_effects(deck):
+    for card in deck:
+        effect = logic.card_effect(card)
+        assert effect.active == logic.check_card_played_active(card)
+        assert effect.attack == logic.evaluate_cards_to_take(card)
+        assert effect.skip == logic.evaluate_turns_to_wait(card)
+        assert (effect.request is not None) == (card[1] in ['J', 'A'])
+        assert not (effect.attack or effect.skip or effect.request) or effect.active
+    assert logic.card_effect(['hearts', 'J']).request == 'value'
+    assert logic.card_effect(('pikes', 'A')).request == 'color'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('card, response, expected', [
+                             (('hearts', '7'), 'pikes', (1, None, None, 2)),
+                             (('hearts', '2'), 'pikes', (3, None, None, 2)),
+                             (('pikes', 'K'), '5', (6, None, None, 2)),
+                             (('hearts', '4'), '5', (1, None, None, 3)),
+                             (('hearts', 'J'), '5', (1, None, '5', 2)),
+                             (('hearts', 'A'), 'pikes', (1, 'pikes', None, 2)),
+                             (('hearts', 'A'), '5', (1, None, None, 2)),
+                         ])
+async def test_additional_actions(card, response, expected):
+    asked = []
+
+    async def helper(prompt):
+        asked.append(prompt)
+        return response
+    assert (await logic.additional_actions(card, 1, 2, helper)) == expected
+    assert len(asked) == (logic.card_effect(card).request is not None)
+
+
 @pytest.mark.parametrize('hand, pack', [
     ([('hearts', '7'), ('clovers', '7'), ('tiles', '7'), ('pikes', '7'), ('hearts', '5')], ['7']),
     ([('hearts', '7'), ('tiles', '7'), ('pikes', '7'), ('hearts', '5')], ['7']),
@@ -409,6 +442,132 @@ def test_check_if_packs_can_be_played(packs, possible_plays, possible_packs):
     (' hearts  4', ('hearts', '4')),
     ('hearts  4', ('hearts', '4')),
     ('    hearts    4', ('hearts', '4')),
+    ('hearts_5', None),
+    ('hearts_5.png', None),
                          ])
 def test_convert_to_card(entered, card):
     assert logic.convert_to_card(entered) == card
+
+
+def test_encode_decode_card(deck):
+    codes = [logic.encode_card(card) for card in deck]
+    assert codes == list(range(52))
+    assert [logic.decode_card(code) for code in codes] == deck
+    assert logic.encode_card(['hearts', '2']) == 0
+    assert logic.encode_card(('pikes', 'A'), deck_index=2) == 2 * 52 + 51
+    assert logic.decode_card(2 * 52 + 51) == ('pikes', 'A')
+
+
+def test_card_attribute_tables(deck):
+    for card in deck:
+        code = logic.encode_card(card)
+        assert logic.colors[logic.card_colors[code]] == card[0]
+        assert logic.values[logic.card_ranks[code]] == card[1]
+    assert logic.card_attack[logic.encode_card(('pikes', 'K'))] == 5
+    assert logic.card_attack[logic.encode_card(('tiles', 'K'))] == 0
+    assert logic.card_skip[logic.encode_card(('clovers', '4'))] == 1
+    assert sum(logic.card_active) == 22
+
+
+def test_bit_hand():
+    hand = logic.BitHand([('hearts', '5'), ('hearts', '5'), ('tiles', 'K')])
+    assert len(hand) == 3
+    assert hand.mask == logic.cards_to_mask([('hearts', '5'), ('tiles', 'K')])
+    hand.remove(('hearts', '5'))
+    assert hand.mask == logic.cards_to_mask([('hearts', '5'), ('tiles', 'K')])
+    hand.remove(('hearts', '5'))
+    assert hand.mask == logic.cards_to_mask([('tiles', 'K')])
+    assert list(hand) == [('tiles', 'K')]
+    with pytest.raises(ValueError):
+        hand.remove(('hearts', '5'))
+
+
+@pytest.mark.parametrize('top_card, active, requested_color, requested_value, expected', [
+    (('hearts', '9'), False, None, None, [('hearts', 'K'), ('clovers', '9'), ('pikes', 'Q'), ('hearts', '3')]),
+    (('hearts', 'J'), False, None, '10', [('pikes', '10')]),
+    (('tiles', 'Q'), False, None, None, [('hearts', 'K'), ('tiles', '6'), ('clovers', '9'), ('pikes', '10'),
+                                         ('pikes', 'Q'), ('tiles', 'K'), ('hearts', '3')]),
+    (('hearts', 'K'), True, None, None, [('hearts', 'K'), ('hearts', '3')]),
+    (('pikes', 'A'), True, 'tiles', None, [('tiles', '6'), ('tiles', 'K')]),
+    (('pikes', 'J'), True, None, '9', [('clovers', '9')]),
+])
+def test_possible_plays_mask(top_card, active, requested_color, requested_value, expected):
+    hand = [('hearts', 'K'), ('tiles', '6'), ('clovers', '9'), ('pikes', '10'), ('pikes', 'Q'), ('tiles', 'K'),
+            ('hearts', '3')]
+    mask = logic.possible_plays_mask(logic.BitHand(hand), top_card, active, requested_color, requested_value)
+    assert mask == logic.possible_plays_mask(hand, top_card, active, requested_color, requested_value)
+    assert logic.mask_to_cards(mask, hand) == expected
+    assert sorted(logic.mask_to_cards(mask)) == sorted(expected)
+
+
+def test_playability_table_covers_all_contexts(deck):
+    assert len(logic.playability_table) == 52 * 2 * 5 * 14
+    for card in deck:
+        for value in [None] + logic.values:
+            for color in [None] + logic.colors:
+                assert logic.playable_mask(card, True, color, value) == logic.active_plays_mask(card, color, value)
+                assert logic.playable_mask(card, False, color, value) == logic.nonactive_plays_mask(card, value)
+
+
+def test_find_possible_plays():
+    hand = [('hearts', '2'), ('tiles', 'K'), ('clovers', 'K'), ('hearts', '9')]
+    plays, can_move = logic.find_possible_plays(hand, ('clovers', '2'), active=True)
+    assert can_move
+    assert plays == [('hearts', '2')]
+
+    plays, can_move = logic.find_possible_plays(hand, ('clovers', '2'))
+    assert can_move
+    assert plays == [('hearts', '2'), ('clovers', 'K')]
+
+
+def test_prepare_deck_with_players_and_many_decks(deck):
+    players = {'One': Player('One'), 'Two': Player("Two")}
+    players['One'].hand = [('hearts', '5')] * 3
+    players['Two'].hand = deck
+    table = [('hearts', '5'), ('tiles', '7')]
+    deck, table, players = logic.prepare_deck(table, players, how_many=5, rng=create_rng())
+    assert len(deck) == 52 * 5 - 3 - 52 - 1
+    assert ('hearts', '5') not in deck
+    assert deck.count(('tiles', '7')) == 4
+    assert deck.count(('pikes', 'A')) == 4
+
+
+@pytest.mark.parametrize('how_many_players, how_many_cards', [(2, 5), (4, 10), (3, 0), (6, 20)])
+def test_deal_hands_same_as_dealing_one_by_one(deck, how_many_players, how_many_cards):
+    expected_deck = list(deck)
+    expected = []
+    for _ in range(how_many_players):
+        cards = []
+        for _ in range(min(how_many_cards, len(expected_deck))):
+            cards.append(expected_deck.pop())
+        expected.append(cards)
+
+    hands, deck = logic.deal_hands(deck, how_many_players, how_many_cards)
+    assert hands == expected
+    assert deck == expected_deck
+
+
+def test_card_registry(deck):
+    for card in deck:
+        data = logic.card_data(card)
+        assert data.key == card
+        assert data.key is logic.card_data(list(card)).key
+        assert data.text == f'{card[0]} {card[1]}'
+        assert data.marked == f'*{card[0]} {card[1]}*'
+        assert data.image == f'{card[0]}_{card[1]}.png'
+        assert logic.convert_to_card(data.text) is data.key
+        assert logic.convert_to_card(f'{card[1]} {card[0]}') is data.key
+    assert logic.card_data(('hearts', '10')).rank == 10
+    assert logic.card_data(('tiles', 'A')).rank == 14
+    assert logic.card_text(('tiles', ' 6')) == 'tiles  6'
+
+
+def test_prepare_deck_with_too_many_copies_of_card():
+    player = Player('One')
+    player.hand = [('hearts', '5'), ('hearts', '5')]
+    with pytest.raises(ValueError):
+        logic.prepare_deck(players={'One': player}, rng=create_rng())
+    with pytest.raises(ValueError):
+        logic.prepare_deck([('hearts', '5')], {'One': player}, how_many=2, rng=create_rng())
+    deck, _, _ = logic.prepare_deck([('hearts', '6')], {'One': player}, how_many=2, rng=create_rng())
+    assert len(deck) == 52 * 2 - 3
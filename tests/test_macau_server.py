@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
 from time import sleep
+import macau_server
+import logic.replay as replay
 from macau_server import app
 
 client = TestClient(app)
@@ -141,6 +143,8 @@ def test_get_player_state():
         assert len(state['rivals']) == 1
         assert state['rivals']['CPU1'] == 6 or state['rivals']['CPU1'] == 5
         assert state['outputs'][0] == 'John move now.'
+        if state['possible_plays'] is not None:
+            assert all(card in state['hand'] for card in state['possible_plays'])
 
         response = tc.get("/macau/0/John/state?access_token=invalid")
         assert response.status_code == 401
@@ -257,8 +261,77 @@ def test_get_game_log():
         data = response.json()['output']
         assert len(data) > 0
         assert 'John move now.' == data[0]
-        assert f"John plays: {move}." == data[1] or "John has no move." == data[1]
+        assert data[1] in [f"John plays: {move}.", "John has no move.", f"{move} is invalid. John makes invalid move."]
 
         response = tc.get("/macau/250")
         assert response.status_code == 404
         assert response.json()['status'] == 'No game'
+
+
+def test_get_game_events():
+    game_json = {'how_many_cards': 6, 'players_names': ["John", "CPU1"], 'seed': 3}
+    with TestClient(app) as tc:
+        response = tc.post("/macau", json=game_json)
+        assert response.status_code == 200
+        sleep(0.05)
+
+        response = tc.get("/macau/0/events")
+        assert response.status_code == 200
+        assert response.json()['status'] == 'OK'
+        assert response.json()['events'][0] == {'event': 'TurnStarted', 'player': 'John'}
+
+        response = tc.get("/macau/0/events?start=1")
+        assert response.status_code == 200
+        assert {'event': 'TurnStarted', 'player': 'John'} not in response.json()['events']
+
+        response = tc.get("/macau/250/events")
+        assert response.status_code == 404
+        assert response.json()['status'] == 'No game'
+
+
+def test_get_game_replay_log():
+    game_json = {'how_many_cards': 5, 'players_names': ["CPU1", "CPU2"], 'seed': 11}
+    with TestClient(app) as tc:
+        response = tc.post("/macau", json=game_json)
+        assert response.status_code == 200
+        for _ in range(100):
+            response = tc.get("/macau/0/log")
+            assert response.status_code == 200
+            if response.json()['log']['state_hash'] is not None:
+                break
+            sleep(0.05)
+        log = replay.log_from_dict(response.json()['log'])
+        _, winners = replay.replay(log)
+        assert winners == macau_server.games_container[0]['state'].standings
+
+        response = tc.post("/macau", json={'how_many_cards': 5, 'players_names': ["John", "CPU1"]})
+        assert response.status_code == 200
+        response = tc.get("/macau/1/log")
+        assert response.status_code == 404
+        assert response.json()['status'] == 'Game without seed'
+        response = tc.get("/macau/250/log")
+        assert response.status_code == 404
+
+
+def test_game_with_timeouts():
+    game_json = {'how_many_cards': 5, 'players_names': ["John", "CPU1"], 'timeout_fallback': 'resign'}
+    with TestClient(app) as tc:
+        response = tc.post("/macau", json=game_json)
+        assert response.status_code == 400
+        assert response.json()['status'] == 'Wrong fallback'
+
+        game_json = {'how_many_cards': 5, 'players_names': ["John", "CPU1"], 'move_timeout': 0.05,
+                     'game_timeout': 60, 'timeout_fallback': 'forfeit'}
+        response = tc.post("/macau", json=game_json)
+        assert response.status_code == 200
+        gs = macau_server.games_container[0]['state']
+        assert gs.move_timeout == 0.05
+        assert gs.game_deadline is not None
+        for _ in range(100):
+            if gs.standings is not None:
+                break
+            sleep(0.05)
+        assert gs.standings == ['CPU1', 'John']
+        response = tc.get("/macau/0/events")
+        assert {'event': 'MoveTimedOut', 'player': 'John'} in response.json()['events']
+        assert response.json()['events'][-1] == {'event': 'GameWon', 'winners': ['CPU1']}
@@ -0,0 +1,46 @@
+import logic.game as game
+import logic.events as events
+import pytest
+from logic.move import Move, parse_move
+from player.cpu_player import CPUPlayer
+from logic.rng import create_rng
+
+
+def test_parse_move():
+    assert parse_move('hearts 5') == Move([('hearts', '5')])
+    assert parse_move('*hearts 5*') == Move([('hearts', '5')])
+    assert parse_move(' 5 hearts') == Move([('hearts', '5')])
+    pack = [('hearts', '5'), ('tiles', '5'), ('pikes', '5')]
+    assert parse_move('hearts 5, tiles 5,pikes 5', 'clovers') == Move(pack, 'clovers')
+    assert parse_move('hearts 5, sth, pikes 5') == Move([('hearts', '5'), ('pikes', '5')])
+    assert parse_move('') == Move([None])
+    assert parse_move('hearts 15') == Move([None])
+
+
+def test_move_text():
+    assert Move([('hearts', '5'), ('tiles', '5')]).text == 'hearts 5, tiles 5'
+    assert Move([None]).text == ''
+    assert Move().cards == []
+    assert Move().request is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('card, asked, requested', [(('hearts', 'J'), '7', (None, '7')),
+                                                    (('hearts', 'A'), 'tiles', ('tiles', None))])
+async def test_cpu_move_with_request_without_input(card, asked, requested):
+    gs = game.GameState(0)
+    cpu = CPUPlayer('CPU', create_rng(0))
+    cpu.hand = [card, ('tiles', '7'), ('tiles', '7'), ('clovers', '8')]
+    outputs = []
+    cpu.print_foo = outputs.append
+
+    async def forbidden_input(message):
+        raise AssertionError(f'cpu was asked: {message}')
+    cpu.input_foo = forbidden_input
+    gs.players = {'CPU': cpu}
+    gs.sinks.append(events.print_sink)
+    gs.table = [('hearts', '5')]
+    cpu, gs = await game.play_move(cpu, gs)
+    assert gs.lied_card == card
+    assert (gs.requested_color, gs.requested_value) == requested
+    assert outputs == [f'CPU plays: {card[0]} {card[1]}.', f'CPU plays: {asked}.']
@@ -0,0 +1,121 @@
+import pickle
+import pytest
+import logic.events as events
+import logic.game as game
+import logic.headless as headless
+import logic.persistent as persistent
+import logic.replay as replay
+from logic.move import Move
+from logic.pile import Pile
+from player.player import Player
+
+
+def prepare_cpu_game(seed, ranking=game.stop_on_first, how_many_players=4, how_many_decks=1, how_many_cards=7):
+    gs = game.GameState(seed)
+    names = [f'CPU{index}' for index in range(how_many_players)]
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+    gs.ranking = ranking
+    for player in gs.players.values():
+        player.print_foo = None
+    return gs
+
+
+@pytest.mark.parametrize('seed, ranking', [(seed, ranking) for seed in range(6)
+                                           for ranking in [game.stop_on_first, game.play_out]])
+def test_step_parity_with_headless_engine(seed, ranking):
+    gs = prepare_cpu_game(seed, ranking)
+    state = persistent.freeze(gs)
+    assert state.state_hash() == gs.state_hash()
+    log = replay.record_game(gs, 1, 7)
+    hashes, expected = [], []
+    gs.sinks.append(lambda game_state, event: hashes.append(game_state.state_hash())
+                    if isinstance(event, events.TurnEnded) else None)
+    gs.sinks.append(events.list_sink(expected))
+    headless.play_game(gs)
+
+    moves = iter(log.moves)
+    collected = []
+    sinks = [events.list_sink(collected)]
+    for turn_hash in hashes:
+        state = persistent.step(state, decide_foo=lambda *_: next(moves), sinks=sinks)
+        assert state.state_hash() == turn_hash
+    assert collected == expected[:-1]
+    assert list(state.standings) == gs.standings
+    assert persistent.pile_cards(state.deck) == gs.deck
+    assert persistent.pile_cards(state.table) == gs.table
+    assert [list(seat.hand) for seat in state.seats] == [player.hand for player in gs.players.values()]
+    assert state.rng == gs.rng.getstate()
+    with pytest.raises(ValueError):
+        persistent.step(state)
+
+
+def test_step_shares_unchanged_parts():
+    gs = game.GameState(0)
+    gs.players = {name: Player(name) for name in ['One', 'Two', 'Three']}
+    gs.players['One'].hand = [('hearts', '5'), ('tiles', '9')]
+    gs.players['Two'].hand = [('hearts', '2'), ('tiles', '6')]
+    gs.players['Three'].hand = [('clovers', '9')]
+    gs.deck = [('clovers', '2'), ('hearts', '3'), ('tiles', '4'), ('clovers', '6')]
+    gs.table = [('tiles', '5'), ('pikes', '5')]
+    start = persistent.freeze(gs)
+
+    played = persistent.step(start, Move([('hearts', '5')]))
+    assert played.turn == 1
+    assert played.deck is start.deck
+    assert played.table is start.table
+    assert played.seats[1:] == start.seats[1:] and played.seats[1] is start.seats[1]
+    assert played.lied_card == ('hearts', '5')
+
+    attacked = persistent.step(played, Move([('hearts', '2')]))
+    taken = persistent.step(attacked, Move([('clovers', '9')]))
+    assert taken.table.below.below is start.table
+    assert taken.deck is start.deck.below.below
+    assert taken.seats[2].hand == (('clovers', '9'), ('clovers', '6'), ('tiles', '4'))
+    assert taken.seats[:2] == attacked.seats[:2]
+
+    assert persistent.pile_cards(start.table) == [('tiles', '5'), ('pikes', '5')]
+    assert start.seats[0].hand == (('hearts', '5'), ('tiles', '9'))
+    assert persistent.thaw(start).state_hash() == gs.state_hash()
+
+
+def test_step_needs_move():
+    gs = prepare_cpu_game(0)
+    with pytest.raises(ValueError):
+        persistent.step(persistent.freeze(gs))
+    gs.players['CPU0'].turns_to_skip = 1
+    assert persistent.step(persistent.freeze(gs)).seats[0].turns_to_skip == 0
+
+
+def test_thaw_keeps_players():
+    gs = prepare_cpu_game(3)
+    state = persistent.freeze(gs)
+    thawed = persistent.thaw(state, gs.players)
+    assert thawed.state_hash() == gs.state_hash()
+    assert type(thawed.players['CPU1']) is type(gs.players['CPU1'])
+    assert thawed.players['CPU1'] is not gs.players['CPU1']
+    assert thawed.rng.getstate() == gs.rng.getstate()
+    assert headless.play_game(thawed) == headless.play_game(gs)
+
+
+def test_pile_view_acts_like_pile():
+    cards = [('hearts', str(value)) for value in range(2, 11)]
+    pile, view = Pile(cards), persistent.PileView(persistent.push(None, cards))
+    assert len(view) == len(pile) and view.top == pile.top
+    assert view[-3:] == pile[-3:] and view[::-3] == pile[::-3] and view[2] == pile[2]
+    assert view.draw(3) == pile.draw(3)
+    for changed in (pile, view):
+        changed.append(('tiles', 'A'))
+        changed.extend([('tiles', 'K'), ('tiles', 'Q')])
+        changed.pop()
+        changed.pop(1)
+        del changed[-2]
+        changed.insert(2, ('pikes', '7'))
+        changed.recycle_under([('clovers', '3')])
+        changed[1] = ('clovers', '4')
+    assert view == pile and list(view) == pile
+    assert view.zobrist == pile.zobrist == persistent.pile_zobrist(view.freeze())
+    assert persistent.pile_cards(view.freeze()) == pile
+    assert pickle.loads(pickle.dumps(view)) == pile
+    assert view.copy() == pile
+    view.clear()
+    assert len(view) == 0 and view.top is None and view.freeze() is None
@@ -0,0 +1,43 @@
+from logic.pile import Pile, as_pile
+import logic.game as game
+
+
+def test_pile_top():
+    pile = Pile()
+    assert pile.top is None
+    pile.append(('hearts', '5'))
+    pile.append(('tiles', '7'))
+    assert pile.top == ('tiles', '7')
+
+
+def test_pile_draw():
+    pile = Pile([('hearts', '5'), ('tiles', '7'), ('pikes', 'K')])
+    assert pile.draw(0) == []
+    assert pile.draw(2) == [('pikes', 'K'), ('tiles', '7')]
+    assert pile == [('hearts', '5')]
+    assert pile.draw(5) == [('hearts', '5')]
+    assert len(pile) == 0
+
+
+def test_pile_recycle_under():
+    pile = Pile([('hearts', '5'), ('tiles', '7')])
+    pile.recycle_under([('pikes', 'K'), ('clovers', '2')])
+    assert pile == [('pikes', 'K'), ('clovers', '2'), ('hearts', '5'), ('tiles', '7')]
+    assert pile.top == ('tiles', '7')
+
+
+def test_as_pile():
+    pile = Pile()
+    assert as_pile(pile) is pile
+    cards = [('hearts', '5')]
+    assert type(as_pile(cards)) is Pile
+    assert as_pile(cards) == cards
+
+
+def test_game_state_keeps_piles():
+    gs = game.GameState()
+    gs.deck = [('hearts', '5')]
+    gs.table = gs.table + [('tiles', '7')]
+    assert type(gs.deck) is Pile
+    assert type(gs.table) is Pile
+    assert gs.table.top == ('tiles', '7')
@@ -5,7 +5,7 @@ import pytest
 @pytest.mark.asyncio
 async def test_default_player_gui():
     gs = game.GameState()
-    gs.deck, gs.table, gs.players = game.prepare_game(['1', '2'])
+    gs.deck, gs.table, gs.players = game.prepare_game(['1', '2'], rng=gs.rng)
     possible_plays = []
     gs.lied_card = gs.table[-1]
 
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import pytest
+import logic.batch as batch
+import logic.game as game
+import logic.headless as headless
+import logic.replay as replay
+from logic.move import Move
+
+
+def prepare_recorded_game(seed, names, how_many_decks=2, how_many_cards=7, ranking=game.stop_on_first):
+    gs = game.GameState(seed)
+    gs.deck, gs.table, gs.players = game.prepare_game(names, how_many_decks, how_many_cards, rng=gs.rng)
+    gs.ranking = ranking
+    return gs, replay.record_game(gs, how_many_decks, how_many_cards)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('seed', [0, 1, 2])
+async def test_replay_of_async_game(seed):
+    gs, log = prepare_recorded_game(seed, ['CPU1', 'CPU2', 'CPU3'])
+    for player in gs.players.values():
+        player.print_foo = lambda _message: None
+    winners = await game.play_game(gs)
+    log = replay.finish_log(log, gs)
+    assert len(log.moves) > 0
+    replayed, replayed_winners = replay.replay(log)
+    assert replayed_winners == winners
+    assert replay.snapshot_hash(replayed) == log.state_hash
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('fallback', [game.draw_on_timeout, game.play_cpu_on_timeout])
+async def test_replay_of_game_with_timeouts(fallback):
+    gs, log = prepare_recorded_game(2, ['John', 'CPU1'], 2, 5)
+    for player in gs.players.values():
+        player.print_foo = lambda _message: None
+
+    async def never_decide(*_):
+        await asyncio.sleep(3600)
+    gs.players['John'].gui_foo = never_decide
+    gs.move_timeout = 0.001
+    gs.timeout_fallback = fallback
+    winners = await game.play_game(gs)
+    log = replay.finish_log(log, gs)
+    replayed, replayed_winners = replay.replay(log)
+    assert replayed_winners == winners
+    assert replay.snapshot_hash(replayed) == log.state_hash
+
+
+@pytest.mark.parametrize('seed', [3, 4, 5])
+def test_replay_of_headless_game_with_requests(seed):
+    gs, log = prepare_recorded_game(seed, ['CPU1', 'CPU2', 'CPU3', 'CPU4'], 1, 5, game.rank_by_cards)
+    for player in gs.players.values():
+        batch.random_strategy(player)
+    headless.play_game(gs)
+    log = replay.finish_log(log, gs)
+    assert any(move.request is not None for move in log.moves)
+    replayed, _ = replay.replay(log)
+    assert replayed.standings == gs.standings
+
+
+def test_log_json_round_trip():
+    gs, log = prepare_recorded_game(6, ['CPU1', 'CPU2'])
+    headless.play_game(gs)
+    log = replay.finish_log(log, gs)
+    log.moves.append(Move([None]))
+    data = json.loads(json.dumps(replay.log_to_dict(log)))
+    assert replay.log_from_dict(data) == log
+
+
+def test_replay_detects_changed_log():
+    gs, log = prepare_recorded_game(7, ['CPU1', 'CPU2'])
+    headless.play_game(gs)
+    log = replay.finish_log(log, gs)
+    with pytest.raises(ValueError):
+        replay.replay(log._replace(state_hash='0' * 32))
+    with pytest.raises(ValueError):
+        replay.replay(log._replace(moves=log.moves + [Move()]))
+    with pytest.raises(ValueError):
+        replay.replay(log._replace(moves=log.moves[:-1]))
+    replayed, winners = replay.replay(log._replace(state_hash=None), check=False)
+    assert winners == gs.standings[:1]
+    assert replay.snapshot_hash(replayed) == log.state_hash
+
+
+def test_game_without_seed_is_not_recorded():
+    gs = game.GameState(secure=True)
+    with pytest.raises(ValueError):
+        replay.record_game(gs, 1, 5)
@@ -0,0 +1,37 @@
+import pytest
+from random import Random, SystemRandom
+from logic.rng import create_rng, spawn_rng, copy_rng
+from logic.logic import prepare_deck
+from logic.game import prepare_game
+
+
+def test_create_rng():
+    assert type(create_rng()) is Random
+    assert type(create_rng(5, secure=True)) is SystemRandom
+    first, second = create_rng(5), create_rng(5)
+    assert [first.random() for _ in range(10)] == [second.random() for _ in range(10)]
+
+
+def test_spawn_rng():
+    parent, twin = create_rng(11), create_rng(11)
+    first, second = spawn_rng(parent), spawn_rng(twin)
+    assert first is not parent
+    assert [first.random() for _ in range(10)] == [second.random() for _ in range(10)]
+    assert parent.random() == twin.random()
+    assert type(spawn_rng(create_rng(secure=True))) is SystemRandom
+
+
+def test_copy_rng():
+    rng = create_rng(3)
+    rng.random()
+    copied = copy_rng(rng)
+    assert copied is not rng
+    assert [copied.random() for _ in range(10)] == [rng.random() for _ in range(10)]
+    assert type(copy_rng(create_rng(secure=True))) is SystemRandom
+
+
+def test_rng_is_required():
+    with pytest.raises(TypeError):
+        prepare_deck()
+    with pytest.raises(TypeError):
+        prepare_game(['One', 'CPU'])
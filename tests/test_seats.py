@@ -0,0 +1,66 @@
+import pytest
+import logic.game as game
+from logic.seats import SeatRing
+from player.player import Player
+
+
+def prepare_players(how_many):
+    players = {str(number): Player(str(number)) for number in range(1, how_many + 1)}
+    for player in players.values():
+        player.hand = [('hearts', '5')]
+    return players
+
+
+def test_seat_ring_order():
+    players = prepare_players(4)
+    seats = SeatRing(players)
+    assert len(seats) == 4
+    assert [player.name for player in seats] == ['1', '2', '3', '4']
+    assert seats.player(5).name == '2'
+    assert seats.next('4').name == '1'
+    assert seats.next('2', 2).name == '4'
+    assert seats.previous('1').name == '4'
+    assert [player.name for player in seats.following('3', 2)] == ['4', '1']
+    assert [player.name for player in seats.following('1', 4)] == ['2', '3', '4', '1']
+    assert seats.following('unknown', 2) == []
+
+    players['4'].hand = []
+    assert [player.name for player in seats.following('3', 2)] == ['1', '2']
+    players['2'].hand = []
+    assert [player.name for player in seats.following('1', 2)] == ['3', '1']
+
+
+@pytest.mark.parametrize('skipping, finished, name, expected', [
+    ([], [], '1', '4'),
+    (['4'], [], '1', '3'),
+    (['4', '3', '2'], [], '1', '1'),
+    (['1'], [], '1', None),
+    (['1', '2'], [], '3', '4'),
+    (['4'], ['3'], '1', '2'),
+    (['4', '2'], ['3'], '1', '1'),
+])
+def test_seat_ring_previous_active(skipping, finished, name, expected):
+    players = prepare_players(4)
+    for skipper in skipping:
+        players[skipper].turns_to_skip = 2
+    for winner in finished:
+        players[winner].hand = []
+    rival = SeatRing(players).previous_active(name)
+    assert (rival.name if rival is not None else None) == expected
+
+
+def test_game_state_seats_follow_players():
+    gs = game.GameState()
+    gs.players = prepare_players(3)
+    seats = gs.seats
+    assert gs.seats is seats
+    gs.players['4'] = Player('4')
+    assert gs.seats is not seats
+    assert gs.seats.previous('1').name == '4'
+
+    replaced = Player('2')
+    gs.players['2'] = replaced
+    assert gs.seats.next('1') is replaced
+    gs.players = prepare_players(2)
+    assert len(gs.seats) == 2
+    assert [player.name for player in gs.clone().seats] == ['1', '2']
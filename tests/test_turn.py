@@ -0,0 +1,95 @@
+import logic.game as game
+import logic.logic as rules
+import pytest
+from logic.hand import Hand
+from logic.move import parse_move
+from logic.turn import turn_context, cached_turn_context
+from player.player import Player
+
+
+@pytest.fixture
+def counted_plays(monkeypatch):
+    calls = []
+    find_possible_plays = rules.find_possible_plays
+
+    def counting(*args):
+        calls.append(args)
+        return find_possible_plays(*args)
+    monkeypatch.setattr(rules, 'find_possible_plays', counting)
+    return calls
+
+
+def test_turn_context_computed_once(counted_plays):
+    gs = game.GameState()
+    gs.table = [('tiles', '7')]
+    hand = Hand([('clovers', '7'), ('tiles', '7'), ('pikes', '7'), ('hearts', '5')])
+    context = turn_context(hand, gs)
+    assert context.top_card == ('tiles', '7')
+    assert not context.active
+    assert context.can_move
+    assert context.packs == ['7']
+    assert turn_context(hand, gs) is context
+    assert game.validate_move(hand, gs, parse_move('tiles 7, clovers 7, pikes 7'))
+    assert cached_turn_context(hand, gs) is context
+    assert len(counted_plays) == 1
+
+
+def test_turn_context_invalidated_on_change(counted_plays):
+    gs = game.GameState()
+    gs.table = [('tiles', '7')]
+    hand = Hand([('clovers', '7'), ('hearts', '5')])
+    context = turn_context(hand, gs)
+    assert context.possible_plays == [('clovers', '7')]
+
+    hand.append(('tiles', 'Q'))
+    assert cached_turn_context(hand, gs) is None
+    context = turn_context(hand, gs)
+    assert ('tiles', 'Q') in context.possible_plays
+
+    gs.lied_card = ('hearts', '2')
+    context = turn_context(hand, gs)
+    assert context.active
+    assert not context.can_move
+
+    gs.lied_card, gs.requested_color = ('hearts', 'A'), 'tiles'
+    context = turn_context(hand, gs)
+    assert context.possible_plays == [('tiles', 'Q')]
+
+    hand.sort()
+    assert cached_turn_context(hand, gs) is None
+    context = turn_context(hand, gs)
+
+    other_hand = Hand(hand)
+    assert turn_context(other_hand, gs).hand is other_hand
+    assert cached_turn_context(hand, gs) is None
+    assert len(counted_plays) == 6
+
+
+def test_turn_context_of_plain_list(counted_plays):
+    gs = game.GameState()
+    gs.table = [('tiles', '7')]
+    hand = [('clovers', '7'), ('tiles', '5')]
+    context = turn_context(hand, gs)
+    assert turn_context(hand, gs) is context
+    hand.remove(('clovers', '7'))
+    assert turn_context(hand, gs) is not context
+    assert len(counted_plays) == 2
+
+
+@pytest.mark.asyncio
+async def test_play_move_computes_plays_once(counted_plays):
+    gs = game.GameState()
+    gs.table = [('tiles', '7')]
+    player = Player('1')
+    player.hand = [('clovers', '7'), ('tiles', '7'), ('pikes', '7'), ('hearts', '5')]
+    player.print_foo = lambda _message: None
+
+    async def gui_foo(_gs, _top_card, _possible_plays):
+        return ''
+
+    async def input_foo(_message):
+        return 'tiles 7, clovers 7, pikes 7'
+    player.gui_foo, player.input_foo = gui_foo, input_foo
+    player, gs = await game.play_move(player, gs)
+    assert player.hand == [('hearts', '5')]
+    assert len(counted_plays) == 1
@@ -0,0 +1,92 @@
+import pytest
+import logic.game as game
+import logic.headless as headless
+import logic.logic as rules
+from logic.move import Move
+from logic.turn import turn_context
+
+np = pytest.importorskip('numpy')
+vectorized = pytest.importorskip('logic.vectorized')
+
+
+def sample_states(seeds, how_many_players=4):
+    samples = []
+    for seed in seeds:
+        gs = game.GameState(seed)
+        names = [f'CPU{index}' for index in range(how_many_players)]
+        gs.deck, gs.table, gs.players = game.prepare_game(names, 1, 5, rng=gs.rng)
+        for _ in range(30):
+            for seat, player in enumerate(gs.players.values()):
+                samples.append((gs.clone(), seat))
+                headless.apply(gs, player)
+            if any(len(player.hand) == 0 for player in gs.players.values()):
+                break
+    return samples
+
+
+def recording_policy(decisions):
+    def policy(games, seat, legal, rng):
+        decisions.extend(vectorized.random_policy(games, seat, legal, rng))
+        return decisions
+    return policy
+
+
+def request_text(card, request):
+    if request < 0:
+        return None
+    return rules.values[request] if vectorized.value_request[card] else rules.colors[request]
+
+
+def test_legal_masks_same_as_rules():
+    samples = sample_states(range(10))
+    games = vectorized.from_game_states([gs for gs, _ in samples])
+    for seat in range(games.how_many_players):
+        legal = vectorized.legal_masks(games, seat)
+        for index, (gs, _) in enumerate(samples):
+            hand = list(gs.players.values())[seat].hand
+            expected = {rules.card_codes[card] for card in turn_context(hand, gs).possible_plays}
+            assert set(np.nonzero(legal[index])[0]) == expected
+
+
+@pytest.mark.parametrize('seat', range(4))
+def test_turns_in_lockstep_with_engine(seat):
+    samples = [gs for gs, sample_seat in sample_states(range(20, 40)) if sample_seat == seat]
+    games = vectorized.from_game_states(samples)
+    rng = np.random.default_rng(seat)
+    decisions = []
+    vectorized.play_turn(games, seat, recording_policy(decisions), rng)
+    cards, requests = decisions
+
+    refills = 0
+    for index, gs in enumerate(samples):
+        player = list(gs.players.values())[seat]
+        rng_state = gs.rng.getstate()
+        move = Move([rules.deck_cards[cards[index]]], request_text(cards[index], requests[index]))
+        headless.apply(gs, player, move)
+        expected = vectorized.from_game_states([gs])
+        if gs.rng.getstate() != rng_state:
+            refills += 1
+            assert games.hands[index].sum(axis=1).tolist() == expected.hands[0].sum(axis=1).tolist()
+            assert games.deck_len[index] == expected.deck_len[0]
+            continue
+        assert games.deck[index, :games.deck_len[index]].tolist() == expected.deck[0, :expected.deck_len[0]].tolist()
+        assert games.table[index, :games.table_len[index]].tolist() == expected.table[0, :expected.table_len[0]].tolist()
+        for name in set(vectorized.GameArrays.__slots__) - {'deck', 'table'}:
+            assert np.array_equal(getattr(games, name)[index], getattr(expected, name)[0]), name
+    assert refills < len(samples)
+
+
+def test_vectorized_games_keep_all_cards():
+    rng = np.random.default_rng(0)
+    games = vectorized.prepare_games(500, 3, 2, 7, rng=rng)
+    assert (games.hands.sum(axis=(1, 2)) == 21).all()
+    assert not vectorized.card_active[games.table[np.arange(500), games.table_len - 1]].any()
+    policies = [vectorized.random_policy, vectorized.lowest_card_policy, vectorized.random_policy]
+    winners, rounds = vectorized.play_games(games, policies, rng)
+    assert games.finished.all()
+    assert winners.any(axis=1).all()
+    assert (rounds > 0).all()
+    in_game = games.hands.sum(axis=(1, 2)) + games.deck_len + games.table_len + (games.lied_card >= 0)
+    assert (in_game == 104).all()
+    assert (games.hands >= 0).all()
+    assert (games.hands[winners] == 0).all()
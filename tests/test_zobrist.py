@@ -0,0 +1,139 @@
+import pytest
+import logic.codec as codec
+import logic.game as game
+import logic.headless as headless
+import logic.logic as rules
+from logic.hand import Hand
+from logic.pile import Pile
+from logic.rng import create_rng
+from logic.zobrist import card_key, mask, mix, pile_hash
+from player.player import Player
+
+
+def check_pile(pile):
+    assert pile.zobrist == pile_hash(pile) & mask
+
+
+def check_hand(hand):
+    assert hand.zobrist == sum(card_key(card) for card in hand) & mask
+
+
+def test_keys_are_stable():
+    assert card_key(('hearts', '5')) == card_key(['hearts', '5'])
+    assert card_key(('hearts', '5')) != card_key(('hearts', '6'))
+    assert 0 <= mix(-1) <= mask
+
+
+def test_pile_hash_follows_changes():
+    pile = Pile([('hearts', '5'), ('tiles', '7'), ('pikes', 'K')])
+    check_pile(pile)
+    pile.append(('clovers', '2'))
+    pile += [('hearts', '7'), ('hearts', '8')]
+    pile.extend(card for card in [('pikes', '2')])
+    pile.insert(0, ('tiles', 'A'))
+    pile.insert(-2, ('tiles', '3'))
+    check_pile(pile)
+    pile.remove(('tiles', '7'))
+    pile.pop()
+    pile.pop(1)
+    check_pile(pile)
+    pile[0] = ('clovers', '9')
+    pile[-1] = ('clovers', '10')
+    pile[1:3] = [('hearts', '2'), ('hearts', '3'), ('hearts', '4')]
+    del pile[0]
+    del pile[::2]
+    check_pile(pile)
+    pile.draw(2)
+    pile.recycle_under([('pikes', 'Q'), ('pikes', 'J')])
+    pile.sort()
+    check_pile(pile)
+    pile.reverse()
+    pile *= 2
+    check_pile(pile)
+    assert pile.copy().zobrist == pile.zobrist
+    pile.clear()
+    assert pile.zobrist == 0
+
+
+def test_pile_hash_depends_on_order():
+    cards = [('hearts', '5'), ('tiles', '7'), ('tiles', '7')]
+    assert Pile(cards).zobrist != Pile(cards[::-1]).zobrist
+    assert Pile(cards).zobrist != Pile(cards[:2]).zobrist
+
+
+def test_hand_hash_does_not_depend_on_order():
+    hand = Hand([('hearts', '5'), ('tiles', '7'), ('hearts', '5')])
+    check_hand(hand)
+    zobrist = hand.zobrist
+    hand.sort()
+    assert hand.zobrist == zobrist
+    hand.remove(('hearts', '5'))
+    assert hand.zobrist != zobrist
+    hand.append(('hearts', '5'))
+    assert hand.zobrist == zobrist
+    hand[1:] = [('clovers', 'A')]
+    check_hand(hand)
+    assert hand.copy().zobrist == hand.zobrist
+    hand.clear()
+    assert hand.zobrist == 0
+
+
+def prepare_state(seed):
+    gs = game.GameState(seed)
+    gs.deck, gs.table, gs.players = game.prepare_game(['CPU0', 'CPU1', 'CPU2'], 1, 5, rng=gs.rng)
+    for player in gs.players.values():
+        player.print_foo = None
+    return gs
+
+
+def test_state_hash_of_equal_states():
+    gs = prepare_state(1)
+    assert gs.clone().state_hash() == gs.state_hash()
+    assert codec.decode(codec.encode(gs)).state_hash() == gs.state_hash()
+    assert prepare_state(1).state_hash() == gs.state_hash()
+    assert prepare_state(2).state_hash() != gs.state_hash()
+
+    headless.play_round(gs)
+    assert codec.decode(codec.encode(gs)).state_hash() == gs.state_hash()
+    check_pile(gs.deck)
+    check_pile(gs.table)
+    for player in gs.players.values():
+        check_hand(player.hand)
+
+
+@pytest.mark.parametrize('field, value', [
+    ('lied_card', ('hearts', '2')),
+    ('cards_to_take', 2),
+    ('turns_to_wait', 1),
+    ('requested_value_rounds', 3),
+    ('requested_value', '7'),
+    ('requested_color', 'tiles'),
+])
+def test_state_hash_follows_counters(field, value):
+    gs = prepare_state(1)
+    zobrist = gs.state_hash()
+    setattr(gs, field, value)
+    assert gs.state_hash() != zobrist
+
+
+def test_state_hash_follows_punishments():
+    gs = game.GameState()
+    gs.players = {name: Player(name) for name in ['One', 'Two']}
+    gs.players['One'].hand = [('hearts', '5')]
+    gs.deck = [('tiles', '7'), ('clovers', '8')]
+    gs.table = [('pikes', '9')]
+    zobrist = gs.state_hash()
+
+    swapped = gs.clone()
+    swapped.players['One'].hand, swapped.players['Two'].hand = swapped.players['Two'].hand, swapped.players['One'].hand
+    assert swapped.state_hash() != zobrist
+
+    player = gs.players['One']
+    rules.take_cards_punishment(player, gs.deck, gs.table, rng=create_rng(0))
+    assert gs.state_hash() != zobrist
+    gs.players['One'].hand.remove(('clovers', '8'))
+    gs.deck.append(('clovers', '8'))
+    assert gs.state_hash() == zobrist
+
+    rules.skip_punishment(player, gs.table, ('hearts', '4'), 2)
+    assert gs.state_hash() != zobrist